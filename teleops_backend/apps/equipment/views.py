@@ -7,6 +7,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
 from core.permissions.tenant_permissions import TenantScopedPermission
+from core.spreadsheet_reader import SpreadsheetReader
 from .models import EquipmentInventoryItem, TechnologyTag
 from .serializers import (
     EquipmentInventoryItemSerializer,
@@ -173,82 +174,44 @@ class EquipmentInventoryItemViewSet(viewsets.ModelViewSet):
         upload = request.FILES.get('file')
         if upload:
             import os
-            import csv
-            from io import TextIOWrapper
             ext = os.path.splitext(upload.name)[1].lower()
 
-            if ext in ['.xlsx', '.xls']:
+            if ext in ['.xlsx', '.xls', '.csv', '.txt']:
+                # Streamed: the header row is detected within the first 10 rows of the requested
+                # sheet, else of the first sheet with the required columns, else of the first sheet
+                reader = SpreadsheetReader(
+                    upload,
+                    file_name=upload.name,
+                    sheet=request.data.get('sheet'),
+                    required_headers=['Material Code', 'Material Description'],
+                    header_scan=10,
+                    # Keep csv.DictReader semantics: every cell a string, blanks as ''
+                    csv_options={'dtype': str, 'keep_default_na': False},
+                )
                 try:
-                    import openpyxl
-                except Exception:
-                    return Response({'detail': 'openpyxl is required for Excel uploads'}, status=400)
-                wb = openpyxl.load_workbook(upload, data_only=True)
-
-                # Sheet selection and header detection
-                requested_sheet = request.data.get('sheet')
-                ws = None
-                headers: List[str] = []
-                header_row_index = 1
-
-                def detect_headers(sheet, start: int = 1, scan: int = 10):
-                    for r in range(start, start + scan):
-                        row = list(sheet.iter_rows(min_row=r, max_row=r, values_only=True))
-                        if not row:
-                            continue
-                        values = [str(v).strip() if v is not None else '' for v in row[0]]
-                        if any(values):
-                            return values, r
-                    return [], start
-
-                if requested_sheet and requested_sheet in wb.sheetnames:
-                    ws = wb[requested_sheet]
-                    headers, header_row_index = detect_headers(ws)
-                if ws is None:
-                    # Find a sheet that contains required columns
-                    for sheet in wb.worksheets:
-                        hdrs, hrow = detect_headers(sheet)
-                        s = {h.lower() for h in hdrs}
-                        if {'material code', 'material description'}.issubset(s):
-                            ws, headers, header_row_index = sheet, hdrs, hrow
-                            break
-                    if ws is None:
-                        ws = wb.active
-                        headers, header_row_index = detect_headers(ws)
-
-                for row in ws.iter_rows(min_row=header_row_index + 1, values_only=True):
-                    row_dict = {headers[i].strip(): (row[i] if (row and i < len(row)) else '') for i in range(len(headers))}
-                    obj = {
-                        'material_code': row_dict.get('Material Code') or row_dict.get('material_code') or row_dict.get('MaterialCode') or '',
-                        'manufacturer': row_dict.get('Manufacturer') or row_dict.get('manufacturer') or '',
-                        'name': row_dict.get('Material Description') or row_dict.get('name') or row_dict.get('Model') or '',
-                        'category': row_dict.get('Material Category') or row_dict.get('Category') or '',
-                        'sub_category': row_dict.get('Material Sub-Category') or row_dict.get('Sub Category') or row_dict.get('Sub-Category') or '',
-                        'uom': row_dict.get('UOM') or row_dict.get('uom') or '',
-                        'technology': row_dict.get('Technology') or row_dict.get('Technonoly') or row_dict.get('Technologies') or '',
-                    }
-                    queue_row(obj)
-            elif ext in ['.csv', '.txt']:
-                reader = csv.DictReader(TextIOWrapper(upload.file, encoding='utf-8'))
-                for row in reader:
-                    obj = {
-                        'material_code': row.get('Material Code') or row.get('material_code') or row.get('MaterialCode') or '',
-                        'manufacturer': row.get('Manufacturer') or row.get('manufacturer') or '',
-                        'name': row.get('Material Description') or row.get('name') or row.get('Model') or '',
-                        'category': row.get('Material Category') or row.get('Category') or '',
-                        'sub_category': row.get('Material Sub-Category') or row.get('Sub Category') or row.get('Sub-Category') or '',
-                        'uom': row.get('UOM') or row.get('uom') or '',
-                        'technology': row.get('Technology') or row.get('Technonoly') or row.get('Technologies') or '',
-                    }
-                    queue_row(obj)
+                    for row_dict in reader.iter_rows():
+                        obj = {
+                            'material_code': row_dict.get('Material Code') or row_dict.get('material_code') or row_dict.get('MaterialCode') or '',
+                            'manufacturer': row_dict.get('Manufacturer') or row_dict.get('manufacturer') or '',
+                            'name': row_dict.get('Material Description') or row_dict.get('name') or row_dict.get('Model') or '',
+                            'category': row_dict.get('Material Category') or row_dict.get('Category') or '',
+                            'sub_category': row_dict.get('Material Sub-Category') or row_dict.get('Sub Category') or row_dict.get('Sub-Category') or '',
+                            'uom': row_dict.get('UOM') or row_dict.get('uom') or '',
+                            'technology': row_dict.get('Technology') or row_dict.get('Technonoly') or row_dict.get('Technologies') or '',
+                        }
+                        queue_row(obj)
+                except Exception as e:
+                    return Response({'detail': f'Failed to read file: {str(e)}'}, status=400)
+                sheet_used = reader.sheet_title
             else:
                 return Response({'detail': 'Unsupported file type. Use .xlsx or .csv'}, status=400)
 
             # Write phase
             if errors and all_or_nothing:
-                return Response({'created': 0, 'updated': 0, 'skipped': len(rows), 'errors': errors, 'sheet_used': (ws.title if 'ws' in locals() and ws is not None else None)}, status=400)
+                return Response({'created': 0, 'updated': 0, 'skipped': len(rows), 'errors': errors, 'sheet_used': sheet_used}, status=400)
 
             if dry_run:
-                return Response({'created': 0, 'updated': 0, 'skipped': 0, 'errors': errors, 'sheet_used': (ws.title if 'ws' in locals() and ws is not None else None), 'processed_rows': len(rows)})
+                return Response({'created': 0, 'updated': 0, 'skipped': 0, 'errors': errors, 'sheet_used': sheet_used, 'processed_rows': len(rows)})
 
             # Prefetch existing by material code (non-empty)
             material_codes = [r['material_code'] for r in rows if r['material_code']]
@@ -335,7 +298,7 @@ class EquipmentInventoryItemViewSet(viewsets.ModelViewSet):
                     if item:
                         item.technologies.set([name_to_tag[n] for n in tech_list if n in name_to_tag])
 
-            return Response({'created': created, 'updated': updated, 'skipped': skipped, 'errors': errors, 'sheet_used': (ws.title if 'ws' in locals() and ws is not None else None)})
+            return Response({'created': created, 'updated': updated, 'skipped': skipped, 'errors': errors, 'sheet_used': sheet_used})
 
         return Response({'detail': 'Provide either items[] JSON or file'}, status=400)
 
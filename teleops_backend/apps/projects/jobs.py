@@ -0,0 +1,99 @@
+"""
+Background job runners for project imports
+"""
+
+import re
+
+from core.jobs import BulkJobRunner
+
+from .models import ProjectSitesBulkUploadJob, ProjectSitesBulkUploadError, ProjectInventoryBulkUploadJob
+from .services import ProjectSitesImportService, DismantleInventoryImportService
+
+
+class ProjectSitesImportRunner(BulkJobRunner):
+    """Large project site imports (AsyncProjectSitesImportView)"""
+
+    job_model = ProjectSitesBulkUploadJob
+    error_model = ProjectSitesBulkUploadError
+    chunk_size = 1000
+    counter_fields = {
+        'created_master': 'created_master',
+        'linked_count': 'linked',
+        'skipped_count': 'skipped',
+    }
+
+    def prepare(self, columns):
+        missing = ProjectSitesImportService.missing_columns(columns)
+        if missing:
+            return f'Missing required columns: {", ".join(missing)}'
+        # Site maps are prefetched on the first chunk and reused for the rest
+        job = self.job
+        self.importer = ProjectSitesImportService(job.project, job.tenant, job.created_by)
+        return None
+
+    def process_chunk(self, chunk_df, start_row):
+        return self.importer.import_frame(chunk_df, start_row + 2)
+
+
+class ProjectInventoryImportRunner(BulkJobRunner):
+    """Large dismantle inventory imports (AsyncProjectInventoryImportView)"""
+
+    job_model = ProjectInventoryBulkUploadJob
+    chunk_size = 1000
+    counter_fields = {
+        'created_count': 'created',
+        'skipped_count': 'skipped',
+    }
+
+    def prepare(self, columns):
+        # Column mapping helpers
+        def pick_col(candidates: list[str]) -> str | None:
+            for c in candidates:
+                if c in columns:
+                    return c
+            return None
+
+        self.site_col = pick_col(['Site ID', 'SiteId', 'site_id'])
+
+        # Unified column detection - find all Equipment X (Material Code or Name) columns
+        equipment_columns = []
+        for col in columns:
+            if 'Equipment' in col and 'Material Code' in col:
+                # Extract equipment number from column name
+                match = re.search(r'Equipment (\d+)', col)
+                if match:
+                    equipment_num = match.group(1)
+                    serial_col = pick_col([f'Equipment {equipment_num} Serial'])
+                    if serial_col:
+                        equipment_columns.append({
+                            'equipment_col': col,
+                            'serial_col': serial_col,
+                            'number': equipment_num
+                        })
+
+        # Fallback to legacy column names for backward compatibility
+        if not equipment_columns:
+            legacy_pairs = [
+                {
+                    'equipment_col': pick_col(['Radio (Material Code or Name)', 'Card (Material Code or Name)', 'Card Mat Code', 'Radio', 'Radio Name']),
+                    'serial_col': pick_col(['Radio Serial', 'Card Serial', 'RadioSerial', 'Radio SN']),
+                    'number': '1'
+                },
+                {
+                    'equipment_col': pick_col(['DUG/DUX (Material Code or Name)', 'DUW (Material Code or Name)', 'DXU Mat Code', 'DUG/DUX', 'DUG', 'DXU']),
+                    'serial_col': pick_col(['DUG/DUX Serial', 'DUW Serial', 'DUG Serial', 'DXU Serial', 'DUX Serial']),
+                    'number': '2'
+                }
+            ]
+            equipment_columns = [pair for pair in legacy_pairs if pair['equipment_col'] and pair['serial_col']]
+        self.equipment_columns = equipment_columns
+
+        if not self.site_col:
+            return 'Missing required column: Site ID'
+        # Site links, existing serials and the equipment catalog are loaded once per job
+        job = self.job
+        self.importer = DismantleInventoryImportService(job.project, job.plan, job.tenant, job.created_by)
+        return None
+
+    def process_chunk(self, chunk_df, start_row):
+        return self.importer.import_frame(chunk_df, start_row + 2, self.site_col, self.equipment_columns)
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.10 on 2026-10-16 20:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0014_fix_inventory_unique_constraints"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="projectinventorybulkuploadjob",
+            name="file_path",
+            field=models.CharField(
+                blank=True,
+                help_text="Stored upload processed by the job",
+                max_length=500,
+            ),
+        ),
+        migrations.AddField(
+            model_name="projectinventorybulkuploadjob",
+            name="job_options",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Upload parameters needed to (re)run the job",
+            ),
+        ),
+        migrations.AddField(
+            model_name="projectinventorybulkuploadjob",
+            name="task_id",
+            field=models.CharField(
+                blank=True, help_text="Celery task id of the latest run", max_length=255
+            ),
+        ),
+        migrations.AddField(
+            model_name="projectsitesbulkuploadjob",
+            name="file_path",
+            field=models.CharField(
+                blank=True,
+                help_text="Stored upload processed by the job",
+                max_length=500,
+            ),
+        ),
+        migrations.AddField(
+            model_name="projectsitesbulkuploadjob",
+            name="job_options",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Upload parameters needed to (re)run the job",
+            ),
+        ),
+        migrations.AddField(
+            model_name="projectsitesbulkuploadjob",
+            name="task_id",
+            field=models.CharField(
+                blank=True, help_text="Celery task id of the latest run", max_length=255
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated manually: pg_trgm indexes for the serials search (ProjectSiteInventory.SEARCH_FIELDS)
+
+from django.db import migrations
+
+FORWARD_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm;",
+    (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS project_site_inventory_serial_number_trgm_idx "
+        "ON project_site_inventory USING gin ((UPPER(serial_number::text)) gin_trgm_ops);"
+    ),
+    (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS project_site_inventory_equipment_model_trgm_idx "
+        "ON project_site_inventory USING gin ((UPPER(equipment_model::text)) gin_trgm_ops);"
+    ),
+    (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS project_site_inventory_equipment_name_trgm_idx "
+        "ON project_site_inventory USING gin ((UPPER(equipment_name::text)) gin_trgm_ops);"
+    ),
+    (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS project_site_inventory_site_id_business_trgm_idx "
+        "ON project_site_inventory USING gin ((UPPER(site_id_business::text)) gin_trgm_ops);"
+    ),
+    (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS project_site_inventory_equipment_material_code_trgm_idx "
+        "ON project_site_inventory USING gin ((UPPER(equipment_material_code::text)) gin_trgm_ops);"
+    ),
+]
+
+REVERSE_SQL = [
+    "DROP INDEX CONCURRENTLY IF EXISTS project_site_inventory_serial_number_trgm_idx;",
+    "DROP INDEX CONCURRENTLY IF EXISTS project_site_inventory_equipment_model_trgm_idx;",
+    "DROP INDEX CONCURRENTLY IF EXISTS project_site_inventory_equipment_name_trgm_idx;",
+    "DROP INDEX CONCURRENTLY IF EXISTS project_site_inventory_site_id_business_trgm_idx;",
+    "DROP INDEX CONCURRENTLY IF EXISTS project_site_inventory_equipment_material_code_trgm_idx;",
+]
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("projects", "0015_bulk_job_resume_fields"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=FORWARD_SQL, reverse_sql=REVERSE_SQL),
+    ]
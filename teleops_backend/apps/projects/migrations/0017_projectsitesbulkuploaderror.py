@@ -0,0 +1,34 @@
+# Generated by Django 4.2.10 on 2026-10-16 22:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0016_inventory_search_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectSitesBulkUploadError",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("row", models.IntegerField()),
+                ("error", models.TextField()),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="row_errors",
+                        to="projects.projectsitesbulkuploadjob",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "project_sites_bulk_upload_error",
+                "ordering": ["row"],
+                "indexes": [models.Index(fields=["job", "row"], name="project_sit_job_id_row_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.10 on 2026-10-16 23:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0017_projectsitesbulkuploaderror"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="projectinventorybulkuploadjob",
+            name="attempts",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Consecutive runs stopped by an unexpected error"
+            ),
+        ),
+        migrations.AddField(
+            model_name="projectsitesbulkuploadjob",
+            name="attempts",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Consecutive runs stopped by an unexpected error"
+            ),
+        ),
+    ]
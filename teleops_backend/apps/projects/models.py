@@ -1,6 +1,8 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from core.jobs.models import BulkJobMixin
+
 
 ## Note: Phase 1 uses existing client management APIs; no local Client/Customer tables
 
@@ -254,6 +256,9 @@ class ProjectInventoryItem(models.Model):
 class ProjectSiteInventory(models.Model):
     """Per-site planned inventory for dismantle projects (serial-level)."""
 
+    # Columns matched by the serials search (trigram indexed, migration 0016)
+    SEARCH_FIELDS = ('serial_number', 'equipment_model', 'equipment_name', 'site_id_business', 'equipment_material_code')
+
     project_site = models.ForeignKey(
         'projects.ProjectSite', on_delete=models.CASCADE, related_name='planned_inventory', null=True, blank=True
     )
@@ -304,26 +309,61 @@ class ProjectSiteInventory(models.Model):
     def __str__(self) -> str:
         return f"psite={self.project_site_id} serial={self.serial_number}"
 
+    @staticmethod
+    def normalize_serial(serial_number) -> str:
+        """Serial form used by the uniqueness constraints (trim + upper)"""
+        return (serial_number or '').strip().upper()
+
+    def apply_equipment_snapshot(self, equipment_item):
+        """Fill the empty snapshot fields from equipment_item"""
+        if not equipment_item or (self.equipment_name and self.equipment_model):
+            return
+        self.equipment_name = self.equipment_name or (equipment_item.name or '')
+        # Try to derive model from specifications or material_code/category
+        model_val = ''
+        try:
+            specs = getattr(equipment_item, 'specifications', {}) or {}
+            model_val = specs.get('model') or ''
+        except Exception:
+            model_val = ''
+        self.equipment_model = self.equipment_model or (model_val or equipment_item.material_code or equipment_item.sub_category or '')
+        if not self.equipment_material_code:
+            self.equipment_material_code = equipment_item.material_code or ''
+
+    @classmethod
+    def prepare_for_bulk_create(cls, instances, equipment_map=None):
+        """
+        Do what save() does to a batch of unsaved instances so they can go
+        through bulk_create. equipment_map ({id: EquipmentInventoryItem})
+        supplies the items for snapshots; ids it lacks (and that the
+        instances have not loaded) are fetched in one query.
+        """
+        instances = list(instances)
+        equipment_map = dict(equipment_map or {})
+        missing = {
+            instance.equipment_item_id for instance in instances
+            if instance.equipment_item_id not in equipment_map
+            and not cls.equipment_item.is_cached(instance)
+        }
+        if missing:
+            from apps.equipment.models import EquipmentInventoryItem
+            equipment_map.update(EquipmentInventoryItem.objects.in_bulk(missing))
+
+        for instance in instances:
+            instance.serial_normalized = cls.normalize_serial(instance.serial_number)
+            if cls.equipment_item.is_cached(instance):
+                equipment_item = instance.equipment_item
+            else:
+                equipment_item = equipment_map.get(instance.equipment_item_id)
+            instance.apply_equipment_snapshot(equipment_item)
+        return instances
+
     def save(self, *args, **kwargs):
         # Normalize serial for uniqueness (trim + upper)
-        raw = (self.serial_number or '').strip()
-        self.serial_normalized = raw.upper()
+        self.serial_normalized = self.normalize_serial(self.serial_number)
         # Populate snapshot fields if empty
-        if self.equipment_item and not (self.equipment_name and self.equipment_model):
-            self.equipment_name = self.equipment_name or (self.equipment_item.name or '')
-            # Try to derive model from specifications or material_code/category
-            model_val = ''
-            try:
-                specs = getattr(self.equipment_item, 'specifications', {}) or {}
-                model_val = specs.get('model') or ''
-            except Exception:
-                model_val = ''
-            self.equipment_model = self.equipment_model or (model_val or self.equipment_item.material_code or self.equipment_item.sub_category or '')
-            if not self.equipment_material_code:
-                try:
-                    self.equipment_material_code = self.equipment_item.material_code or ''
-                except Exception:
-                    self.equipment_material_code = ''
+        if self.equipment_item_id:
+            self.apply_equipment_snapshot(self.equipment_item)
         super().save(*args, **kwargs)
 
 
@@ -437,7 +477,7 @@ class VendorInvitation(models.Model):
 # -----------------------------
 
 
-class ProjectSitesBulkUploadJob(models.Model):
+class ProjectSitesBulkUploadJob(BulkJobMixin):
     """
     Model to track bulk upload jobs for project sites import
     """
@@ -473,23 +513,29 @@ class ProjectSitesBulkUploadJob(models.Model):
     
     def __str__(self):
         return f"Project Sites Bulk Upload {self.id} - {self.file_name} ({self.status})"
-    
-    @property
-    def progress_percentage(self):
-        if self.total_rows == 0:
-            return 0
-        return round((self.processed_rows / self.total_rows) * 100, 2)
-    
-    @property
-    def duration(self):
-        if not self.started_at:
-            return None
-        from django.utils import timezone
-        end_time = self.completed_at or timezone.now()
-        return end_time - self.started_at
 
 
-class ProjectInventoryBulkUploadJob(models.Model):
+class ProjectSitesBulkUploadError(models.Model):
+    """
+    One failed row of a project sites import job, appended per chunk instead
+    of rewriting the job's detailed_errors JSON
+    """
+    job = models.ForeignKey('projects.ProjectSitesBulkUploadJob', on_delete=models.CASCADE, related_name='row_errors')
+    row = models.IntegerField()
+    error = models.TextField()
+
+    class Meta:
+        db_table = 'project_sites_bulk_upload_error'
+        ordering = ['row']
+        indexes = [
+            models.Index(fields=['job', 'row'], name='project_sit_job_id_row_idx'),
+        ]
+
+    def __str__(self):
+        return f"Job {self.job_id} row {self.row}: {self.error}"
+
+
+class ProjectInventoryBulkUploadJob(BulkJobMixin):
     """
     Model to track bulk upload jobs for project inventory (dismantle) uploads
     """
@@ -525,17 +571,3 @@ class ProjectInventoryBulkUploadJob(models.Model):
     
     def __str__(self):
         return f"Project Inventory Bulk Upload {self.id} - {self.file_name} ({self.status})"
-    
-    @property
-    def progress_percentage(self):
-        if self.total_rows == 0:
-            return 0
-        return round((self.processed_rows / self.total_rows) * 100, 2)
-    
-    @property
-    def duration(self):
-        if not self.started_at:
-            return None
-        from django.utils import timezone
-        end_time = self.completed_at or timezone.now()
-        return end_time - self.started_at
\ No newline at end of file
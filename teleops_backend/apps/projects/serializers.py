@@ -426,14 +426,20 @@ class LinkSitesRequestSerializer(serializers.Serializer):
     alias_name = serializers.CharField(required=False, allow_blank=True)
 
     def validate_site_ids(self, value):
+        # Resolve every requested site in one query; the view reuses them as 'sites'
         request = self.context.get('request')
         tenant = getattr(request, 'tenant', None)
-        existing = Site.objects.filter(id__in=value, tenant=tenant, deleted_at__isnull=True).values_list('id', flat=True)
-        missing = set(value) - set(existing)
+        value = list(dict.fromkeys(value))
+        self._sites = Site.objects.filter(id__in=value, tenant=tenant, deleted_at__isnull=True).in_bulk()
+        missing = set(value) - set(self._sites)
         if missing:
             raise serializers.ValidationError(f"Invalid site IDs for tenant: {sorted(missing)}")
         return value
 
+    def validate(self, attrs):
+        attrs['sites'] = self._sites
+        return attrs
+
 
 class ImportProjectSitesUploadSerializer(serializers.Serializer):
     file = serializers.FileField()
@@ -0,0 +1,14 @@
+"""
+Project services package
+"""
+
+from .project_sites_import_service import ProjectSitesImportService
+from .inventory_import_service import DismantleInventoryImportService, EquipmentResolver
+from .dashboard_stats_service import get_project_dashboard_stats
+
+__all__ = [
+    'ProjectSitesImportService',
+    'DismantleInventoryImportService',
+    'EquipmentResolver',
+    'get_project_dashboard_stats',
+]
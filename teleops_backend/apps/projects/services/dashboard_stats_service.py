@@ -0,0 +1,19 @@
+"""
+Project Dashboard Stats
+Cached per-tenant project status and type counts for ProjectViewSet.stats.
+"""
+
+from core.dashboard_stats import DashboardStats
+
+from ..models import Project
+
+
+def get_project_dashboard_stats() -> DashboardStats:
+    """Counts of the tenant's non-deleted projects by status and project type."""
+    return DashboardStats(
+        'projects',
+        Project,
+        group_fields=('status', 'project_type'),
+        filters={'deleted_at__isnull': True},
+        watch_fields=('deleted_at',),
+    )
@@ -0,0 +1,274 @@
+"""
+Dismantle Inventory Import Service
+Set-based import of planned dismantle serials (ProjectSiteInventory rows)
+for dismantle_bulk_upload and the async project inventory import, with the
+tenant's equipment catalog resolved from memory instead of per cell.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from apps.equipment.models import EquipmentInventoryItem
+from apps.tenants.services.permission_cache import LocalLRUCache
+
+from ..models import ProjectSite, ProjectSiteInventory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EQUIPMENT_RESOLUTION_SETTINGS = {
+    'PRELOAD_LIMIT': 50000,     # Catalog size up to which both lookup maps are loaded up front
+    'LRU_MAX_ENTRIES': 10000,   # Tokens remembered per import for larger catalogs
+}
+
+# Catalog columns needed to resolve a token and snapshot the item onto a serial
+EQUIPMENT_FIELDS = ('id', 'name', 'material_code', 'sub_category', 'specifications')
+
+_NOT_FOUND = object()
+
+
+def get_equipment_resolution_settings() -> Dict[str, Any]:
+    """Merge project overrides from settings.EQUIPMENT_RESOLUTION with defaults."""
+    return {**DEFAULT_EQUIPMENT_RESOLUTION_SETTINGS, **getattr(settings, 'EQUIPMENT_RESOLUTION', {})}
+
+
+def _cell(value) -> str:
+    """Stringify a spreadsheet cell; NaN/None become '' and integral floats lose the .0"""
+    if value is None:
+        return ''
+    try:
+        if value != value:  # NaN check
+            return ''
+    except Exception:
+        pass
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class EquipmentResolver:
+    """
+    Resolve a sheet token (material code or name) to a tenant equipment item.
+
+    An exact material_code match wins over a case-insensitive name match,
+    and ties go to the first item by (name, id) as with the catalog's
+    default ordering. Catalogs up to PRELOAD_LIMIT items are loaded into a
+    code map and an upper-cased name map on first use; larger catalogs are
+    queried per distinct token, with results (including misses) kept in an
+    LRU.
+    """
+
+    def __init__(self, tenant):
+        config = get_equipment_resolution_settings()
+        self.tenant = tenant
+        self.preload_limit = config['PRELOAD_LIMIT']
+        self.lru_max_entries = config['LRU_MAX_ENTRIES']
+        self._by_code: Optional[Dict[str, EquipmentInventoryItem]] = None
+        self._by_name: Optional[Dict[str, EquipmentInventoryItem]] = None
+        self._lru: Optional[LocalLRUCache] = None
+
+    def _catalog(self):
+        return EquipmentInventoryItem.objects.filter(tenant=self.tenant).only(*EQUIPMENT_FIELDS)
+
+    def _load(self):
+        if self._by_code is not None or self._lru is not None:
+            return
+        if self._catalog().count() > self.preload_limit:
+            self._lru = LocalLRUCache(max_entries=self.lru_max_entries, timeout=float('inf'))
+            return
+        self._by_code, self._by_name = {}, {}
+        for item in self._catalog().order_by('name', 'id').iterator(chunk_size=2000):
+            if item.material_code:
+                self._by_code.setdefault(item.material_code, item)
+            self._by_name.setdefault((item.name or '').upper(), item)
+
+    def resolve(self, name_or_code) -> Optional[EquipmentInventoryItem]:
+        token = _cell(name_or_code).strip()
+        if not token:
+            return None
+        self._load()
+        if self._lru is None:
+            return self._by_code.get(token) or self._by_name.get(token.upper())
+
+        item = self._lru.get(token)
+        if item is None:
+            catalog = self._catalog().order_by('name', 'id')
+            item = catalog.filter(material_code=token).first() or catalog.filter(name__iexact=token).first()
+            self._lru.set(token, item or _NOT_FOUND)
+        return None if item is _NOT_FOUND else item
+
+
+class DismantleInventoryImportService:
+    """
+    Import frames of dismantle serials into a plan.
+
+    equipment_columns lists {'equipment_col', 'serial_col'} pairs per row
+    (either column may be None). The project's active site links, the
+    plan's existing (site, equipment, serial) keys and the equipment catalog
+    are fetched once per service instance, so a frame costs one bulk insert
+    regardless of its row count. Serials already in the plan (or repeated in
+    the upload) are counted as skipped. Values too long for their columns
+    are reported per row before the insert; if a batch still fails (e.g. a
+    concurrent import inserted one of the serials) it is retried row by
+    row, counting unique-constraint conflicts as skipped.
+    """
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, project, plan, tenant, user, report_blank_equipment: bool = False):
+        self.project = project
+        self.plan = plan
+        self.tenant = tenant
+        self.user = user
+        # dismantle_bulk_upload reports blank equipment cells; the async import skips them
+        self.report_blank_equipment = report_blank_equipment
+        self.equipment = EquipmentResolver(tenant)
+        # Resolved items by id, for the snapshots taken before bulk_create
+        self._equipment_by_id: Dict[int, EquipmentInventoryItem] = {}
+        self._site_links: Optional[Dict[str, int]] = None
+        self._existing: Optional[set] = None
+
+    @staticmethod
+    def _key(project_site_id, site_business_id, equipment_item_id, serial_normalized):
+        # Mirrors the linked/unlinked unique constraints on ProjectSiteInventory
+        if project_site_id:
+            return ('linked', project_site_id, equipment_item_id, serial_normalized)
+        return ('unlinked', site_business_id, equipment_item_id, serial_normalized)
+
+    def _prefetch(self):
+        if self._site_links is not None:
+            return
+        self._site_links = {}
+        links = (
+            ProjectSite.objects.filter(project=self.project, is_active=True)
+            .order_by('id').values_list('site__site_id', 'id')
+        )
+        for site_id, project_site_id in links:
+            self._site_links.setdefault(site_id, project_site_id)
+
+        self._existing = set()
+        rows = (
+            ProjectSiteInventory.objects.filter(plan=self.plan, deleted_at__isnull=True)
+            .order_by().values_list('project_site_id', 'site_id_business', 'equipment_item_id', 'serial_normalized')
+        )
+        for row in rows.iterator(chunk_size=5000):
+            self._existing.add(self._key(*row))
+
+    def import_frame(self, df, start_row_num: int, site_col: str, equipment_columns: List[Dict[str, Optional[str]]]) -> Dict[str, Any]:
+        """
+        Import df; start_row_num is the spreadsheet row number of its first
+        row. Returns created, skipped and errors ({row, error}).
+        """
+        self._prefetch()
+        rows = []  # (rownum, items, keys) of rows ready to insert
+        skipped = 0
+        errors = []
+
+        for offset, record in enumerate(df.to_dict('records')):
+            rownum = start_row_num + offset
+            # A row is imported whole or not at all, as with the old per-row savepoint
+            row_items, row_keys = [], set()
+            try:
+                site_business_id = _cell(record.get(site_col)).strip()
+                if not site_business_id:
+                    continue
+                self._check_length('site_id_business', site_business_id, 'Site ID')
+                project_site_id = self._site_links.get(site_business_id)
+
+                for config in equipment_columns:
+                    equipment_col, serial_col = config.get('equipment_col'), config.get('serial_col')
+                    equipment_name = _cell(record.get(equipment_col)).strip() if equipment_col else ''
+                    if not equipment_name and not self.report_blank_equipment:
+                        continue
+
+                    serial_str = _cell(record.get(serial_col)).strip() if serial_col else ''
+                    # Handle "NA" as empty serial; equipment without serials is still planned
+                    if serial_str.upper() == 'NA':
+                        serial_str = ''
+                    self._check_length('serial_number', serial_str, 'Serial')
+
+                    eq = self.equipment.resolve(equipment_name)
+                    if not eq:
+                        errors.append({'row': rownum, 'error': f'Equipment not found: {equipment_name or "(empty)"}'})
+                        continue
+
+                    self._equipment_by_id[eq.id] = eq
+                    normalized = ProjectSiteInventory.normalize_serial(serial_str)
+                    key = self._key(project_site_id, site_business_id, eq.id, normalized)
+                    if key in self._existing or key in row_keys:
+                        skipped += 1
+                        continue
+                    row_keys.add(key)
+
+                    row_items.append(ProjectSiteInventory(
+                        plan=self.plan,
+                        project_site_id=project_site_id,  # may be None (deferred linking)
+                        equipment_item_id=eq.id,
+                        serial_number=serial_str,
+                        site_id_business=site_business_id,
+                        created_by=self.user,
+                    ))
+            except Exception as e:
+                errors.append({'row': rownum, 'error': str(e)})
+                continue
+            if row_items:
+                rows.append((rownum, row_items, row_keys))
+                self._existing |= row_keys
+
+        ProjectSiteInventory.prepare_for_bulk_create(
+            [item for _, row_items, _ in rows for item in row_items], self._equipment_by_id
+        )
+        created, conflicts = self._insert(rows, errors)
+        errors.sort(key=lambda error: error['row'])
+
+        return {
+            'created': created,
+            'skipped': skipped + conflicts,
+            'errors': errors,
+        }
+
+    @staticmethod
+    def _check_length(field_name: str, value: str, label: str):
+        max_length = ProjectSiteInventory._meta.get_field(field_name).max_length
+        if len(value) > max_length:
+            raise ValueError(f'{label} longer than {max_length} characters: {value[:20]}...')
+
+    def _insert(self, rows, errors):
+        """bulk_create rows in batches; a failing batch is retried row by row"""
+        created = conflicts = 0
+        with transaction.atomic():
+            for start in range(0, len(rows), self.BATCH_SIZE):
+                batch = rows[start:start + self.BATCH_SIZE]
+                items = [item for _, row_items, _ in batch for item in row_items]
+                try:
+                    with transaction.atomic():
+                        ProjectSiteInventory.objects.bulk_create(items)
+                    created += len(items)
+                    continue
+                except Exception as e:
+                    logger.warning(f"Bulk serial insert failed, retrying {len(batch)} rows individually: {str(e)}")
+
+                for rownum, row_items, row_keys in batch:
+                    row_created = row_conflicts = 0
+                    try:
+                        with transaction.atomic():
+                            for item in row_items:
+                                item.pk = None
+                                try:
+                                    with transaction.atomic():
+                                        ProjectSiteInventory.objects.bulk_create([item])
+                                    row_created += 1
+                                except IntegrityError as conflict:
+                                    if 'unique' not in str(conflict).lower():
+                                        raise
+                                    # Already planned by a concurrent import
+                                    row_conflicts += 1
+                    except Exception as row_error:
+                        self._existing -= row_keys
+                        errors.append({'row': rownum, 'error': str(row_error)})
+                        continue
+                    created += row_created
+                    conflicts += row_conflicts
+        return created, conflicts
@@ -0,0 +1,190 @@
+"""
+Project Sites Import Service
+Set-based linking of uploaded sites to a project, creating missing master
+sites, shared by ProjectSitesImportView and the async project sites import.
+"""
+
+import logging
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db import transaction
+
+from apps.sites.models import Site
+from apps.sites.services import sync_site_summaries_on_commit
+
+from ..models import ProjectSite
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = ['site_id', 'global_id', 'site_name', 'cluster', 'latitude', 'longitude']
+
+
+def _text(value) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        # Numeric ids read as float because of blank cells (e.g. 1001.0)
+        value = int(value)
+    return str(value).strip()
+
+
+class ProjectSitesImportService:
+    """
+    Import frames of (site_id, global_id, site_name, town, cluster, address,
+    latitude, longitude) rows into a project.
+
+    The tenant's site_id -> site and global_id maps and the project's linked
+    sites are fetched once per service instance and kept current as frames
+    are imported, so a frame costs a bulk insert of new master sites and a
+    bulk insert of links regardless of its row count. Rows naming an existing
+    site_id link that site; otherwise a master site is created (coordinates
+    and global_id permitting). Links that already exist are counted as
+    skipped.
+    """
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, project, tenant, user):
+        self.project = project
+        self.tenant = tenant
+        self.user = user
+        self._site_pks: Optional[Dict[str, int]] = None
+        self._global_ids: Optional[set] = None
+        self._linked: Optional[set] = None
+
+    @staticmethod
+    def missing_columns(columns) -> List[str]:
+        return [col for col in REQUIRED_COLUMNS if col not in columns]
+
+    def _prefetch(self):
+        if self._site_pks is not None:
+            return
+        self._site_pks, self._global_ids = {}, set()
+        rows = (
+            Site.objects.filter(tenant=self.tenant, deleted_at__isnull=True)
+            .order_by().values_list('pk', 'site_id', 'global_id')
+        )
+        for pk, site_id, global_id in rows.iterator(chunk_size=5000):
+            self._site_pks.setdefault(site_id, pk)
+            self._global_ids.add(global_id)
+        self._linked = set(
+            ProjectSite.objects.filter(project=self.project).values_list('site_id', flat=True)
+        )
+
+    def import_frame(self, df, start_row_num: int) -> Dict[str, Any]:
+        """
+        Import df; start_row_num is the spreadsheet row number of its first
+        row. Returns created_master, linked, skipped and errors ({row, error}).
+        """
+        self._prefetch()
+        errors = []
+        new_sites: Dict[str, Tuple[int, Site]] = {}  # site_id -> (rownum, unsaved site)
+        # (rownum, site_id) of every row that should end up linked
+        to_link: List[Tuple[int, str]] = []
+
+        for offset, record in enumerate(df.to_dict('records')):
+            rownum = start_row_num + offset
+            try:
+                site_id_val = _text(record.get('site_id'))
+                global_id_val = _text(record.get('global_id'))
+                site_name_val = _text(record.get('site_name'))
+                town_val = _text(record.get('town'))
+                cluster_val = _text(record.get('cluster'))
+                address_val = _text(record.get('address'))
+                lat_val = float(record.get('latitude'))
+                lng_val = float(record.get('longitude'))
+            except (TypeError, ValueError) as e:
+                errors.append({'row': rownum, 'error': str(e)})
+                continue
+
+            if not all([site_id_val, global_id_val, site_name_val, cluster_val]):
+                errors.append({'row': rownum, 'error': 'site_id, global_id, site_name, cluster required'})
+                continue
+
+            if site_id_val not in self._site_pks and site_id_val not in new_sites:
+                if not (-90 <= lat_val <= 90) or not (-180 <= lng_val <= 180):
+                    errors.append({'row': rownum, 'error': 'Invalid coordinates'})
+                    continue
+                if global_id_val in self._global_ids:
+                    errors.append({'row': rownum, 'error': f'Global ID {global_id_val} already exists'})
+                    continue
+                site = Site(
+                    tenant=self.tenant,
+                    created_by=self.user,
+                    site_id=site_id_val,
+                    global_id=global_id_val,
+                    site_name=site_name_val,
+                    town=town_val,
+                    cluster=cluster_val,
+                    latitude=lat_val,
+                    longitude=lng_val,
+                    address=address_val,
+                    # Legacy fields for compatibility
+                    name=site_name_val,
+                    site_code=site_id_val,
+                )
+                site.refresh_geohash()
+                new_sites[site_id_val] = (rownum, site)
+                self._global_ids.add(global_id_val)
+
+            to_link.append((rownum, site_id_val))
+
+        with transaction.atomic():
+            created_master, failed = self._create_sites(new_sites, errors)
+            linked, skipped = self._link_sites(to_link, failed)
+
+        errors.sort(key=lambda error: error['row'])
+        return {
+            'created_master': created_master,
+            'linked': linked,
+            'skipped': skipped,
+            'errors': errors,
+        }
+
+    def _create_sites(self, new_sites, errors) -> Tuple[int, set]:
+        """bulk_create the new master sites; a failing batch is retried row by row"""
+        created, failed = [], set()
+        pending = list(new_sites.items())
+        for start in range(0, len(pending), self.BATCH_SIZE):
+            batch = pending[start:start + self.BATCH_SIZE]
+            try:
+                with transaction.atomic():
+                    Site.objects.bulk_create([site for _, (_, site) in batch])
+                created.extend(site for _, (_, site) in batch)
+            except Exception as e:
+                # e.g. a concurrent import created one of the ids after the prefetch
+                logger.warning(f"Bulk master site insert failed, retrying {len(batch)} rows individually: {str(e)}")
+                for site_id, (rownum, site) in batch:
+                    site.pk = None
+                    try:
+                        with transaction.atomic():
+                            site.save()
+                        created.append(site)
+                    except Exception as row_error:
+                        failed.add(site_id)
+                        self._global_ids.discard(site.global_id)
+                        errors.append({'row': rownum, 'error': str(row_error)})
+
+        for site in created:
+            self._site_pks[site.site_id] = site.pk
+        if created:
+            # bulk_create sends no post_save signals
+            sync_site_summaries_on_commit(self.tenant.id, {(site.cluster, site.town) for site in created})
+        return len(created), failed
+
+    def _link_sites(self, to_link, failed) -> Tuple[int, int]:
+        links, skipped = [], 0
+        for _, site_id in to_link:
+            if site_id in failed:
+                continue
+            site_pk = self._site_pks[site_id]
+            if site_pk in self._linked:
+                skipped += 1
+                continue
+            self._linked.add(site_pk)
+            links.append(ProjectSite(project=self.project, site_id=site_pk, alias_name='', created_by=self.user))
+
+        # Conflicts (a concurrent import linking the same site) are skipped by the database
+        ProjectSite.objects.bulk_create(links, batch_size=self.BATCH_SIZE, ignore_conflicts=True)
+        return len(links), skipped
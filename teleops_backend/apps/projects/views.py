@@ -9,7 +9,6 @@ from django_filters.rest_framework import DjangoFilterBackend
 import logging
 
 from .models import Project, ProjectDesign, ProjectDesignVersion, DesignItem, ProjectSite, ProjectInventoryPlan, ProjectSiteInventory, ProjectVendor, VendorInvitation, ProjectSitesBulkUploadJob, ProjectInventoryBulkUploadJob
-from apps.sites.models import Site
 from .serializers import (
     ProjectSerializer, ProjectDetailSerializer, ProjectCreateSerializer,
     ProjectUpdateSerializer, ProjectStatsSerializer,
@@ -18,9 +17,14 @@ from .serializers import (
     ProjectInventoryPlanSerializer, CreateProjectInventoryPlanSerializer, ProjectSiteInventorySerializer, DismantleBulkUploadSerializer,
     AccessibleProjectSerializer,
 )
-from apps.equipment.models import EquipmentInventoryItem
 from core.permissions.tenant_permissions import TenantScopedPermission, IsTenantMember
 from core.pagination import StandardResultsSetPagination
+from core.search import TextSearch
+from core.dashboard_stats import DashboardStats
+from core.jobs import start_bulk_job
+from core.spreadsheet_reader import SpreadsheetReader
+from .jobs import ProjectSitesImportRunner, ProjectInventoryImportRunner
+from .services import ProjectSitesImportService, DismantleInventoryImportService, get_project_dashboard_stats
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +39,10 @@ class ProjectViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'start_date', 'end_date', 'name']
     ordering = ['-created_at']
 
+    def get_keyset_ordering(self):
+        # Only the serials list supports ?pagination=cursor; other actions keep page numbers
+        return ('-created_at', '-id') if self.action == 'list_site_serials' else None
+
     def get_queryset(self):
         """Default queryset: tenant-owned projects only.
 
@@ -275,16 +283,18 @@ class ProjectViewSet(viewsets.ModelViewSet):
         
         projects = Project.objects.filter(tenant=tenant, deleted_at__isnull=True)
         
-        # Calculate statistics
-        total_projects = projects.count()
-        active_projects = projects.filter(status='active').count()
-        completed_projects = projects.filter(status='completed').count()
-        planning_projects = projects.filter(status='planning').count()
-        on_hold_projects = projects.filter(status='on_hold').count()
-        cancelled_projects = projects.filter(status='cancelled').count()
+        # Status and type counts from one grouped query, cached per tenant
+        summary = get_project_dashboard_stats().get(tenant.id)
+        status_counts = summary['status']
+        total_projects = summary['total']
+        active_projects = status_counts.get('active', 0)
+        completed_projects = status_counts.get('completed', 0)
+        planning_projects = status_counts.get('planning', 0)
+        on_hold_projects = status_counts.get('on_hold', 0)
+        cancelled_projects = status_counts.get('cancelled', 0)
         
         # Project type breakdown
-        project_types = projects.values('project_type').annotate(count=models.Count('id')).order_by('project_type')
+        project_types = DashboardStats.breakdown(summary, 'project_type')
         
         # Recent projects
         recent_projects = projects.order_by('-created_at')[:5]
@@ -296,7 +306,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
             'planning_projects': planning_projects,
             'on_hold_projects': on_hold_projects,
             'cancelled_projects': cancelled_projects,
-            'project_types': list(project_types),
+            'project_types': project_types,
             'recent_projects': ProjectSerializer(recent_projects, many=True).data,
             'completion_rate': (completed_projects / total_projects * 100) if total_projects > 0 else 0
         }
@@ -327,6 +337,8 @@ class ProjectViewSet(viewsets.ModelViewSet):
             tenant=tenant,
             deleted_at__isnull=True
         ).update(status=new_status, updated_at=timezone.now())
+        # Queryset updates send no signals
+        get_project_dashboard_stats().invalidate_on_commit(tenant.id)
         
         logger.info(f"Bulk updated {updated_count} projects to status {new_status} by {request.user.email}")
         
@@ -674,6 +686,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
         """Link multiple sites to a project manually.
         
         Expected payload: {"site_ids": [1, 2, 3], "alias_name": "optional"}
+        The response lists an outcome per site id (linked, relinked, already_linked, failed).
         """
         project = self.get_object()
         serializer = LinkSitesRequestSerializer(data=request.data, context={'request': request})
@@ -681,47 +694,61 @@ class ProjectViewSet(viewsets.ModelViewSet):
         
         site_ids = serializer.validated_data['site_ids']
         alias_name = serializer.validated_data.get('alias_name', '')
-        tenant = getattr(request, 'tenant', None)
+        sites = serializer.validated_data['sites']  # {id: Site}, resolved in one query
         
-        linked_sites = []
         errors = []
+        results = []
         
         with transaction.atomic():
-            for site_id in site_ids:
-                try:
-                    # Check if site exists and belongs to tenant
-                    site = Site.objects.get(id=site_id, tenant=tenant, deleted_at__isnull=True)
-                    
-                    # Check if already linked
-                    existing_link = ProjectSite.objects.filter(
-                        project=project, 
-                        site=site, 
-                        is_active=True
-                    ).first()
-                    
-                    if existing_link:
-                        errors.append(f"Site {site.site_name or site.site_id} is already linked to this project")
-                        continue
-                    
-                    # Create the link
-                    project_site = ProjectSite.objects.create(
-                        project=project,
-                        site=site,
-                        alias_name=alias_name,
-                        is_active=True,
-                        created_by=request.user
-                    )
-                    linked_sites.append(project_site)
-                    
-                except Site.DoesNotExist:
-                    errors.append(f"Site with ID {site_id} not found")
-                except Exception as e:
-                    errors.append(f"Failed to link site {site_id}: {str(e)}")
+            # Existing links (active or not) for all requested sites in one query
+            existing = {
+                link.site_id: link
+                for link in ProjectSite.objects.filter(project=project, site_id__in=site_ids)
+            }
+            reactivate = [site_id for site_id in site_ids if site_id in existing and not existing[site_id].is_active]
+            if reactivate:
+                ProjectSite.objects.filter(project=project, site_id__in=reactivate).update(
+                    is_active=True, alias_name=alias_name, updated_at=timezone.now()
+                )
+            
+            new_ids = [site_id for site_id in site_ids if site_id not in existing]
+            ProjectSite.objects.bulk_create(
+                [
+                    ProjectSite(project=project, site=sites[site_id], alias_name=alias_name,
+                                is_active=True, created_by=request.user)
+                    for site_id in new_ids
+                ],
+                batch_size=1000,
+                ignore_conflicts=True,  # a concurrent request may link the same site
+            )
+            
+            # ignore_conflicts returns no primary keys; read back what is now linked
+            links = {
+                link.site_id: link
+                for link in ProjectSite.objects.filter(project=project, site_id__in=new_ids + reactivate)
+            }
+        
+        linked_sites = []
+        for site_id in site_ids:
+            site = sites[site_id]
+            if site_id in existing and existing[site_id].is_active:
+                outcome = 'already_linked'
+                errors.append(f"Site {site.site_name or site.site_id} is already linked to this project")
+            elif site_id in links:
+                outcome = 'relinked' if site_id in existing else 'linked'
+                link = links[site_id]
+                link.site = site
+                linked_sites.append(link)
+            else:
+                outcome = 'failed'
+                errors.append(f"Failed to link site {site_id}")
+            results.append({'site_id': site_id, 'outcome': outcome})
         
         # Prepare response
         response_data = {
             'linked_count': len(linked_sites),
-            'linked_sites': ProjectSiteSerializer(linked_sites, many=True).data
+            'linked_sites': ProjectSiteSerializer(linked_sites, many=True).data,
+            'results': results,
         }
         
         if errors:
@@ -782,24 +809,14 @@ class ProjectViewSet(viewsets.ModelViewSet):
         if equipment_item_id:
             qs = qs.filter(equipment_item_id=equipment_item_id)
         if search:
-            qs = qs.filter(
-                models.Q(serial_number__icontains=search) | 
-                models.Q(equipment_model__icontains=search) | 
-                models.Q(equipment_name__icontains=search) |
-                models.Q(site_id_business__icontains=search) |
-                models.Q(equipment_material_code__icontains=search)
-            )
+            qs = TextSearch(ProjectSiteInventory.SEARCH_FIELDS).filter(qs, search)
         if linked == 'true':
             qs = qs.filter(project_site__isnull=False)
         elif linked == 'false':
             qs = qs.filter(project_site__isnull=True)
 
-        # Add debugging info for search queries
-        total_count = qs.count()
-        logger.info(f"Project {project.id} inventory search - Total records found: {total_count}, Search term: '{search}'")
-        
-        # Apply ordering and pagination
-        qs_ordered = qs.order_by('-created_at')
+        # Apply ordering and pagination (page-number, or keyset on (created_at, id) with ?pagination=cursor)
+        qs_ordered = qs.order_by('-created_at', '-id')
         page = self.paginate_queryset(qs_ordered)
         
         if page is not None:
@@ -830,12 +847,9 @@ class ProjectViewSet(viewsets.ModelViewSet):
         upload_ser.is_valid(raise_exception=True)
         file = request.FILES['file']
 
-        import pandas as pd
         try:
-            if file.name.lower().endswith(('.xlsx', '.xls')):
-                df = pd.read_excel(file)
-            else:
-                df = pd.read_csv(file)
+            reader = SpreadsheetReader(file)
+            columns = reader.headers
         except Exception as e:
             return Response({'error': f'Failed to read file: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -849,22 +863,10 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 tenant=tenant, project=project, project_type='dismantle', created_by=request.user
             )
 
-        # Mapping for equipment columns to EquipmentInventoryItem lookup
-        # Prefer material_code exact match; fallback to name (case-insensitive)
-        def resolve_equipment(name_or_code: str) -> EquipmentInventoryItem | None:
-            if not name_or_code:
-                return None
-            token = str(name_or_code).strip()
-            # Prefer material_code match (exact) over name
-            eq = EquipmentInventoryItem.objects.filter(tenant=tenant, material_code=token).first()
-            if eq:
-                return eq
-            return EquipmentInventoryItem.objects.filter(tenant=tenant, name__iexact=token).first()
-
         # Columns expected in the sheet
         def pick_col(candidates: list[str]) -> str | None:
             for c in candidates:
-                if c in df.columns:
+                if c in columns:
                     return c
             return None
 
@@ -877,124 +879,24 @@ class ProjectViewSet(viewsets.ModelViewSet):
         if not site_col:
             return Response({'error': 'Missing required column: Site ID'}, status=status.HTTP_400_BAD_REQUEST)
 
+        # Two potential serials per row
+        equipment_columns = []
+        if radio_col or radio_serial_col:
+            equipment_columns.append({'equipment_col': radio_col, 'serial_col': radio_serial_col})
+        if dug_col or dug_serial_col:
+            equipment_columns.append({'equipment_col': dug_col, 'serial_col': dug_serial_col})
+
         created = 0
         skipped = 0
         errors = []
 
-        for idx, row in df.iterrows():
-            rownum = idx + 2
-            sp = transaction.savepoint()
-            try:
-                # Helper to stringify cells from pandas reliably
-                def cell(v):
-                    import math
-                    if v is None:
-                        return ''
-                    try:
-                        # Handle pandas NA
-                        if v != v:  # NaN check
-                            return ''
-                    except Exception:
-                        pass
-                    if isinstance(v, (int,)):
-                        return str(v)
-                    if isinstance(v, float):
-                        if v.is_integer():
-                            return str(int(v))
-                        return str(v)
-                    return str(v)
-
-                site_business_id = cell(row.get(site_col)).strip()
-                if not site_business_id:
-                    continue
-                # Resolve project_site by business site_id → master Site → ProjectSite link
-                ps = ProjectSite.objects.filter(
-                    project=project,
-                    site__site_id=site_business_id,
-                    is_active=True
-                ).select_related('site').first()
-
-                # Two potential serials per row
-                pairs = []
-                if radio_col or radio_serial_col:
-                    pairs.append((cell(row.get(radio_col)) if radio_col else '', cell(row.get(radio_serial_col)) if radio_serial_col else ''))
-                if dug_col or dug_serial_col:
-                    pairs.append((cell(row.get(dug_col)) if dug_col else '', cell(row.get(dug_serial_col)) if dug_serial_col else ''))
-                for equipment_name, serial in pairs:
-                    serial_str = cell(serial).strip()
-                    # Handle "NA" as empty serial
-                    if serial_str.upper() == 'NA':
-                        serial_str = ''
-                    
-                    # Allow equipment without serial numbers - we should still create the inventory record
-                    # Note: we still need equipment_name to be present
-                    eq = resolve_equipment(cell(equipment_name).strip()) if equipment_name is not None else None
-                    if not eq:
-                        errors.append({'row': rownum, 'error': f'Equipment not found: {equipment_name if equipment_name else "(empty)"}'})
-                        continue
-
-                    # Idempotent insert - for equipment without serials, check by equipment_item instead
-                    normalized = serial_str.strip().upper() if serial_str else ''
-                    
-                    # Enhanced idempotency check - check by equipment_item + site + serial combination
-                    if serial_str:
-                        # For equipment with serial numbers, check by equipment + site + serial
-                        if ps:
-                            exists = ProjectSiteInventory.objects.filter(
-                                plan=plan,
-                                project_site=ps,
-                                equipment_item=eq,
-                                serial_normalized=normalized,
-                                deleted_at__isnull=True
-                            ).exists()
-                        else:
-                            exists = ProjectSiteInventory.objects.filter(
-                                plan=plan,
-                                project_site__isnull=True,
-                                site_id_business=site_business_id,
-                                equipment_item=eq,
-                                serial_normalized=normalized,
-                                deleted_at__isnull=True
-                            ).exists()
-                    else:
-                        # For equipment without serial numbers, check by equipment_item + site to avoid duplicates
-                        if ps:
-                            exists = ProjectSiteInventory.objects.filter(
-                                plan=plan,
-                                project_site=ps,
-                                equipment_item=eq,
-                                serial_number='',  # Empty serial
-                                deleted_at__isnull=True
-                            ).exists()
-                        else:
-                            exists = ProjectSiteInventory.objects.filter(
-                                plan=plan,
-                                project_site__isnull=True,
-                                site_id_business=site_business_id,
-                                equipment_item=eq,
-                                serial_number='',  # Empty serial
-                                deleted_at__isnull=True
-                            ).exists()
-                    if exists:
-                        skipped += 1
-                        continue
-
-                    item = ProjectSiteInventory(
-                        plan=plan,
-                        project_site=ps,  # may be None (deferred linking)
-                        equipment_item=eq,
-                        serial_number=serial_str,
-                        site_id_business=site_business_id,
-                        equipment_material_code=getattr(eq, 'material_code', '') or '',
-                        created_by=request.user,
-                    )
-                    # Use bulk-friendly insert path
-                    item.save()
-                    created += 1
-                    transaction.savepoint_commit(sp)
-            except Exception as e:
-                transaction.savepoint_rollback(sp)
-                errors.append({'row': rownum, 'error': str(e)})
+        # One importer for the whole file: site links, existing serials and equipment are loaded once
+        importer = DismantleInventoryImportService(project, plan, tenant, request.user, report_blank_equipment=True)
+        for chunk in reader.iter_chunks():
+            result = importer.import_frame(chunk, int(chunk.index[0]) + 2, site_col, equipment_columns)
+            created += result['created']
+            skipped += result['skipped']
+            errors.extend(result['errors'])
 
         return Response({
             'plan_id': plan.id,
@@ -1189,20 +1091,16 @@ class ProjectSitesImportView(APIView):
             upload_ser.is_valid(raise_exception=True)
             file = request.FILES['file']
 
-            import pandas as pd
             try:
-                if file.name.lower().endswith(('.xlsx', '.xls')):
-                    df = pd.read_excel(file)
-                else:
-                    df = pd.read_csv(file)
+                reader = SpreadsheetReader(file)
+                columns = reader.headers
             except Exception as e:
                 return Response(
                     {'error': f'Failed to read file: {str(e)}'}, 
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            required = ['site_id', 'global_id', 'site_name', 'cluster', 'latitude', 'longitude']
-            missing = [c for c in required if c not in df.columns]
+            missing = ProjectSitesImportService.missing_columns(columns)
             if missing:
                 return Response(
                     {'error': f'Missing required columns: {", ".join(missing)}'}, 
@@ -1214,61 +1112,15 @@ class ProjectSitesImportView(APIView):
             skipped = 0
             errors = []
 
+            # One importer for the whole file so the tenant's site maps are fetched once
+            importer = ProjectSitesImportService(project, tenant, request.user)
             with transaction.atomic():
-                for idx, row in df.iterrows():
-                    rownum = idx + 2
-                    try:
-                        site_id_val = str(row.get('site_id') or '').strip()
-                        global_id_val = str(row.get('global_id') or '').strip()
-                        site_name_val = str(row.get('site_name') or '').strip()
-                        town_val = str(row.get('town') or '').strip()
-                        cluster_val = str(row.get('cluster') or '').strip()
-                        address_val = str(row.get('address') or '').strip()
-                        lat_val = float(row.get('latitude'))
-                        lng_val = float(row.get('longitude'))
-
-                        if not all([site_id_val, global_id_val, site_name_val, cluster_val]):
-                            errors.append({'row': rownum, 'error': 'site_id, global_id, site_name, cluster required'})
-                            continue
-
-                        # find or create master site
-                        site = Site.objects.filter(tenant=tenant, site_id=site_id_val, deleted_at__isnull=True).first()
-                        if not site:
-                            if not (-90 <= lat_val <= 90) or not (-180 <= lng_val <= 180):
-                                errors.append({'row': rownum, 'error': 'Invalid coordinates'})
-                                continue
-                            if Site.objects.filter(tenant=tenant, global_id=global_id_val, deleted_at__isnull=True).exists():
-                                errors.append({'row': rownum, 'error': f'Global ID {global_id_val} already exists'})
-                                continue
-                            site = Site.objects.create(
-                                tenant=tenant,
-                                created_by=request.user,
-                                site_id=site_id_val,
-                                global_id=global_id_val,
-                                site_name=site_name_val,
-                                town=town_val,
-                                cluster=cluster_val,
-                                latitude=lat_val,
-                                longitude=lng_val,
-                                address=address_val,
-                                # Legacy fields for compatibility
-                                name=site_name_val,
-                                site_code=site_id_val,
-                            )
-                            created_master += 1
-
-                        # link to project (idempotent)
-                        link, created = ProjectSite.objects.get_or_create(
-                            project=project,
-                            site=site,
-                            defaults={'alias_name': '', 'created_by': request.user}
-                        )
-                        if created:
-                            linked += 1
-                        else:
-                            skipped += 1
-                    except Exception as e:
-                        errors.append({'row': rownum, 'error': str(e)})
+                for chunk in reader.iter_chunks():
+                    result = importer.import_frame(chunk, int(chunk.index[0]) + 2)
+                    created_master += result['created_master']
+                    linked += result['linked']
+                    skipped += result['skipped']
+                    errors.extend(result['errors'])
 
             return Response({
                 'created_master': created_master,
@@ -1328,18 +1180,9 @@ class AsyncProjectSitesImportView(APIView):
             upload_ser.is_valid(raise_exception=True)
             file = request.FILES['file']
             
-            # Estimate row count
-            import pandas as pd
+            # Estimate row count without loading the sheet
             try:
-                if file.name.lower().endswith(('.xlsx', '.xls')):
-                    df = pd.read_excel(file, nrows=0)  # Just get headers
-                    file.seek(0)  # Reset file pointer
-                    df_sample = pd.read_excel(file)
-                    estimated_rows = len(df_sample)
-                else:
-                    df_sample = pd.read_csv(file)
-                    estimated_rows = len(df_sample)
-                
+                estimated_rows = SpreadsheetReader(file).count_rows()
                 file.seek(0)  # Reset file pointer for actual processing
             except Exception as e:
                 return Response(
@@ -1357,19 +1200,8 @@ class AsyncProjectSitesImportView(APIView):
                 status='pending'
             )
             
-            # Read file content into memory before starting background thread
-            file.seek(0)  # Reset to beginning
-            file_content = file.read()
-            file_name = file.name
-            
-            # Start async processing
-            import threading
-            def process_file():
-                self._process_large_upload_async(job, file_content, file_name, request.user)
-            
-            thread = threading.Thread(target=process_file)
-            thread.daemon = True
-            thread.start()
+            # Queue durable background processing of the stored upload
+            start_bulk_job(ProjectSitesImportRunner, job, file)
             
             logger.info(f"Started async project sites import job {job.id} for project {project_id}")
             
@@ -1386,153 +1218,6 @@ class AsyncProjectSitesImportView(APIView):
                 {'error': 'Failed to start import process'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-    
-    def _process_large_upload_async(self, job, file_content, file_name, user):
-        """Process the file asynchronously in chunks"""
-        try:
-            job.status = 'processing'
-            job.started_at = timezone.now()
-            job.detailed_errors = []
-            job.save()
-
-            import pandas as pd
-            from io import BytesIO
-            
-            # Read the file from content
-            file_stream = BytesIO(file_content)
-            if file_name.lower().endswith(('.xlsx', '.xls')):
-                df = pd.read_excel(file_stream)
-            else:
-                df = pd.read_csv(file_stream)
-
-            # Validate required columns
-            required = ['site_id', 'global_id', 'site_name', 'cluster', 'latitude', 'longitude']
-            missing = [c for c in required if c not in df.columns]
-            if missing:
-                job.status = 'failed'
-                job.error_message = f'Missing required columns: {", ".join(missing)}'
-                job.completed_at = timezone.now()
-                job.save()
-                return
-            
-            # Update total rows with actual count
-            job.total_rows = len(df)
-            job.save()
-            
-            # Process in chunks
-            chunk_size = 50
-            all_errors = []
-            total_created_master = 0
-            total_linked = 0
-            total_skipped = 0
-            
-            for i in range(0, len(df), chunk_size):
-                chunk = df.iloc[i:i + chunk_size]
-                
-                chunk_result = self._process_chunk(
-                    chunk, job.project, job.tenant, user, i + 1
-                )
-                
-                # Update counters
-                total_created_master += chunk_result['created_master']
-                total_linked += chunk_result['linked']
-                total_skipped += chunk_result['skipped']
-                all_errors.extend(chunk_result['errors'])
-                
-                # Update job progress
-                job.processed_rows = min(i + chunk_size, len(df))
-                job.created_master = total_created_master
-                job.linked_count = total_linked
-                job.skipped_count = total_skipped
-                job.error_count = len(all_errors)
-                job.detailed_errors = all_errors
-                job.save()
-                
-                logger.info(f"Project sites import job {job.id}: processed {job.processed_rows}/{job.total_rows} rows")
-            
-            # Mark as completed
-            job.status = 'completed'
-            job.completed_at = timezone.now()
-            job.save()
-            
-            logger.info(f"Project sites import job {job.id} completed: {total_created_master} created, {total_linked} linked, {total_skipped} skipped, {len(all_errors)} errors")
-            
-        except Exception as e:
-            logger.error(f"Error in async project sites import job {job.id}: {str(e)}")
-            job.status = 'failed'
-            job.error_message = str(e)
-            job.completed_at = timezone.now()
-            job.save()
-    
-    def _process_chunk(self, chunk_df, project, tenant, user, start_row_num):
-        """Process a chunk of the dataframe"""
-        created_master = 0
-        linked = 0
-        skipped = 0
-        errors = []
-
-        with transaction.atomic():
-            for idx, row in chunk_df.iterrows():
-                rownum = start_row_num + (idx - chunk_df.index[0])
-                try:
-                    site_id_val = str(row.get('site_id') or '').strip()
-                    global_id_val = str(row.get('global_id') or '').strip()
-                    site_name_val = str(row.get('site_name') or '').strip()
-                    town_val = str(row.get('town') or '').strip()
-                    cluster_val = str(row.get('cluster') or '').strip()
-                    address_val = str(row.get('address') or '').strip()
-                    lat_val = float(row.get('latitude'))
-                    lng_val = float(row.get('longitude'))
-
-                    if not all([site_id_val, global_id_val, site_name_val, cluster_val]):
-                        errors.append({'row': rownum, 'error': 'site_id, global_id, site_name, cluster required'})
-                        continue
-
-                    # find or create master site
-                    site = Site.objects.filter(tenant=tenant, site_id=site_id_val, deleted_at__isnull=True).first()
-                    if not site:
-                        if not (-90 <= lat_val <= 90) or not (-180 <= lng_val <= 180):
-                            errors.append({'row': rownum, 'error': 'Invalid coordinates'})
-                            continue
-                        if Site.objects.filter(tenant=tenant, global_id=global_id_val, deleted_at__isnull=True).exists():
-                            errors.append({'row': rownum, 'error': f'Global ID {global_id_val} already exists'})
-                            continue
-                        site = Site.objects.create(
-                            tenant=tenant,
-                            created_by=user,
-                            site_id=site_id_val,
-                            global_id=global_id_val,
-                            site_name=site_name_val,
-                            town=town_val,
-                            cluster=cluster_val,
-                            latitude=lat_val,
-                            longitude=lng_val,
-                            address=address_val,
-                            # Legacy fields for compatibility
-                            name=site_name_val,
-                            site_code=site_id_val,
-                        )
-                        created_master += 1
-
-                    # link to project (idempotent)
-                    link, created = ProjectSite.objects.get_or_create(
-                        project=project,
-                        site=site,
-                        defaults={'alias_name': '', 'created_by': user}
-                    )
-                    if created:
-                        linked += 1
-                    else:
-                        skipped += 1
-                except Exception as e:
-                    errors.append({'row': rownum, 'error': str(e)})
-
-        return {
-            'created_master': created_master,
-            'linked': linked,
-            'skipped': skipped,
-            'errors': errors
-        }
 
 
 class ProjectSitesBulkUploadJobStatusView(APIView):
@@ -1585,7 +1270,8 @@ class ProjectSitesBulkUploadJobStatusView(APIView):
                     'skipped_count': job.skipped_count,
                     'error_count': job.error_count,
                     'error_message': job.error_message,
-                    'errors': job.detailed_errors or [],
+                    # Jobs from before the row error table kept errors on the job
+                    'errors': list(job.row_errors.values('row', 'error')) or job.detailed_errors or [],
                     'started_at': job.started_at,
                     'completed_at': job.completed_at,
                     'duration': str(job.duration) if job.duration else None,
@@ -1802,12 +1488,9 @@ class ProjectInventoryImportView(APIView):
             upload_ser.is_valid(raise_exception=True)
             file = request.FILES['file']
 
-            import pandas as pd
             try:
-                if file.name.lower().endswith(('.xlsx', '.xls')):
-                    df = pd.read_excel(file)
-                else:
-                    df = pd.read_csv(file)
+                reader = SpreadsheetReader(file)
+                columns = reader.headers
             except Exception as e:
                 return Response(
                     {'error': f'Failed to read file: {str(e)}'}, 
@@ -1826,7 +1509,7 @@ class ProjectInventoryImportView(APIView):
             # Column mapping helpers
             def pick_col(candidates: list[str]) -> str | None:
                 for c in candidates:
-                    if c in df.columns:
+                    if c in columns:
                         return c
                 return None
 
@@ -1839,7 +1522,7 @@ class ProjectInventoryImportView(APIView):
             errors = []
 
             # Process rows (simplified version for sync upload)
-            for idx, row in df.iterrows():
+            for idx, row in reader.iterrows():
                 rownum = idx + 2
                 try:
                     site_business_id = str(row.get(site_col) or '').strip()
@@ -1912,16 +1595,9 @@ class AsyncProjectInventoryImportView(APIView):
             upload_ser.is_valid(raise_exception=True)
             file = request.FILES['file']
             
-            # Estimate row count
-            import pandas as pd
+            # Estimate row count without loading the sheet
             try:
-                if file.name.lower().endswith(('.xlsx', '.xls')):
-                    df_sample = pd.read_excel(file)
-                    estimated_rows = len(df_sample)
-                else:
-                    df_sample = pd.read_csv(file)
-                    estimated_rows = len(df_sample)
-                
+                estimated_rows = SpreadsheetReader(file).count_rows()
                 file.seek(0)  # Reset file pointer for actual processing
             except Exception as e:
                 return Response(
@@ -1950,19 +1626,8 @@ class AsyncProjectInventoryImportView(APIView):
                 status='pending'
             )
             
-            # Read file content into memory before starting background thread
-            file.seek(0)  # Reset to beginning
-            file_content = file.read()
-            file_name = file.name
-            
-            # Start async processing
-            import threading
-            def process_file():
-                self._process_large_upload_async(job, file_content, file_name, request.user)
-            
-            thread = threading.Thread(target=process_file)
-            thread.daemon = True
-            thread.start()
+            # Queue durable background processing of the stored upload
+            start_bulk_job(ProjectInventoryImportRunner, job, file)
             
             logger.info(f"Started async project inventory import job {job.id} for project {project_id}")
             
@@ -1980,272 +1645,6 @@ class AsyncProjectInventoryImportView(APIView):
                 {'error': 'Failed to start import process'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-    
-    def _process_large_upload_async(self, job, file_content, file_name, user):
-        """Process the file asynchronously in chunks"""
-        try:
-            job.status = 'processing'
-            job.started_at = timezone.now()
-            job.detailed_errors = []
-            job.save()
-            
-            import pandas as pd
-            from io import BytesIO
-            
-            # Read the file from content
-            file_stream = BytesIO(file_content)
-            if file_name.lower().endswith(('.xlsx', '.xls')):
-                df = pd.read_excel(file_stream)
-            else:
-                df = pd.read_csv(file_stream)
-            
-            # Column mapping helpers
-            def pick_col(candidates: list[str]) -> str | None:
-                for c in candidates:
-                    if c in df.columns:
-                        return c
-                return None
-
-            site_col = pick_col(['Site ID', 'SiteId', 'site_id'])
-            
-            # Unified column detection - find all Equipment X (Material Code or Name) columns
-            equipment_columns = []
-            for col in df.columns:
-                if 'Equipment' in col and 'Material Code' in col:
-                    # Extract equipment number from column name
-                    import re
-                    match = re.search(r'Equipment (\d+)', col)
-                    if match:
-                        equipment_num = match.group(1)
-                        serial_col = pick_col([f'Equipment {equipment_num} Serial'])
-                        if serial_col:
-                            equipment_columns.append({
-                                'equipment_col': col,
-                                'serial_col': serial_col,
-                                'number': equipment_num
-                            })
-            
-            # Fallback to legacy column names for backward compatibility
-            if not equipment_columns:
-                legacy_pairs = [
-                    {
-                        'equipment_col': pick_col(['Radio (Material Code or Name)', 'Card (Material Code or Name)', 'Card Mat Code', 'Radio', 'Radio Name']),
-                        'serial_col': pick_col(['Radio Serial', 'Card Serial', 'RadioSerial', 'Radio SN']),
-                        'number': '1'
-                    },
-                    {
-                        'equipment_col': pick_col(['DUG/DUX (Material Code or Name)', 'DUW (Material Code or Name)', 'DXU Mat Code', 'DUG/DUX', 'DUG', 'DXU']),
-                        'serial_col': pick_col(['DUG/DUX Serial', 'DUW Serial', 'DUG Serial', 'DXU Serial', 'DUX Serial']),
-                        'number': '2'
-                    }
-                ]
-                equipment_columns = [pair for pair in legacy_pairs if pair['equipment_col'] and pair['serial_col']]
-
-            if not site_col:
-                job.status = 'failed'
-                job.error_message = 'Missing required column: Site ID'
-                job.completed_at = timezone.now()
-                job.save()
-                return
-            
-            # Update total rows with actual count
-            job.total_rows = len(df)
-            job.save()
-            
-            # Process in chunks
-            chunk_size = 50
-            all_errors = []
-            total_created = 0
-            total_skipped = 0
-            
-            for i in range(0, len(df), chunk_size):
-                chunk = df.iloc[i:i + chunk_size]
-                
-                chunk_result = self._process_inventory_chunk(
-                    chunk, job.project, job.plan, job.tenant, user, i + 1, 
-                    site_col, equipment_columns
-                )
-                
-                # Update counters
-                total_created += chunk_result['created']
-                total_skipped += chunk_result['skipped']
-                all_errors.extend(chunk_result['errors'])
-                
-                # Update job progress
-                job.processed_rows = min(i + chunk_size, len(df))
-                job.created_count = total_created
-                job.skipped_count = total_skipped
-                job.error_count = len(all_errors)
-                job.detailed_errors = all_errors
-                job.save()
-                
-                logger.info(f"Project inventory import job {job.id}: processed {job.processed_rows}/{job.total_rows} rows")
-            
-            # Mark as completed
-            job.status = 'completed'
-            job.completed_at = timezone.now()
-            job.save()
-            
-            logger.info(f"Project inventory import job {job.id} completed: {total_created} created, {total_skipped} skipped, {len(all_errors)} errors")
-            
-        except Exception as e:
-            logger.error(f"Error in async project inventory import job {job.id}: {str(e)}")
-            job.status = 'failed'
-            job.error_message = str(e)
-            job.completed_at = timezone.now()
-            job.save()
-    
-    def _process_inventory_chunk(self, chunk_df, project, plan, tenant, user, start_row_num, 
-                                site_col, equipment_columns):
-        """Process a chunk of the inventory dataframe"""
-        created = 0
-        skipped = 0
-        errors = []
-
-        # Equipment resolver helper
-        def resolve_equipment(name_or_code: str) -> EquipmentInventoryItem | None:
-            if not name_or_code:
-                return None
-            token = str(name_or_code).strip()
-            # Prefer material_code match (exact) over name
-            eq = EquipmentInventoryItem.objects.filter(tenant=tenant, material_code=token).first()
-            if eq:
-                return eq
-            return EquipmentInventoryItem.objects.filter(tenant=tenant, name__iexact=token).first()
-
-        # Cell value helper
-        def cell(v):
-            if v is None:
-                return ''
-            try:
-                # Handle pandas NA
-                if v != v:  # NaN check
-                    return ''
-            except Exception:
-                pass
-            if isinstance(v, (int,)):
-                return str(v)
-            if isinstance(v, float):
-                if v.is_integer():
-                    return str(int(v))
-                return str(v)
-            return str(v)
-
-        for idx, row in chunk_df.iterrows():
-            rownum = start_row_num + (idx - chunk_df.index[0])
-            # Use individual savepoint for each row to prevent atomic block issues
-            sp = transaction.savepoint()
-            try:
-                site_business_id = cell(row.get(site_col)).strip()
-                if not site_business_id:
-                    transaction.savepoint_rollback(sp)
-                    continue
-                
-                # Resolve project_site by business site_id → master Site → ProjectSite link
-                ps = ProjectSite.objects.filter(
-                        project=project,
-                        site__site_id=site_business_id,
-                        is_active=True
-                    ).select_related('site').first()
-
-                # Process all equipment columns dynamically
-                for equipment_config in equipment_columns:
-                    equipment_col = equipment_config['equipment_col']
-                    serial_col = equipment_config['serial_col']
-                    
-                    equipment_name = cell(row.get(equipment_col)) if equipment_col else ''
-                    serial = cell(row.get(serial_col)) if serial_col else ''
-                    
-                    # Skip if equipment name is empty - but ALLOW equipment with empty/blank/NA serials
-                    if not equipment_name or equipment_name.strip() == '':
-                        continue  # Continue to next equipment, not rollback entire row
-                            
-                    serial_str = serial.strip()
-                    # Handle "NA" as empty serial
-                    if serial_str.upper() == 'NA':
-                        serial_str = ''
-                    
-                    # IMPORTANT: Allow equipment without serial numbers - we should still create the inventory record
-                    # This ensures equipment with "NA", empty, or blank serials are included in the inventory
-                    # The equipment record should be created even if serial_str is empty
-                    
-                    eq = resolve_equipment(cell(equipment_name).strip()) if equipment_name is not None else None
-                    if not eq:
-                        errors.append({'row': rownum, 'error': f'Equipment not found: {equipment_name if equipment_name else "(empty)"}'})
-                        continue  # Continue to next equipment, not rollback entire row
-
-                    # Idempotent insert - for equipment without serials, check by equipment_item instead
-                    normalized = serial_str.strip().upper() if serial_str else ''
-                    
-                    # Enhanced idempotency check - check by equipment_item + site + serial combination
-                    if serial_str:
-                        # For equipment with serial numbers, check by equipment + site + serial
-                        if ps:
-                            exists = ProjectSiteInventory.objects.filter(
-                                plan=plan,
-                                project_site=ps,
-                                equipment_item=eq,
-                                serial_normalized=normalized,
-                                deleted_at__isnull=True
-                            ).exists()
-                        else:
-                            exists = ProjectSiteInventory.objects.filter(
-                                plan=plan,
-                                project_site__isnull=True,
-                                site_id_business=site_business_id,
-                                equipment_item=eq,
-                                serial_normalized=normalized,
-                                deleted_at__isnull=True
-                            ).exists()
-                    else:
-                        # For equipment without serial numbers, check by equipment_item + site to avoid duplicates
-                        if ps:
-                            exists = ProjectSiteInventory.objects.filter(
-                                plan=plan,
-                                project_site=ps,
-                                equipment_item=eq,
-                                serial_number='',  # Empty serial
-                                deleted_at__isnull=True
-                            ).exists()
-                        else:
-                            exists = ProjectSiteInventory.objects.filter(
-                                plan=plan,
-                                project_site__isnull=True,
-                                site_id_business=site_business_id,
-                                equipment_item=eq,
-                                serial_number='',  # Empty serial
-                                deleted_at__isnull=True
-                            ).exists()
-                    
-                    if exists:
-                        skipped += 1
-                        continue  # Continue to next equipment, not rollback entire row
-
-                    item = ProjectSiteInventory(
-                        plan=plan,
-                        project_site=ps,  # may be None (deferred linking)
-                        equipment_item=eq,
-                        serial_number=serial_str,
-                        site_id_business=site_business_id,
-                        equipment_material_code=getattr(eq, 'material_code', '') or '',
-                        created_by=user,
-                    )
-                    item.save()
-                    created += 1
-                
-                # Commit the row savepoint if we reach here successfully
-                transaction.savepoint_commit(sp)
-                        
-            except Exception as e:
-                # Rollback this row and continue with next row
-                transaction.savepoint_rollback(sp)
-                errors.append({'row': rownum, 'error': str(e)})
-
-        return {
-            'created': created,
-            'skipped': skipped,
-            'errors': errors
-        }
 
 
 class ProjectInventoryBulkUploadJobStatusView(APIView):
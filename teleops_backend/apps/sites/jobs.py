@@ -0,0 +1,28 @@
+"""
+Background job runners for site uploads
+"""
+
+from core.jobs import BulkJobRunner
+
+from .models import BulkUploadJob, BulkUploadError
+from .services import SiteImportService
+
+
+class SiteBulkUploadRunner(BulkJobRunner):
+    """Large circle site master uploads (AsyncBulkSiteUploadView)"""
+
+    job_model = BulkUploadJob
+    error_model = BulkUploadError
+    chunk_size = SiteImportService.BATCH_SIZE
+    counter_fields = {'success_count': 'success_count'}
+
+    def prepare(self, columns):
+        missing_columns = SiteImportService.missing_columns(columns)
+        if missing_columns:
+            return f"Missing required columns: {', '.join(missing_columns)}"
+        self.importer = SiteImportService(self.job.tenant, self.job.created_by)
+        return None
+
+    def process_chunk(self, chunk_df, start_row):
+        # Unexpected errors propagate so the runner retries the chunk
+        return self.importer.import_frame(chunk_df)
@@ -0,0 +1,39 @@
+"""
+Management command to rebuild the per-tenant cluster/town dimension tables.
+
+Usage:
+    python manage.py rebuild_site_dimensions                 # All tenants
+    python manage.py rebuild_site_dimensions --tenant-id ID  # One tenant
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.tenants.models import Tenant
+from apps.sites.services.site_dimension_service import SiteDimensionService
+from apps.sites.services.site_statistics_service import get_site_statistics_service
+
+
+class Command(BaseCommand):
+    help = 'Recount the site cluster/town dimension tables used by the site filters and statistics'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant-id',
+            type=str,
+            help='Only rebuild the dimensions of a specific tenant',
+        )
+
+    def handle(self, *args, **options):
+        tenant_id = options.get('tenant_id')
+
+        tenants = Tenant.objects.all()
+        if tenant_id:
+            tenants = tenants.filter(id=tenant_id)
+            if not tenants.exists():
+                raise CommandError(f'Tenant {tenant_id} not found')
+
+        for tenant in tenants:
+            SiteDimensionService(tenant.id).rebuild()
+            get_site_statistics_service().invalidate(tenant.id)
+            self.stdout.write(f'{tenant.organization_name}: dimensions rebuilt')
+
+        self.stdout.write(self.style.SUCCESS('Site dimensions rebuilt'))
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.10 on 2026-10-16 21:30
+
+from django.db import migrations, models
+
+from core.geohash import encode as encode_geohash
+
+
+def backfill_geohash(apps, schema_editor):
+    Site = apps.get_model("sites", "Site")
+    batch = []
+    for site in Site.objects.only("id", "latitude", "longitude").iterator(chunk_size=2000):
+        if site.latitude is None or site.longitude is None:
+            continue
+        site.geohash = encode_geohash(site.latitude, site.longitude)
+        batch.append(site)
+        if len(batch) >= 2000:
+            Site.objects.bulk_update(batch, ["geohash"])
+            batch = []
+    if batch:
+        Site.objects.bulk_update(batch, ["geohash"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("sites", "0008_bulk_job_resume_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="site",
+            name="geohash",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Geohash of latitude/longitude, maintained on save",
+                max_length=12,
+            ),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="site",
+            index=models.Index(
+                fields=["tenant", "geohash"],
+                name="sites_tenant_geohash_idx",
+                opclasses=["uuid_ops", "varchar_pattern_ops"],
+            ),
+        ),
+    ]
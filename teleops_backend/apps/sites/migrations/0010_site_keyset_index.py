@@ -0,0 +1,18 @@
+# Generated by Django 4.2.10 on 2026-10-16 21:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("sites", "0009_site_geohash"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="site",
+            index=models.Index(
+                fields=["tenant", "created_at", "id"], name="sites_tenant_created_id_idx"
+            ),
+        ),
+    ]
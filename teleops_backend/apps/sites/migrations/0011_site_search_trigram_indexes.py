@@ -0,0 +1,48 @@
+# Generated manually: pg_trgm indexes for the site list search (Site.SEARCH_FIELDS)
+
+from django.db import migrations
+
+FORWARD_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm;",
+    (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS sites_site_name_trgm_idx "
+        "ON sites USING gin ((UPPER(site_name::text)) gin_trgm_ops);"
+    ),
+    (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS sites_site_id_trgm_idx "
+        "ON sites USING gin ((UPPER(site_id::text)) gin_trgm_ops);"
+    ),
+    (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS sites_global_id_trgm_idx "
+        "ON sites USING gin ((UPPER(global_id::text)) gin_trgm_ops);"
+    ),
+    (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS sites_town_trgm_idx "
+        "ON sites USING gin ((UPPER(town::text)) gin_trgm_ops);"
+    ),
+    (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS sites_cluster_trgm_idx "
+        "ON sites USING gin ((UPPER(cluster::text)) gin_trgm_ops);"
+    ),
+]
+
+REVERSE_SQL = [
+    "DROP INDEX CONCURRENTLY IF EXISTS sites_site_name_trgm_idx;",
+    "DROP INDEX CONCURRENTLY IF EXISTS sites_site_id_trgm_idx;",
+    "DROP INDEX CONCURRENTLY IF EXISTS sites_global_id_trgm_idx;",
+    "DROP INDEX CONCURRENTLY IF EXISTS sites_town_trgm_idx;",
+    "DROP INDEX CONCURRENTLY IF EXISTS sites_cluster_trgm_idx;",
+]
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("sites", "0010_site_keyset_index"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=FORWARD_SQL, reverse_sql=REVERSE_SQL),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 4.2.10 on 2026-10-16 22:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_dimensions(apps, schema_editor):
+    Site = apps.get_model("sites", "Site")
+    SiteCluster = apps.get_model("sites", "SiteCluster")
+    SiteTown = apps.get_model("sites", "SiteTown")
+
+    rows = (
+        Site.objects.filter(deleted_at__isnull=True)
+        .order_by()
+        .values_list("tenant_id", "cluster", "town")
+        .annotate(count=Count("id"))
+    )
+    towns, clusters = [], {}
+    for tenant_id, cluster, town, count in rows:
+        towns.append(SiteTown(tenant_id=tenant_id, cluster=cluster, name=town, site_count=count))
+        clusters[(tenant_id, cluster)] = clusters.get((tenant_id, cluster), 0) + count
+
+    SiteTown.objects.bulk_create(towns, batch_size=1000)
+    SiteCluster.objects.bulk_create(
+        [
+            SiteCluster(tenant_id=tenant_id, name=cluster, site_count=count)
+            for (tenant_id, cluster), count in clusters.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tenants", "0032_transfer_circle_vendor_data"),
+        ("sites", "0011_site_search_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SiteCluster",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=100)),
+                ("site_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "tenant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="site_clusters",
+                        to="tenants.tenant",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "site_clusters",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="SiteTown",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("cluster", models.CharField(max_length=100)),
+                ("name", models.CharField(max_length=100)),
+                ("site_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "tenant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="site_towns",
+                        to="tenants.tenant",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "site_towns",
+                "ordering": ["name"],
+                "indexes": [models.Index(fields=["tenant", "name"], name="site_towns_tenant_name_idx")],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="sitecluster",
+            constraint=models.UniqueConstraint(fields=("tenant", "name"), name="unique_site_cluster_per_tenant"),
+        ),
+        migrations.AddConstraint(
+            model_name="sitetown",
+            constraint=models.UniqueConstraint(
+                fields=("tenant", "cluster", "name"), name="unique_site_town_per_tenant_cluster"
+            ),
+        ),
+        migrations.RunPython(backfill_dimensions, migrations.RunPython.noop),
+    ]
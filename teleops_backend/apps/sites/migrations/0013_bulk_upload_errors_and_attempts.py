@@ -0,0 +1,41 @@
+# Generated by Django 4.2.10 on 2026-10-16 23:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("sites", "0012_site_cluster_town_dimensions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bulkuploadjob",
+            name="attempts",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Consecutive runs stopped by an unexpected error"
+            ),
+        ),
+        migrations.CreateModel(
+            name="BulkUploadError",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("row", models.IntegerField()),
+                ("error", models.TextField()),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="row_errors",
+                        to="sites.bulkuploadjob",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "sites_bulk_upload_error",
+                "ordering": ["row"],
+                "indexes": [models.Index(fields=["job", "row"], name="sites_bulk_job_id_row_idx")],
+            },
+        ),
+    ]
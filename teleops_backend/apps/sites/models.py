@@ -1,7 +1,8 @@
 from django.db import models
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
-from django.utils import timezone
+from core.jobs.models import BulkJobMixin
+from core.geohash import encode as encode_geohash
 
 
 class Site(models.Model):
@@ -23,6 +24,9 @@ class Site(models.Model):
         ('decommissioned', 'Decommissioned'),
     )
 
+    # Columns matched by the site list search (trigram indexed, migration 0011)
+    SEARCH_FIELDS = ('site_name', 'site_id', 'global_id', 'town', 'cluster')
+
     # Core relationships - Multi-tenant isolation
     tenant = models.ForeignKey('tenants.Tenant', on_delete=models.CASCADE, related_name='sites')
     
@@ -34,6 +38,7 @@ class Site(models.Model):
     cluster = models.CharField(max_length=100, help_text="Zone/operational cluster")
     latitude = models.DecimalField(max_digits=9, decimal_places=6, help_text="Geographic coordinate")
     longitude = models.DecimalField(max_digits=9, decimal_places=6, help_text="Geographic coordinate")
+    geohash = models.CharField(max_length=12, blank=True, default='', help_text="Geohash of latitude/longitude, maintained on save")
     
     # Optional Site Fields
     address = models.TextField(blank=True, help_text="Site address")
@@ -99,6 +104,12 @@ class Site(models.Model):
             models.Index(fields=['site_id']),
             models.Index(fields=['global_id']),
             models.Index(fields=['deleted_at']),
+            models.Index(fields=['tenant', 'created_at', 'id'], name='sites_tenant_created_id_idx'),
+            models.Index(
+                fields=['tenant', 'geohash'],
+                name='sites_tenant_geohash_idx',
+                opclasses=['uuid_ops', 'varchar_pattern_ops'],
+            ),
         ]
 
     def __str__(self):
@@ -122,6 +133,20 @@ class Site(models.Model):
         
         return ", ".join(address_parts) if address_parts else "Address not available"
 
+    def refresh_geohash(self):
+        """Recompute geohash from the coordinates (bulk_create does not call save)"""
+        if self.latitude is None or self.longitude is None:
+            self.geohash = ''
+        else:
+            self.geohash = encode_geohash(self.latitude, self.longitude)
+
+    def save(self, *args, **kwargs):
+        self.refresh_geohash()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'geohash'}
+        super().save(*args, **kwargs)
+
     def clean(self):
         """Validate site data"""
         from django.core.exceptions import ValidationError
@@ -133,7 +158,47 @@ class Site(models.Model):
             raise ValidationError("Longitude must be between -180 and 180 degrees") 
 
 
-class BulkUploadJob(models.Model):
+
+class SiteCluster(models.Model):
+    """Per-tenant cluster dimension with the number of active (non-deleted) sites"""
+    tenant = models.ForeignKey('tenants.Tenant', on_delete=models.CASCADE, related_name='site_clusters')
+    name = models.CharField(max_length=100)
+    site_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'site_clusters'
+        ordering = ['name']
+        constraints = [
+            models.UniqueConstraint(fields=['tenant', 'name'], name='unique_site_cluster_per_tenant'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.site_count})"
+
+
+class SiteTown(models.Model):
+    """Per-tenant town dimension (within a cluster) with the number of active sites"""
+    tenant = models.ForeignKey('tenants.Tenant', on_delete=models.CASCADE, related_name='site_towns')
+    cluster = models.CharField(max_length=100)
+    name = models.CharField(max_length=100)
+    site_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'site_towns'
+        ordering = ['name']
+        constraints = [
+            models.UniqueConstraint(fields=['tenant', 'cluster', 'name'], name='unique_site_town_per_tenant_cluster'),
+        ]
+        indexes = [
+            models.Index(fields=['tenant', 'name'], name='site_towns_tenant_name_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} / {self.cluster} ({self.site_count})"
+
+class BulkUploadJob(BulkJobMixin):
     """
     Model to track bulk upload jobs for large file uploads
     """
@@ -166,16 +231,23 @@ class BulkUploadJob(models.Model):
     
     def __str__(self):
         return f"Bulk Upload {self.id} - {self.file_name} ({self.status})"
-    
-    @property
-    def progress_percentage(self):
-        if self.total_rows == 0:
-            return 0
-        return round((self.processed_rows / self.total_rows) * 100, 2)
-    
-    @property
-    def duration(self):
-        if not self.started_at:
-            return None
-        end_time = self.completed_at or timezone.now()
-        return end_time - self.started_at
\ No newline at end of file
+
+
+class BulkUploadError(models.Model):
+    """
+    One failed row of a site bulk upload job, appended per chunk instead of
+    rewriting the job's detailed_errors JSON
+    """
+    job = models.ForeignKey('sites.BulkUploadJob', on_delete=models.CASCADE, related_name='row_errors')
+    row = models.IntegerField()
+    error = models.TextField()
+
+    class Meta:
+        db_table = 'sites_bulk_upload_error'
+        ordering = ['row']
+        indexes = [
+            models.Index(fields=['job', 'row'], name='sites_bulk_job_id_row_idx'),
+        ]
+
+    def __str__(self):
+        return f"Job {self.job_id} row {self.row}: {self.error}"
@@ -0,0 +1,22 @@
+"""
+Site services package
+"""
+
+from .site_import_service import SiteImportService, REQUIRED_COLUMNS
+from .site_export_service import SiteExportService
+from .site_geo_service import SiteGeoAnalysisService, SiteSpatialSearch, NEAREST_MAX_RADIUS_KM
+from .site_statistics_service import SiteStatisticsService, get_site_statistics_service
+from .site_dimension_service import SiteDimensionService, sync_site_summaries_on_commit
+
+__all__ = [
+    'SiteImportService',
+    'REQUIRED_COLUMNS',
+    'SiteExportService',
+    'SiteGeoAnalysisService',
+    'SiteSpatialSearch',
+    'NEAREST_MAX_RADIUS_KM',
+    'SiteStatisticsService',
+    'get_site_statistics_service',
+    'SiteDimensionService',
+    'sync_site_summaries_on_commit',
+]
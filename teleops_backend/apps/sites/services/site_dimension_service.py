@@ -0,0 +1,133 @@
+"""
+Site Dimension Service
+Keeps the per-tenant SiteCluster/SiteTown dimension tables (distinct values
+with site counts) in sync with site writes and imports, for the filter
+dropdowns and the site statistics summary.
+"""
+
+import logging
+from typing import Iterable, Optional, Set, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from apps.tenants.models import Tenant
+
+from ..models import Site, SiteCluster, SiteTown
+from .site_statistics_service import get_site_statistics_service
+
+logger = logging.getLogger(__name__)
+
+Pair = Tuple[str, str]  # (cluster, town)
+
+
+class SiteDimensionService:
+    """
+    Maintain cluster/town dimension rows for one tenant.
+
+    refresh() recounts only the (cluster, town) pairs a write touched, using
+    the town/cluster index, and upserts or removes the matching dimension
+    rows; cluster totals are re-summed from their towns. rebuild() recounts
+    the whole tenant and repairs any drift; the rebuild_site_dimensions
+    command and the nightly rebuild_site_dimensions task run it.
+
+    Both take a lock on the tenant row before counting, so concurrent
+    refreshes of a tenant run one after the other and the last writer
+    always stores counts taken after every earlier commit.
+    """
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, tenant_id):
+        self.tenant_id = tenant_id
+
+    def refresh(self, pairs: Iterable[Pair]):
+        pairs = {(cluster, town) for cluster, town in pairs if cluster is not None and town is not None}
+        if not pairs:
+            return
+        clusters = {cluster for cluster, _ in pairs}
+        towns = {town for _, town in pairs}
+
+        with transaction.atomic():
+            self._lock_tenant()
+            rows = (
+                Site.objects.filter(tenant_id=self.tenant_id, deleted_at__isnull=True, cluster__in=clusters, town__in=towns)
+                .order_by().values_list('cluster', 'town').annotate(count=Count('id'))
+            )
+            counts = {(cluster, town): count for cluster, town, count in rows if (cluster, town) in pairs}
+
+            self._upsert_towns(counts)
+            for cluster in clusters:
+                gone = [town for c, town in pairs if c == cluster and (c, town) not in counts]
+                if gone:
+                    SiteTown.objects.filter(tenant_id=self.tenant_id, cluster=cluster, name__in=gone).delete()
+            self._resum_clusters(clusters)
+
+    def rebuild(self):
+        """Recount every cluster and town of the tenant"""
+        with transaction.atomic():
+            self._lock_tenant()
+            rows = (
+                Site.objects.filter(tenant_id=self.tenant_id, deleted_at__isnull=True)
+                .order_by().values_list('cluster', 'town').annotate(count=Count('id'))
+            )
+            counts = {(cluster, town): count for cluster, town, count in rows}
+
+            SiteTown.objects.filter(tenant_id=self.tenant_id).delete()
+            SiteCluster.objects.filter(tenant_id=self.tenant_id).delete()
+            self._upsert_towns(counts)
+            self._resum_clusters({cluster for cluster, _ in counts})
+
+    def _lock_tenant(self):
+        # Serialises dimension maintenance per tenant; the counts are read after the lock
+        list(Tenant.objects.select_for_update().filter(id=self.tenant_id).values_list('id', flat=True))
+
+    def _upsert_towns(self, counts):
+        SiteTown.objects.bulk_create(
+            [
+                SiteTown(tenant_id=self.tenant_id, cluster=cluster, name=town, site_count=count)
+                for (cluster, town), count in counts.items()
+            ],
+            batch_size=self.BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['tenant', 'cluster', 'name'],
+            update_fields=['site_count', 'updated_at'],
+        )
+
+    def _resum_clusters(self, clusters: Set[str]):
+        totals = dict(
+            SiteTown.objects.filter(tenant_id=self.tenant_id, cluster__in=clusters)
+            .order_by().values_list('cluster').annotate(total=Sum('site_count'))
+        )
+        SiteCluster.objects.bulk_create(
+            [SiteCluster(tenant_id=self.tenant_id, name=cluster, site_count=total) for cluster, total in totals.items()],
+            batch_size=self.BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['tenant', 'name'],
+            update_fields=['site_count', 'updated_at'],
+        )
+        gone = clusters - set(totals)
+        if gone:
+            SiteCluster.objects.filter(tenant_id=self.tenant_id, name__in=gone).delete()
+
+
+def sync_site_summaries_on_commit(tenant_id, pairs: Optional[Iterable[Pair]] = None):
+    """
+    After the current transaction commits, refresh the touched dimension rows
+    (all of them when pairs is None) and then retire the cached statistics,
+    which read the dimensions.
+    """
+    pairs = None if pairs is None else set(pairs)
+
+    def sync():
+        try:
+            service = SiteDimensionService(tenant_id)
+            if pairs is None:
+                service.rebuild()
+            else:
+                service.refresh(pairs)
+        except Exception as e:
+            logger.error(f"Failed to refresh site dimensions for tenant {tenant_id}: {str(e)}")
+        get_site_statistics_service().invalidate(tenant_id)
+
+    transaction.on_commit(sync)
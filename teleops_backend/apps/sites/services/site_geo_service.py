@@ -0,0 +1,240 @@
+"""
+Site Geo Service
+Coverage radius, geographic center and covered area of a tenant's sites,
+computed with NumPy from a single coordinate fetch for GeographicAnalysisView,
+and geohash-backed radius / bounding-box search for the nearby site APIs.
+"""
+
+from functools import reduce
+from operator import or_
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from django.db.models import Q, QuerySet
+
+from core import geohash
+
+EARTH_RADIUS_KM = 6371.0
+
+# Hulls up to this many vertices get an exact all-pairs great-circle diameter;
+# larger ones fall back to rotating calipers on the projected hull
+HULL_PAIRWISE_LIMIT = 2000
+
+# Rows of the all-pairs distance matrix evaluated at a time
+PAIRWISE_BLOCK_SIZE = 256
+
+# Nearest-site search starts at this radius and doubles up to the maximum
+NEAREST_START_RADIUS_KM = 2.0
+NEAREST_MAX_RADIUS_KM = 500.0
+
+# Fields returned for each site by the spatial search
+SEARCH_FIELDS = [
+    'id', 'site_id', 'global_id', 'site_name', 'town', 'cluster',
+    'latitude', 'longitude', 'site_type', 'status',
+]
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great circle distance in kilometers; arguments in degrees, scalars or arrays"""
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _cross(o, a, b) -> float:
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _discard_interior(points: np.ndarray) -> np.ndarray:
+    """
+    Drop points strictly inside the quadrilateral spanned by the extreme
+    points (Akl-Toussaint), so the hull scan only sees the outer candidates.
+    """
+    quad = points[[
+        points[:, 0].argmin(),
+        points[:, 1].argmin(),
+        points[:, 0].argmax(),
+        points[:, 1].argmax(),
+    ]]
+    inside = np.ones(len(points), dtype=bool)
+    for start, end in zip(quad, np.roll(quad, -1, axis=0)):
+        inside &= (end[0] - start[0]) * (points[:, 1] - start[1]) - (end[1] - start[1]) * (points[:, 0] - start[0]) > 0
+    return points[~inside]
+
+
+def convex_hull(points: np.ndarray) -> np.ndarray:
+    """Convex hull vertices (monotone chain), counter-clockwise, without a repeated end point"""
+    points = np.unique(_discard_interior(points), axis=0)
+    if len(points) < 3:
+        return points
+
+    lower, upper = [], []
+    for point in points:
+        while len(lower) >= 2 and _cross(lower[-2], lower[-1], point) <= 0:
+            lower.pop()
+        lower.append(point)
+    for point in points[::-1]:
+        while len(upper) >= 2 and _cross(upper[-2], upper[-1], point) <= 0:
+            upper.pop()
+        upper.append(point)
+    return np.array(lower[:-1] + upper[:-1])
+
+
+def _antipodal_pairs(hull: np.ndarray):
+    """Antipodal vertex pairs of a counter-clockwise hull (rotating calipers)"""
+    count = len(hull)
+    j = 1
+    for i in range(count):
+        edge_start, edge_end = hull[i], hull[(i + 1) % count]
+        while abs(_cross(edge_start, edge_end, hull[(j + 1) % count])) > abs(_cross(edge_start, edge_end, hull[j])):
+            j = (j + 1) % count
+        yield i, j
+        yield (i + 1) % count, j
+
+
+def _pairwise_max_km(lat: np.ndarray, lng: np.ndarray) -> float:
+    best = 0.0
+    for start in range(0, len(lat), PAIRWISE_BLOCK_SIZE):
+        block = slice(start, start + PAIRWISE_BLOCK_SIZE)
+        distances = haversine_km(lat[block, None], lng[block, None], lat[None, :], lng[None, :])
+        best = max(best, float(distances.max()))
+    return best
+
+
+class SiteGeoAnalysisService:
+    """
+    Geographic analysis of a Site queryset.
+
+    Coordinates are fetched once with values_list and projected onto an
+    equirectangular plane around their mean latitude (km). The diameter is
+    taken over convex hull vertices only, so the cost is O(n log n) rather
+    than O(n^2); the covered area is the hull area.
+    """
+
+    def __init__(self, queryset: QuerySet):
+        self.queryset = queryset
+
+    def load_coordinates(self) -> np.ndarray:
+        rows = self.queryset.filter(
+            latitude__isnull=False, longitude__isnull=False
+        ).order_by().values_list('latitude', 'longitude')
+        return np.array(list(rows), dtype=np.float64).reshape(-1, 2)
+
+    def analyze(self, coordinates: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """Coverage radius, center and area, plus the number of sites with coordinates"""
+        if coordinates is None:
+            coordinates = self.load_coordinates()
+
+        count = len(coordinates)
+        result = {
+            'sites_with_coordinates': count,
+            'coverage_radius_km': 0,
+            'geographic_center': None,
+            'total_area_covered': 0,
+        }
+        if count == 0:
+            return result
+
+        center_lat, center_lng = coordinates.mean(axis=0)
+        result['geographic_center'] = {
+            'latitude': round(float(center_lat), 6),
+            'longitude': round(float(center_lng), 6),
+        }
+        if count < 2:
+            return result
+
+        lat, lng = coordinates[:, 0], coordinates[:, 1]
+        scale = np.radians(1.0) * EARTH_RADIUS_KM
+        projected = np.column_stack((lng * scale * np.cos(np.radians(center_lat)), lat * scale))
+        hull = convex_hull(projected)
+
+        # Back to degrees for the great-circle distances between hull vertices
+        hull_lat = hull[:, 1] / scale
+        hull_lng = hull[:, 0] / (scale * np.cos(np.radians(center_lat)))
+        result['coverage_radius_km'] = round(self._diameter_km(hull, hull_lat, hull_lng) / 2, 2)
+
+        if count >= 3 and len(hull) >= 3:
+            x, y = hull[:, 0], hull[:, 1]
+            area = 0.5 * abs(float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))))
+            result['total_area_covered'] = round(area, 2)
+
+        return result
+
+    @staticmethod
+    def _diameter_km(hull: np.ndarray, hull_lat: np.ndarray, hull_lng: np.ndarray) -> float:
+        if len(hull) < 2:
+            return 0.0
+        if len(hull) <= HULL_PAIRWISE_LIMIT:
+            return _pairwise_max_km(hull_lat, hull_lng)
+
+        pairs = np.array(list(_antipodal_pairs(hull)))
+        distances = haversine_km(hull_lat[pairs[:, 0]], hull_lng[pairs[:, 0]], hull_lat[pairs[:, 1]], hull_lng[pairs[:, 1]])
+        return float(distances.max())
+
+
+class SiteSpatialSearch:
+    """
+    Radius and bounding-box search over a Site queryset.
+
+    Candidates are narrowed with geohash prefix lookups (indexed together with
+    the tenant) plus the coordinate range, then refined with exact haversine
+    distances. Bounding boxes crossing the antimeridian are not supported.
+    """
+
+    def __init__(self, queryset: QuerySet):
+        self.queryset = queryset
+
+    def _in_bounds(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float) -> QuerySet:
+        queryset = self.queryset.filter(
+            latitude__gte=min_lat, latitude__lte=max_lat,
+            longitude__gte=min_lng, longitude__lte=max_lng,
+        )
+        prefixes = geohash.cover(min_lat, min_lng, max_lat, max_lng)
+        if prefixes:
+            queryset = queryset.filter(reduce(or_, (Q(geohash__startswith=prefix) for prefix in prefixes)))
+        return queryset.order_by()
+
+    def within_bounds(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float,
+                      limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Sites inside the box (unordered), and whether more than limit matched"""
+        sites = list(self._in_bounds(min_lat, min_lng, max_lat, max_lng).values(*SEARCH_FIELDS)[:limit + 1])
+        for site in sites:
+            site['latitude'], site['longitude'] = float(site['latitude']), float(site['longitude'])
+        return sites[:limit], len(sites) > limit
+
+    def within_radius(self, latitude: float, longitude: float, radius_km: float,
+                      limit: int) -> List[Dict[str, Any]]:
+        """Sites within radius_km of the point, nearest first, with distance_km"""
+        candidates = np.array(
+            list(self._in_bounds(*geohash.radius_bounds(latitude, longitude, radius_km))
+                 .values_list('id', 'latitude', 'longitude')),
+            dtype=np.float64,
+        ).reshape(-1, 3)
+        if not len(candidates):
+            return []
+
+        distances = haversine_km(latitude, longitude, candidates[:, 1], candidates[:, 2])
+        inside = np.flatnonzero(distances <= radius_km)
+        nearest = inside[np.argsort(distances[inside], kind='stable')[:limit]]
+        distance_by_id = {int(candidates[i, 0]): round(float(distances[i]), 3) for i in nearest}
+
+        sites = {site['id']: site for site in self.queryset.filter(id__in=distance_by_id).values(*SEARCH_FIELDS)}
+        results = []
+        for site_pk, distance in distance_by_id.items():
+            site = sites.get(site_pk)
+            if site is None:
+                continue
+            site['latitude'], site['longitude'] = float(site['latitude']), float(site['longitude'])
+            site['distance_km'] = distance
+            results.append(site)
+        return results
+
+    def nearest(self, latitude: float, longitude: float, limit: int,
+                max_radius_km: float = NEAREST_MAX_RADIUS_KM) -> List[Dict[str, Any]]:
+        """The limit nearest sites within max_radius_km, searching outwards from a small radius"""
+        radius = min(NEAREST_START_RADIUS_KM, max_radius_km)
+        while True:
+            results = self.within_radius(latitude, longitude, radius, limit)
+            if len(results) >= limit or radius >= max_radius_km:
+                return results
+            radius = min(radius * 2, max_radius_km)
@@ -0,0 +1,285 @@
+"""
+Site Import Service
+Set-based validation and insertion of site master data uploaded as Excel/CSV,
+shared by BulkSiteUploadView and AsyncBulkSiteUploadView.
+"""
+
+import logging
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+from django.db import transaction
+from django.db.models import Q
+
+from ..models import Site
+from .site_dimension_service import sync_site_summaries_on_commit
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = ['site_id', 'global_id', 'site_name', 'town', 'cluster', 'latitude', 'longitude']
+REQUIRED_TEXT_COLUMNS = ['site_id', 'global_id', 'site_name', 'town', 'cluster']
+
+# Optional columns and the value used when the column or cell is blank
+OPTIONAL_COLUMNS = {
+    'address': '',
+    'site_type': 'tower',
+    'contact_person': '',
+    'contact_phone': '',
+    'state': '',
+    'country': 'India',
+    'postal_code': '',
+    'description': '',
+    'contact_email': '',
+}
+
+# Model field -> source column, including the legacy fields copied from spec fields
+FIELD_SOURCES = {
+    'site_id': 'site_id',
+    'global_id': 'global_id',
+    'site_name': 'site_name',
+    'town': 'town',
+    'cluster': 'cluster',
+    'site_type': 'site_type',
+    'contact_person': 'contact_person',
+    'contact_phone': 'contact_phone',
+    'name': 'site_name',
+    'city': 'town',
+    'site_code': 'site_id',
+    'state': 'state',
+    'country': 'country',
+    'postal_code': 'postal_code',
+    'contact_email': 'contact_email',
+}
+
+MISSING_REQUIRED_ERROR = "Missing required field(s): site_id, global_id, site_name, town, cluster are all required"
+
+
+class SiteImportService:
+    """
+    Validate a whole DataFrame column-wise and create the valid rows with
+    bulk_create.
+
+    Rows are checked in the same order the per-row importer used (required
+    fields, coordinate format and range, existing sites), plus field lengths
+    and duplicates within the file. Existing site_id/global_id/site_code
+    values for the tenant are fetched in a single query per frame. Error rows
+    are numbered like the spreadsheet (DataFrame index + 2 for the header).
+    """
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, tenant, user):
+        self.tenant = tenant
+        self.user = user
+
+    @staticmethod
+    def missing_columns(columns) -> List[str]:
+        """Required columns absent from columns (a header list or DataFrame.columns)"""
+        return [col for col in REQUIRED_COLUMNS if col not in columns]
+
+    def import_frame(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Create a site for every valid row of df.
+
+        Returns success_count, error_count, errors ({row, error}, ordered by
+        row) and created_sites ({row, site_id, global_id, site_name, id}).
+        """
+        frame = self._normalize(df)
+        row_errors = self._validate(frame)
+
+        valid = frame[row_errors.isna()]
+        created_sites, insert_errors = self._insert(valid)
+        if created_sites:
+            # bulk_create sends no post_save signals
+            sync_site_summaries_on_commit(self.tenant.id, zip(valid['cluster'], valid['town']))
+
+        errors = [
+            {"row": int(index) + 2, "error": message}
+            for index, message in row_errors.dropna().items()
+        ]
+        errors.extend(insert_errors)
+        errors.sort(key=lambda error: error['row'])
+
+        return {
+            'success_count': len(created_sites),
+            'error_count': len(errors),
+            'errors': errors,
+            'created_sites': created_sites,
+        }
+
+    # === Validation ===
+
+    def _normalize(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Stripped text columns, numeric coordinates (NaN when unparseable)"""
+        frame = pd.DataFrame(index=df.index)
+        for column in REQUIRED_TEXT_COLUMNS:
+            frame[column] = self._text_column(df[column])
+        for column, default in OPTIONAL_COLUMNS.items():
+            if column in df.columns:
+                values = self._text_column(df[column])
+                frame[column] = values.mask(values == '', default)
+            else:
+                frame[column] = default
+        for column in ('latitude', 'longitude'):
+            frame[column] = self._numeric_column(df[column])
+        return frame
+
+    @staticmethod
+    def _text_column(series: pd.Series) -> pd.Series:
+        # Numeric ids read as float because of blank cells (e.g. 1001.0) keep their integer form
+        if pd.api.types.is_float_dtype(series):
+            present = series.dropna()
+            if (present == present.round()).all():
+                series = series.astype('Int64')
+        values = series.astype(object).where(series.notna(), '')
+        return values.astype(str).str.strip()
+
+    @staticmethod
+    def _numeric_column(series: pd.Series) -> pd.Series:
+        if not pd.api.types.is_numeric_dtype(series):
+            series = series.astype(object).where(series.notna(), '').astype(str).str.strip()
+        return pd.to_numeric(series, errors='coerce').astype(float)
+
+    def _validate(self, frame: pd.DataFrame) -> pd.Series:
+        """Return the first error message for each row (None for valid rows)"""
+        row_errors = pd.Series(None, index=frame.index, dtype=object)
+
+        def flag(mask, message, values=None):
+            # message may contain '{value}', filled from values for the flagged rows only
+            mask = mask & row_errors.isna()
+            if mask.any():
+                row_errors[mask] = values[mask].map(lambda value: message.format(value=value)) if values is not None else message
+
+        missing = pd.Series(False, index=frame.index)
+        for column in REQUIRED_TEXT_COLUMNS:
+            missing |= frame[column] == ''
+        flag(missing, MISSING_REQUIRED_ERROR)
+
+        latitude, longitude = frame['latitude'], frame['longitude']
+        flag(latitude.isna() | longitude.isna(), "Invalid latitude or longitude format")
+        flag(~latitude.between(-90, 90), "Latitude must be between -90 and 90 degrees")
+        flag(~longitude.between(-180, 180), "Longitude must be between -180 and 180 degrees")
+
+        for field_name, column in FIELD_SOURCES.items():
+            max_length = Site._meta.get_field(field_name).max_length
+            flag(
+                frame[column].str.len() > max_length,
+                f"Field '{column}' exceeds maximum length of {max_length} characters"
+            )
+
+        # Conflicts with sites already in the tenant
+        candidates = frame[row_errors.isna()]
+        existing_site_ids, existing_global_ids, existing_site_codes = self._existing_keys(
+            candidates['site_id'].unique().tolist(),
+            candidates['global_id'].unique().tolist()
+        )
+        site_ids, global_ids = frame['site_id'], frame['global_id']
+        flag(site_ids.isin(existing_site_ids), "Site ID '{value}' already exists in this circle", site_ids)
+        flag(global_ids.isin(existing_global_ids), "Global ID '{value}' already exists in this circle", global_ids)
+        flag(site_ids.isin(existing_site_codes), "Site code '{value}' already exists in this circle", site_ids)
+
+        # Duplicates within the file: the first otherwise valid row wins
+        for column, label in (('site_id', 'Site ID'), ('global_id', 'Global ID')):
+            candidates = frame.loc[row_errors.isna(), column]
+            duplicated = candidates.duplicated(keep='first').reindex(frame.index, fill_value=False)
+            if duplicated.any():
+                first_rows = candidates.drop_duplicates(keep='first')
+                first_row_by_value = dict(zip(first_rows.values, (int(index) + 2 for index in first_rows.index)))
+                row_errors[duplicated] = frame.loc[duplicated, column].map(
+                    lambda value: f"{label} '{value}' is duplicated in the file (first on row {first_row_by_value[value]})"
+                )
+
+        return row_errors
+
+    def _existing_keys(self, site_ids: List[str], global_ids: List[str]) -> Tuple[set, set, set]:
+        """site_id, global_id and site_code sets of live tenant sites matching the frame"""
+        if not site_ids and not global_ids:
+            return set(), set(), set()
+
+        rows = Site.objects.filter(
+            tenant=self.tenant,
+            deleted_at__isnull=True
+        ).filter(
+            # site_code <> '' lets the planner use the partial unique indexes for all three arms
+            Q(site_id__in=site_ids) | Q(global_id__in=global_ids) | (Q(site_code__in=site_ids) & ~Q(site_code=''))
+        ).order_by().values_list('site_id', 'global_id', 'site_code')
+
+        existing_site_ids, existing_global_ids, existing_site_codes = set(), set(), set()
+        for site_id, global_id, site_code in rows:
+            existing_site_ids.add(site_id)
+            existing_global_ids.add(global_id)
+            if site_code:
+                existing_site_codes.add(site_code)
+        return existing_site_ids, existing_global_ids, existing_site_codes
+
+    # === Insertion ===
+
+    def _build_site(self, record: Dict[str, Any]) -> Site:
+        site = Site(
+            tenant=self.tenant,
+            created_by=self.user,
+
+            # Required specification fields
+            site_id=record['site_id'],
+            global_id=record['global_id'],
+            site_name=record['site_name'],
+            town=record['town'],
+            cluster=record['cluster'],
+            latitude=round(record['latitude'], 6),
+            longitude=round(record['longitude'], 6),
+
+            # Optional fields from CSV/Excel
+            address=record['address'],
+            site_type=record['site_type'],
+            contact_person=record['contact_person'],
+            contact_phone=record['contact_phone'],
+
+            # Legacy compatibility fields (populated from spec fields)
+            name=record['site_name'],
+            city=record['town'],
+            site_code=record['site_id'],
+            state=record['state'],
+            country=record['country'],
+            postal_code=record['postal_code'],
+            description=record['description'],
+            contact_email=record['contact_email'],
+        )
+        site.refresh_geohash()
+        return site
+
+    def _insert(self, valid: pd.DataFrame) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """bulk_create valid rows in batches; a failing batch is retried row by row"""
+        created_sites = []
+        errors = []
+        rows = [(int(index) + 2, record) for index, record in zip(valid.index, valid.to_dict('records'))]
+
+        with transaction.atomic():
+            for start in range(0, len(rows), self.BATCH_SIZE):
+                batch = rows[start:start + self.BATCH_SIZE]
+                sites = [self._build_site(record) for _, record in batch]
+                try:
+                    with transaction.atomic():
+                        Site.objects.bulk_create(sites)
+                    created = list(zip((row for row, _ in batch), sites))
+                except Exception as e:
+                    # e.g. a concurrent upload created one of the ids after validation
+                    logger.warning(f"Bulk site insert failed, retrying {len(batch)} rows individually: {str(e)}")
+                    created = []
+                    for row, record in batch:
+                        site = self._build_site(record)
+                        try:
+                            with transaction.atomic():
+                                site.save()
+                            created.append((row, site))
+                        except Exception as row_error:
+                            errors.append({"row": row, "error": f"Failed to create site: {str(row_error)}"})
+
+                created_sites.extend({
+                    'row': row,
+                    'site_id': site.site_id,
+                    'global_id': site.global_id,
+                    'site_name': site.site_name,
+                    'id': site.id
+                } for row, site in created)
+
+        return created_sites, errors
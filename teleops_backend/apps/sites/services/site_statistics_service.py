@@ -0,0 +1,153 @@
+"""
+Site Statistics Service
+Per-tenant site counts and distributions for CircleSiteManagementView, kept
+in the shared Django cache and invalidated whenever a tenant's sites change.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+
+from ..models import Site, SiteCluster, SiteTown
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATISTICS_CACHE_SETTINGS = {
+    'TIMEOUT': 3600,  # Seconds a summary lives without any site change
+    'KEY_PREFIX': 'site_stats',
+}
+
+
+def get_statistics_cache_settings() -> Dict[str, Any]:
+    """Merge project overrides from settings.SITE_STATISTICS_CACHE with defaults."""
+    return {**DEFAULT_STATISTICS_CACHE_SETTINGS, **getattr(settings, 'SITE_STATISTICS_CACHE', {})}
+
+
+class SiteStatisticsService:
+    """
+    Cached statistics summary of a tenant's (non-deleted) sites.
+
+    Summaries are stored under the tenant's generation counter. Site
+    save/delete signals and the bulk import bump the counter after commit,
+    once the cluster/town dimensions have been refreshed, so a summary
+    computed concurrently with a write is stored under the old generation
+    and never served afterwards. If the cache is unavailable the
+    summary is computed directly.
+    """
+
+    def __init__(self, shared_cache=None):
+        config = get_statistics_cache_settings()
+        self.shared = shared_cache or cache
+        self.timeout = config['TIMEOUT']
+        self.prefix = config['KEY_PREFIX']
+
+    def _generation_key(self, tenant_id) -> str:
+        return f"{self.prefix}:gen:{tenant_id}"
+
+    def _summary_key(self, tenant_id, generation: int) -> str:
+        return f"{self.prefix}:{tenant_id}:{generation}"
+
+    def _get_generation(self, tenant_id) -> Optional[int]:
+        try:
+            return int(self.shared.get(self._generation_key(tenant_id), 0))
+        except Exception as e:
+            logger.warning(f"Site statistics generation unavailable: {str(e)}")
+            return None
+
+    def get(self, tenant) -> Dict[str, Any]:
+        """Return {'statistics': ..., 'distributions': ...} for the tenant"""
+        generation = self._get_generation(tenant.id)
+        if generation is None:
+            return self.compute(tenant)
+
+        key = self._summary_key(tenant.id, generation)
+        try:
+            summary = self.shared.get(key)
+        except Exception as e:
+            logger.warning(f"Failed to read cached site statistics: {str(e)}")
+            summary = None
+        if summary is not None:
+            return summary
+
+        summary = self.compute(tenant)
+        try:
+            self.shared.set(key, summary, timeout=self.timeout)
+        except Exception as e:
+            logger.warning(f"Failed to cache site statistics: {str(e)}")
+        return summary
+
+    def compute(self, tenant) -> Dict[str, Any]:
+        """Aggregate the summary from the database"""
+        statistics_query = Site.objects.filter(tenant=tenant, deleted_at__isnull=True).order_by()
+
+        stats = statistics_query.aggregate(
+            total_sites=Count('id'),
+            active_sites=Count('id', filter=Q(status='active')),
+            inactive_sites=Count('id', filter=Q(status='inactive')),
+            maintenance_sites=Count('id', filter=Q(status='maintenance')),
+            sites_with_coordinates=Count('id', filter=Q(latitude__isnull=False, longitude__isnull=False)),
+            sites_without_coordinates=Count('id', filter=Q(latitude__isnull=True) | Q(longitude__isnull=True))
+        )
+
+        # Site type distribution using database aggregation
+        site_types = dict(
+            statistics_query.values('site_type')
+            .annotate(count=Count('id'))
+            .values_list('site_type', 'count')
+        )
+
+        # State distribution using database aggregation
+        states = dict(
+            statistics_query.values('state')
+            .annotate(count=Count('id'))
+            .order_by('-count')
+            .values_list('state', 'count')
+        )
+
+        # Town (top 10 only) and cluster distributions from the maintained dimension tables
+        cities = dict(
+            SiteTown.objects.filter(tenant=tenant)
+            .values('name')
+            .annotate(count=Sum('site_count'))
+            .order_by('-count')[:10]
+            .values_list('name', 'count')
+        )
+
+        clusters = dict(
+            SiteCluster.objects.filter(tenant=tenant)
+            .order_by('-site_count')
+            .values_list('name', 'site_count')
+        )
+
+        return {
+            'statistics': stats,
+            'distributions': {
+                'site_types': site_types,
+                'cities': cities,
+                'states': states,
+                'clusters': clusters,
+            },
+        }
+
+    def invalidate(self, tenant_id) -> Optional[int]:
+        """Retire the tenant's cached summary in every worker"""
+        key = self._generation_key(tenant_id)
+        try:
+            try:
+                return self.shared.incr(key)
+            except ValueError:
+                # Counter not initialised yet (or evicted)
+                if self.shared.add(key, 1, timeout=None):
+                    return 1
+                return self.shared.incr(key)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate site statistics for tenant {tenant_id}: {str(e)}")
+            return None
+
+
+def get_site_statistics_service() -> SiteStatisticsService:
+    """Get a statistics service bound to the shared cache."""
+    return SiteStatisticsService()
@@ -0,0 +1,37 @@
+"""
+Site signals keeping the per-tenant cluster/town dimensions and cached site
+statistics current
+"""
+
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Site
+from .services.site_dimension_service import sync_site_summaries_on_commit
+
+
+@receiver(pre_save, sender=Site)
+def remember_site_dimensions(sender, instance, **kwargs):
+    """Record the stored cluster/town so a move decrements the old pair"""
+    instance._stored_dimensions = None
+    if instance.pk:
+        instance._stored_dimensions = (
+            Site.objects.filter(pk=instance.pk).values_list('cluster', 'town').first()
+        )
+
+
+@receiver(post_save, sender=Site)
+def sync_site_summaries_on_save(sender, instance, **kwargs):
+    """
+    Refresh the touched dimension rows and retire the tenant's cached
+    statistics after a site is created, updated, soft-deleted or restored.
+    """
+    pairs = {(instance.cluster, instance.town)}
+    if getattr(instance, '_stored_dimensions', None):
+        pairs.add(instance._stored_dimensions)
+    sync_site_summaries_on_commit(instance.tenant_id, pairs)
+
+
+@receiver(post_delete, sender=Site)
+def sync_site_summaries_on_delete(sender, instance, **kwargs):
+    sync_site_summaries_on_commit(instance.tenant_id, {(instance.cluster, instance.town)})
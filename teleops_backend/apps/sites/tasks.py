@@ -0,0 +1,31 @@
+"""
+Celery tasks for site summaries
+"""
+
+import logging
+
+from celery import shared_task
+
+from .models import Site, SiteTown
+from .services.site_dimension_service import SiteDimensionService
+from .services.site_statistics_service import get_site_statistics_service
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def rebuild_site_dimensions():
+    """Recount the cluster/town dimensions of every tenant, repairing any drift"""
+    # Tenants with dimension rows too, in case all of their sites are gone
+    tenant_ids = set(Site.objects.order_by().values_list('tenant_id', flat=True).distinct())
+    tenant_ids |= set(SiteTown.objects.order_by().values_list('tenant_id', flat=True).distinct())
+    rebuilt = 0
+    for tenant_id in tenant_ids:
+        try:
+            SiteDimensionService(tenant_id).rebuild()
+        except Exception as e:
+            logger.error(f"Failed to rebuild site dimensions for tenant {tenant_id}: {str(e)}")
+            continue
+        get_site_statistics_service().invalidate(tenant_id)
+        rebuilt += 1
+    return rebuilt
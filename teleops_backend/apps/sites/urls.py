@@ -10,7 +10,8 @@ from .views import (
     SiteRestoreView,
     SiteClustersView,
     SiteTownsView,
-    GeographicAnalysisView
+    GeographicAnalysisView,
+    SiteSpatialSearchView
 )
 
 app_name = 'sites'
@@ -33,4 +34,5 @@ urlpatterns = [
     path('clusters/', SiteClustersView.as_view(), name='site_clusters'),
     path('towns/', SiteTownsView.as_view(), name='site_towns'),
     path('geographic-analysis/', GeographicAnalysisView.as_view(), name='site_geographic_analysis'),
+    path('spatial-search/', SiteSpatialSearchView.as_view(), name='site_spatial_search'),
 ] 
\ No newline at end of file
@@ -7,60 +7,56 @@ from rest_framework.views import APIView
 from django.db import transaction
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from django.utils.http import parse_etags, quote_etag
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Sum
+import hashlib
 import logging
 import json
+import math
 
-from .models import Site
+from .models import Site, SiteCluster, SiteTown
 from .serializers import SiteSerializer, SiteCreateSerializer, SiteBulkCreateSerializer
+from .services import (
+    SiteImportService, SiteExportService, SiteGeoAnalysisService, SiteSpatialSearch,
+    get_site_statistics_service, REQUIRED_COLUMNS, NEAREST_MAX_RADIUS_KM,
+)
+from .jobs import SiteBulkUploadRunner
 from core.permissions.tenant_permissions import IsTenantAdmin, IsTenantMember
-from apps.tenants.services.rbac_service import TenantRBACService
+from core.permissions.context import get_permission_context
+from core.jobs import start_bulk_job
+from core.spreadsheet_reader import SpreadsheetReader
+from core.search import TextSearch
+from core.pagination import InvalidCursor, is_keyset_request, keyset_count, paginate_keyset
 
 logger = logging.getLogger(__name__)
 
 
-class CircleSiteManagementView(APIView):
+class SitePermissionMixin:
+    """Site permission check shared by the site views"""
+
+    def _check_permission(self, request, action):
+        """Check if user has specific permission for sites"""
+        try:
+            # Exact site.<action> or compound codes (e.g., site.read_create for create)
+            return get_permission_context(request).has_resource_action('site', action)
+        except Exception as e:
+            logger.error(f"Error checking permission {action} for user {request.user.id}: {str(e)}")
+            return False
+
+
+class CircleSiteManagementView(SitePermissionMixin, APIView):
     """
     Circle Site Management for Circle Tenant Administrators
     Provides comprehensive site management with GPS boundaries and circle-specific features
     """
     permission_classes = [IsAuthenticated, IsTenantMember]
     
-    def _check_permission(self, user, action):
-        """Check if user has specific permission for sites"""
-        try:
-            if not hasattr(user, 'tenant_user_profile'):
-                return False
-                
-            profile = user.tenant_user_profile
-            rbac_service = TenantRBACService(profile.tenant)
-            
-            permissions = rbac_service.get_user_effective_permissions(profile)
-            user_permissions = permissions.get('permissions', {})
-            
-            # Check for specific action permission (exact match)
-            permission_code = f"site.{action}"
-            if permission_code in user_permissions:
-                return True
-            
-            # Check for compound permissions (e.g., site.read_create for create action)
-            for code in user_permissions.keys():
-                if code.startswith('site.'):
-                    # Extract actions from permission code
-                    if '.' in code:
-                        actions_part = code.split('.', 1)[1]  # Get part after 'site.'
-                        if action in actions_part.split('_'):
-                            return True
-            
-            return False
-        except Exception as e:
-            logger.error(f"Error checking permission {action} for user {user.id}: {str(e)}")
-            return False
-    
     def get(self, request):
         """Get paginated sites for the current circle tenant with optimized queries"""
         try:
             # Check read permission
-            if not self._check_permission(request.user, "read"):
+            if not self._check_permission(request, "read"):
                 return Response(
                     {"detail": "You don't have permission to view sites."},
                     status=status.HTTP_403_FORBIDDEN
@@ -89,14 +85,7 @@ class CircleSiteManagementView(APIView):
             
             # Apply filters
             if search:
-                from django.db.models import Q
-                base_query = base_query.filter(
-                    Q(site_name__icontains=search) |
-                    Q(site_id__icontains=search) |
-                    Q(global_id__icontains=search) |
-                    Q(town__icontains=search) |
-                    Q(cluster__icontains=search)
-                )
+                base_query = TextSearch(Site.SEARCH_FIELDS).filter(base_query, search)
             
             if status_filter:
                 base_query = base_query.filter(status=status_filter)
@@ -107,57 +96,51 @@ class CircleSiteManagementView(APIView):
             if cluster_filter:
                 base_query = base_query.filter(cluster=cluster_filter)
             
-            # Get total count for pagination
-            total_count = base_query.count()
+            # Tenant-wide statistics, served from cache until the tenant's sites change
+            summary = get_site_statistics_service().get(tenant)
+            filtered = bool(search or status_filter or site_type_filter or cluster_filter)
             
-            # Calculate pagination
-            offset = (page - 1) * page_size
-            total_pages = (total_count + page_size - 1) // page_size
-            
-            # Get paginated sites
-            sites = base_query.order_by('-created_at')[offset:offset + page_size]
-            
-            # Calculate statistics using database aggregation (much faster than Python loops)
-            from django.db.models import Count, Q
-            statistics_query = Site.objects.filter(tenant=tenant, deleted_at__isnull=True)
-            
-            stats = statistics_query.aggregate(
-                total_sites=Count('id'),
-                active_sites=Count('id', filter=Q(status='active')),
-                inactive_sites=Count('id', filter=Q(status='inactive')),
-                maintenance_sites=Count('id', filter=Q(status='maintenance')),
-                sites_with_coordinates=Count('id', filter=Q(latitude__isnull=False, longitude__isnull=False)),
-                sites_without_coordinates=Count('id', filter=Q(latitude__isnull=True) | Q(longitude__isnull=True))
-            )
-            
-            # Site type distribution using database aggregation
-            site_types = dict(
-                statistics_query.values('site_type')
-                .annotate(count=Count('id'))
-                .values_list('site_type', 'count')
-            )
-            
-            # Geographic distribution using database aggregation (top 10 only)
-            cities = dict(
-                statistics_query.values('town')
-                .annotate(count=Count('id'))
-                .order_by('-count')[:10]
-                .values_list('town', 'count')
-            )
-            
-            states = dict(
-                statistics_query.values('state')
-                .annotate(count=Count('id'))
-                .order_by('-count')
-                .values_list('state', 'count')
-            )
-            
-            clusters = dict(
-                statistics_query.values('cluster')
-                .annotate(count=Count('id'))
-                .order_by('-count')
-                .values_list('cluster', 'count')
-            )
+            if is_keyset_request(request):
+                # Keyset pagination on (created_at, id): constant cost however deep the page
+                try:
+                    keyset_page = paginate_keyset(base_query, page_size, request.GET.get('cursor'))
+                except InvalidCursor:
+                    return Response(
+                        {"error": "Invalid cursor"},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                sites = keyset_page.rows
+                if filtered:
+                    total_count = keyset_count(base_query, request.GET.get('count'))
+                else:
+                    total_count = summary['statistics']['total_sites']
+                pagination = {
+                    'mode': 'cursor',
+                    'page_size': page_size,
+                    'total_count': total_count,
+                    'next_cursor': keyset_page.next_cursor,
+                    'previous_cursor': keyset_page.previous_cursor,
+                    'has_next': keyset_page.has_next,
+                    'has_previous': keyset_page.has_previous,
+                }
+            else:
+                # Get total count for pagination (unfiltered lists reuse the cached total)
+                total_count = base_query.count() if filtered else summary['statistics']['total_sites']
+                
+                # Calculate pagination
+                offset = (page - 1) * page_size
+                total_pages = (total_count + page_size - 1) // page_size
+                
+                # Get paginated sites
+                sites = base_query.order_by('-created_at', '-id')[offset:offset + page_size]
+                pagination = {
+                    'page': page,
+                    'page_size': page_size,
+                    'total_count': total_count,
+                    'total_pages': total_pages,
+                    'has_next': page < total_pages,
+                    'has_previous': page > 1,
+                }
             
             # Serialize sites data efficiently
             sites_data = []
@@ -210,21 +193,9 @@ class CircleSiteManagementView(APIView):
             
             response_data = {
                 'sites': sites_data,
-                'pagination': {
-                    'page': page,
-                    'page_size': page_size,
-                    'total_count': total_count,
-                    'total_pages': total_pages,
-                    'has_next': page < total_pages,
-                    'has_previous': page > 1,
-                },
-                'statistics': stats,
-                'distributions': {
-                    'site_types': site_types,
-                    'cities': cities,  # Already limited to top 10
-                    'states': states,
-                    'clusters': clusters,
-                },
+                'pagination': pagination,
+                'statistics': summary['statistics'],
+                'distributions': summary['distributions'],  # cities limited to top 10
                 # Geographic analysis removed for performance - now handled by separate endpoint
                 'tenant_info': {
                     'id': str(tenant.id),
@@ -248,7 +219,7 @@ class CircleSiteManagementView(APIView):
         """Create a new site in the circle tenant"""
         try:
             # Check create permission
-            if not self._check_permission(request.user, "create"):
+            if not self._check_permission(request, "create"):
                 return Response(
                     {"detail": "You don't have permission to create sites."},
                     status=status.HTTP_403_FORBIDDEN
@@ -377,122 +348,20 @@ class CircleSiteManagementView(APIView):
                 {"error": "Failed to create site"}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-    
-    def _calculate_coverage_radius(self, sites):
-        """Calculate the radius of coverage area in kilometers"""
-        sites_with_coords = sites.exclude(latitude__isnull=True, longitude__isnull=True)
-        if sites_with_coords.count() < 2:
-            return 0
-        
-        import math
-        
-        # Find the maximum distance between any two sites
-        max_distance = 0
-        coords = [(float(site.latitude), float(site.longitude)) for site in sites_with_coords]
-        
-        for i, coord1 in enumerate(coords):
-            for coord2 in coords[i+1:]:
-                distance = self._haversine_distance(coord1[0], coord1[1], coord2[0], coord2[1])
-                max_distance = max(max_distance, distance)
-        
-        return round(max_distance / 2, 2)  # Radius is half the maximum distance
-    
-    def _calculate_geographic_center(self, sites):
-        """Calculate the geographic center of all sites"""
-        sites_with_coords = sites.exclude(latitude__isnull=True, longitude__isnull=True)
-        if not sites_with_coords.exists():
-            return None
-        
-        total_lat = sum(float(site.latitude) for site in sites_with_coords)
-        total_lng = sum(float(site.longitude) for site in sites_with_coords)
-        count = sites_with_coords.count()
-        
-        return {
-            'latitude': round(total_lat / count, 6),
-            'longitude': round(total_lng / count, 6)
-        }
-    
-    def _calculate_coverage_area(self, sites):
-        """Calculate approximate coverage area in square kilometers"""
-        sites_with_coords = sites.exclude(latitude__isnull=True, longitude__isnull=True)
-        if sites_with_coords.count() < 3:
-            return 0
-        
-        # Simple bounding box calculation
-        latitudes = [float(site.latitude) for site in sites_with_coords]
-        longitudes = [float(site.longitude) for site in sites_with_coords]
-        
-        lat_range = max(latitudes) - min(latitudes)
-        lng_range = max(longitudes) - min(longitudes)
-        
-        # Approximate area calculation (rough estimate)
-        lat_km = lat_range * 111  # 1 degree latitude ≈ 111 km
-        lng_km = lng_range * 111 * abs(sum(latitudes) / len(latitudes) / 180)  # Adjust for latitude
-        
-        return round(lat_km * lng_km, 2)
-    
-    def _haversine_distance(self, lat1, lon1, lat2, lon2):
-        """Calculate the great circle distance between two points on earth (in kilometers)"""
-        import math
-        
-        # Convert decimal degrees to radians
-        lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-        
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        r = 6371  # Radius of earth in kilometers
-        
-        return c * r
-    
 
 
-
-class CircleSiteDetailView(APIView):
+class CircleSiteDetailView(SitePermissionMixin, APIView):
     """
     Individual Circle Site Management
     Update, delete, or get detailed information about a specific site
     """
     permission_classes = [IsAuthenticated, IsTenantMember]
     
-    def _check_permission(self, user, action):
-        """Check if user has specific permission for sites"""
-        try:
-            if not hasattr(user, 'tenant_user_profile'):
-                return False
-                
-            profile = user.tenant_user_profile
-            rbac_service = TenantRBACService(profile.tenant)
-            
-            permissions = rbac_service.get_user_effective_permissions(profile)
-            user_permissions = permissions.get('permissions', {})
-            
-            # Check for specific action permission (exact match)
-            permission_code = f"site.{action}"
-            if permission_code in user_permissions:
-                return True
-            
-            # Check for compound permissions (e.g., site.read_create for create action)
-            for code in user_permissions.keys():
-                if code.startswith('site.'):
-                    # Extract actions from permission code
-                    if '.' in code:
-                        actions_part = code.split('.', 1)[1]  # Get part after 'site.'
-                        if action in actions_part.split('_'):
-                            return True
-            
-            return False
-        except Exception as e:
-            logger.error(f"Error checking permission {action} for user {user.id}: {str(e)}")
-            return False
-    
     def get(self, request, site_id):
         """Get detailed information about a specific site"""
         try:
             # Check read permission
-            if not self._check_permission(request.user, "read"):
+            if not self._check_permission(request, "read"):
                 return Response(
                     {"detail": "You don't have permission to view site details."},
                     status=status.HTTP_403_FORBIDDEN
@@ -576,7 +445,7 @@ class CircleSiteDetailView(APIView):
         """Update site information"""
         try:
             # Check update permission
-            if not self._check_permission(request.user, "update"):
+            if not self._check_permission(request, "update"):
                 return Response(
                     {"detail": "You don't have permission to update sites."},
                     status=status.HTTP_403_FORBIDDEN
@@ -637,7 +506,7 @@ class CircleSiteDetailView(APIView):
         """Soft delete site"""
         try:
             # Check delete permission
-            if not self._check_permission(request.user, "delete"):
+            if not self._check_permission(request, "delete"):
                 return Response(
                     {"detail": "You don't have permission to delete sites."},
                     status=status.HTTP_403_FORBIDDEN
@@ -714,48 +583,17 @@ class CircleSiteDetailView(APIView):
         return []
 
 
-class SiteTemplateDownloadView(APIView):
+class SiteTemplateDownloadView(SitePermissionMixin, APIView):
     """
     Download Excel template for bulk site upload
     """
     permission_classes = [IsAuthenticated, IsTenantMember]
     
-    def _check_permission(self, user, action):
-        """Check if user has specific permission for sites"""
-        try:
-            if not hasattr(user, 'tenant_user_profile'):
-                return False
-                
-            profile = user.tenant_user_profile
-            rbac_service = TenantRBACService(profile.tenant)
-            
-            permissions = rbac_service.get_user_effective_permissions(profile)
-            user_permissions = permissions.get('permissions', {})
-            
-            # Check for specific action permission (exact match)
-            permission_code = f"site.{action}"
-            if permission_code in user_permissions:
-                return True
-            
-            # Check for compound permissions (e.g., site.read_create for create action)
-            for code in user_permissions.keys():
-                if code.startswith('site.'):
-                    # Extract actions from permission code
-                    if '.' in code:
-                        actions_part = code.split('.', 1)[1]  # Get part after 'site.'
-                        if action in actions_part.split('_'):
-                            return True
-            
-            return False
-        except Exception as e:
-            logger.error(f"Error checking permission {action} for user {user.id}: {str(e)}")
-            return False
-    
     def get(self, request):
         """Download Excel template with sample data"""
         try:
             # Check read permission for template download
-            if not self._check_permission(request.user, "read"):
+            if not self._check_permission(request, "read"):
                 return Response(
                     {"detail": "You don't have permission to download site templates."},
                     status=status.HTTP_403_FORBIDDEN
@@ -830,56 +668,23 @@ class SiteTemplateDownloadView(APIView):
             )
 
 
-class SiteExportView(APIView):
+class SiteExportView(SitePermissionMixin, APIView):
     """
     Export filtered sites to Excel/CSV
     """
     permission_classes = [IsAuthenticated, IsTenantMember]
     
-    def _check_permission(self, user, action):
-        """Check if user has specific permission for sites"""
-        try:
-            if not hasattr(user, 'tenant_user_profile'):
-                return False
-                
-            profile = user.tenant_user_profile
-            rbac_service = TenantRBACService(profile.tenant)
-            
-            permissions = rbac_service.get_user_effective_permissions(profile)
-            user_permissions = permissions.get('permissions', {})
-            
-            # Check for specific action permission (exact match)
-            permission_code = f"site.{action}"
-            if permission_code in user_permissions:
-                return True
-            
-            # Check for compound permissions (e.g., site.read_create for create action)
-            for code in user_permissions.keys():
-                if code.startswith('site.'):
-                    # Extract actions from permission code
-                    if '.' in code:
-                        actions_part = code.split('.', 1)[1]  # Get part after 'site.'
-                        if action in actions_part.split('_'):
-                            return True
-            
-            return False
-        except Exception as e:
-            logger.error(f"Error checking permission {action} for user {user.id}: {str(e)}")
-            return False
-    
     def get(self, request):
         """Export sites with optional filtering"""
         try:
             # Check read permission for export
-            if not self._check_permission(request.user, "read"):
+            if not self._check_permission(request, "read"):
                 return Response(
                     {"detail": "You don't have permission to export sites."},
                     status=status.HTTP_403_FORBIDDEN
                 )
                 
-            import pandas as pd
-            from django.http import HttpResponse
-            import io
+            from django.http import FileResponse, StreamingHttpResponse
             
             tenant = getattr(request, 'tenant', None)
             if not tenant:
@@ -905,53 +710,18 @@ class SiteExportView(APIView):
             if cluster_filter != 'all':
                 sites = sites.filter(cluster=cluster_filter)
             
-            # Convert to list of dictionaries
-            sites_data = []
-            for site in sites:
-                sites_data.append({
-                    'Site ID': site.site_id,
-                    'Global ID': site.global_id,
-                    'Site Name': site.site_name,
-                    'Town': site.town,
-                    'Cluster': site.cluster,
-                    'State': site.state,
-                    'Country': site.country,
-                    'District': site.district,
-                    'Postal Code': site.postal_code,
-                    'Latitude': float(site.latitude) if site.latitude else None,
-                    'Longitude': float(site.longitude) if site.longitude else None,
-
-                    'Site Type': site.site_type,
-                    'Status': site.status,
-
-                    'Contact Person': site.contact_person,
-                    'Contact Phone': site.contact_phone,
-
-                    'Created At': site.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                    'Created By': site.created_by.full_name if site.created_by else None,
-                })
-            
-            # Create DataFrame
-            df = pd.DataFrame(sites_data)
+            # Streamed from a server-side cursor; the CSV starts sending immediately
+            exporter = SiteExportService(sites)
             
             if export_format == 'csv':
                 # CSV Export
-                output = io.StringIO()
-                df.to_csv(output, index=False)
-                output.seek(0)
-                
-                response = HttpResponse(output.getvalue(), content_type='text/csv')
+                response = StreamingHttpResponse(exporter.iter_csv(), content_type='text/csv')
                 response['Content-Disposition'] = f'attachment; filename="sites_export_{tenant.circle_code}.csv"'
                 
             else:
-                # Excel Export
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    df.to_excel(writer, sheet_name='Sites Export', index=False)
-                
-                output.seek(0)
-                response = HttpResponse(
-                    output.getvalue(),
+                # Excel Export (write-only workbook in a spooled temp file)
+                response = FileResponse(
+                    exporter.write_xlsx(),
                     content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
                 )
                 response['Content-Disposition'] = f'attachment; filename="sites_export_{tenant.circle_code}.xlsx"'
@@ -1029,6 +799,22 @@ class SiteRestoreView(APIView):
             )
 
 
+def _conditional_response(request, payload):
+    """
+    200 with an ETag over the payload, or 304 when the browser's
+    If-None-Match already holds it; browsers revalidate on every use
+    """
+    digest = hashlib.md5(json.dumps(payload, sort_keys=True, cls=DjangoJSONEncoder).encode()).hexdigest()
+    etag = quote_etag(digest)
+    if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(payload, status=status.HTTP_200_OK)
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
 class SiteClustersView(APIView):
     """
     Get list of clusters for the tenant
@@ -1036,7 +822,7 @@ class SiteClustersView(APIView):
     permission_classes = [IsAuthenticated, IsTenantMember]
     
     def get(self, request):
-        """Get unique clusters for the tenant with optimized query"""
+        """Get unique clusters for the tenant from the cluster dimension table"""
         try:
             tenant = getattr(request, 'tenant', None)
             if not tenant:
@@ -1045,23 +831,17 @@ class SiteClustersView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Use database aggregation for efficiency with large datasets
-            from django.db.models import Count
-            cluster_data = list(
-                Site.objects.filter(
-                tenant=tenant,
-                    deleted_at__isnull=True,
-                    cluster__isnull=False  # Exclude empty clusters
-                )
-                .values('cluster')
-                .annotate(site_count=Count('id'))
-                .order_by('cluster')
-            )
+            # Maintained per-tenant cluster rows with site counts
+            cluster_data = [
+                {'cluster': name, 'site_count': site_count}
+                for name, site_count in SiteCluster.objects.filter(tenant=tenant)
+                .order_by('name').values_list('name', 'site_count')
+            ]
             
-            return Response({
+            return _conditional_response(request, {
                 'clusters': cluster_data,
                 'total_clusters': len(cluster_data)
-            }, status=status.HTTP_200_OK)
+            })
             
         except Exception as e:
             logger.error(f"Error fetching clusters: {str(e)}")
@@ -1078,7 +858,7 @@ class SiteTownsView(APIView):
     permission_classes = [IsAuthenticated, IsTenantMember]
     
     def get(self, request):
-        """Get unique towns for the tenant, optionally filtered by cluster with optimized query and pagination"""
+        """Get unique towns for the tenant from the town dimension table, optionally filtered by cluster, with pagination"""
         try:
             tenant = getattr(request, 'tenant', None)
             if not tenant:
@@ -1091,24 +871,21 @@ class SiteTownsView(APIView):
             page = int(request.GET.get('page', 1))
             page_size = min(int(request.GET.get('page_size', 100)), 500)  # Max 500 towns per page
             
-            # Use database aggregation for efficiency with large datasets
-            from django.db.models import Count
-            query = Site.objects.filter(
-                tenant=tenant, 
-                deleted_at__isnull=True,
-                town__isnull=False  # Exclude empty towns
-            )
+            query = SiteTown.objects.filter(tenant=tenant)
             
-            # Apply cluster filter if provided
+            # Apply cluster filter if provided; otherwise sum each town over its clusters
             if cluster_filter and cluster_filter != 'all':
-                query = query.filter(cluster=cluster_filter)
-            
-            # Get town data with counts in a single optimized query
-            town_query = (
-                query.values('town')
-                .annotate(site_count=Count('id'))
-                .order_by('town')
-            )
+                town_query = (
+                    query.filter(cluster=cluster_filter)
+                    .order_by('name')
+                    .values_list('name', 'site_count')
+                )
+            else:
+                town_query = (
+                    query.values_list('name')
+                    .annotate(total=Sum('site_count'))
+                    .order_by('name')
+                )
             
             # Get total count for pagination
             total_count = town_query.count()
@@ -1117,14 +894,17 @@ class SiteTownsView(APIView):
             offset = (page - 1) * page_size
             total_pages = (total_count + page_size - 1) // page_size
             
-            town_data = list(town_query[offset:offset + page_size])
+            town_data = [
+                {'town': name, 'site_count': site_count}
+                for name, site_count in town_query[offset:offset + page_size]
+            ]
             
             # Add cluster info to each town if cluster filter is applied
             if cluster_filter and cluster_filter != 'all':
                 for town in town_data:
                     town['cluster'] = cluster_filter
             
-            return Response({
+            return _conditional_response(request, {
                 'towns': town_data,
                 'pagination': {
                     'page': page,
@@ -1136,7 +916,7 @@ class SiteTownsView(APIView):
                 },
                 'total_towns': total_count,
                 'cluster_filter': cluster_filter
-            }, status=status.HTTP_200_OK)
+            })
             
         except Exception as e:
             logger.error(f"Error fetching towns: {str(e)}")
@@ -1146,49 +926,18 @@ class SiteTownsView(APIView):
             )
 
 
-class BulkSiteUploadView(APIView):
+class BulkSiteUploadView(SitePermissionMixin, APIView):
     """
     Bulk Site Upload for Circle Tenants
     Support for Excel/CSV upload with validation and error reporting
     """
     permission_classes = [IsAuthenticated, IsTenantMember]
     
-    def _check_permission(self, user, action):
-        """Check if user has specific permission for sites"""
-        try:
-            if not hasattr(user, 'tenant_user_profile'):
-                return False
-                
-            profile = user.tenant_user_profile
-            rbac_service = TenantRBACService(profile.tenant)
-            
-            permissions = rbac_service.get_user_effective_permissions(profile)
-            user_permissions = permissions.get('permissions', {})
-            
-            # Check for specific action permission (exact match)
-            permission_code = f"site.{action}"
-            if permission_code in user_permissions:
-                return True
-            
-            # Check for compound permissions (e.g., site.read_create for create action)
-            for code in user_permissions.keys():
-                if code.startswith('site.'):
-                    # Extract actions from permission code
-                    if '.' in code:
-                        actions_part = code.split('.', 1)[1]  # Get part after 'site.'
-                        if action in actions_part.split('_'):
-                            return True
-            
-            return False
-        except Exception as e:
-            logger.error(f"Error checking permission {action} for user {user.id}: {str(e)}")
-            return False
-    
     def post(self, request):
         """Upload multiple sites via Excel/CSV file"""
         try:
             # Check create permission for bulk upload
-            if not self._check_permission(request.user, "create"):
+            if not self._check_permission(request, "create"):
                 return Response(
                     {"detail": "You don't have permission to bulk upload sites."},
                     status=status.HTTP_403_FORBIDDEN
@@ -1231,159 +980,45 @@ class BulkSiteUploadView(APIView):
     
     def _process_excel_file(self, file, tenant, user):
         """Process Excel file for bulk site upload"""
-        import pandas as pd
-        
         try:
-            # Read Excel file
-            df = pd.read_excel(file)
-            return self._process_dataframe(df, tenant, user)
+            return self._process_upload(SpreadsheetReader(file, chunk_size=SiteImportService.BATCH_SIZE), tenant, user)
         except Exception as e:
             return {"error": f"Failed to read Excel file: {str(e)}"}
     
     def _process_csv_file(self, file, tenant, user):
         """Process CSV file for bulk site upload"""
-        import pandas as pd
-        
         try:
-            # Read CSV file
-            df = pd.read_csv(file)
-            return self._process_dataframe(df, tenant, user)
+            return self._process_upload(SpreadsheetReader(file, chunk_size=SiteImportService.BATCH_SIZE), tenant, user)
         except Exception as e:
             return {"error": f"Failed to read CSV file: {str(e)}"}
     
-    def _process_dataframe(self, df, tenant, user):
-        """Process pandas DataFrame for bulk site creation"""
-        required_columns = ['site_id', 'global_id', 'site_name', 'town', 'cluster', 'latitude', 'longitude']
-        
+    def _process_upload(self, reader, tenant, user):
+        """Stream the upload through SiteImportService one chunk at a time"""
         # Check for required columns
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = SiteImportService.missing_columns(reader.headers)
         if missing_columns:
             return {
                 "error": f"Missing required columns: {', '.join(missing_columns)}",
-                "required_columns": required_columns,
-                "found_columns": list(df.columns)
+                "required_columns": REQUIRED_COLUMNS,
+                "found_columns": reader.headers
             }
         
-        success_count = 0
-        error_count = 0
-        errors = []
+        service = SiteImportService(tenant, user)
+        total_rows = 0
         created_sites = []
-        
-        with transaction.atomic():
-            for index, row in df.iterrows():
-                try:
-                    # Validate required fields
-                    site_id = str(row['site_id']).strip()
-                    global_id = str(row['global_id']).strip()
-                    site_name = str(row['site_name']).strip()
-                    town = str(row['town']).strip()
-                    cluster = str(row['cluster']).strip()
-                    
-                    if not all([site_id, global_id, site_name, town, cluster]):
-                        errors.append({
-                            "row": index + 2,  # +2 for 1-indexed and header row
-                            "error": "Missing required field(s): site_id, global_id, site_name, town, cluster are all required"
-                        })
-                        error_count += 1
-                        continue
-                    
-                    # Validate coordinates
-                    try:
-                        latitude = float(row['latitude'])
-                        longitude = float(row['longitude'])
-                        
-                        if not (-90 <= latitude <= 90):
-                            errors.append({
-                                "row": index + 2,
-                                "error": "Latitude must be between -90 and 90 degrees"
-                            })
-                            error_count += 1
-                            continue
-                        
-                        if not (-180 <= longitude <= 180):
-                            errors.append({
-                                "row": index + 2,
-                                "error": "Longitude must be between -180 and 180 degrees"
-                            })
-                            error_count += 1
-                            continue
-                            
-                    except (ValueError, TypeError):
-                        errors.append({
-                            "row": index + 2,
-                            "error": "Invalid latitude or longitude format"
-                        })
-                        error_count += 1
-                        continue
-                    
-                    # Check for duplicates within tenant
-                    if Site.objects.filter(tenant=tenant, site_id=site_id, deleted_at__isnull=True).exists():
-                        errors.append({
-                            "row": index + 2,
-                            "error": f"Site ID '{site_id}' already exists in this circle"
-                        })
-                        error_count += 1
-                        continue
-                    
-                    if Site.objects.filter(tenant=tenant, global_id=global_id, deleted_at__isnull=True).exists():
-                        errors.append({
-                            "row": index + 2,
-                            "error": f"Global ID '{global_id}' already exists in this circle"
-                        })
-                        error_count += 1
-                        continue
-                    
-                    # Create the site
-                    site = Site.objects.create(
-                        tenant=tenant,
-                        created_by=user,
-                        
-                        # Required specification fields
-                        site_id=site_id,
-                        global_id=global_id,
-                        site_name=site_name,
-                        town=town,
-                        cluster=cluster,
-                        latitude=latitude,
-                        longitude=longitude,
-                        
-                        # Optional fields from CSV/Excel
-                        address=str(row.get('address', '')).strip(),
-                        site_type=str(row.get('site_type', 'tower')).strip(),
-                        contact_person=str(row.get('contact_person', '')).strip(),
-                        contact_phone=str(row.get('contact_phone', '')).strip(),
-                        
-                        # Legacy compatibility fields (populated from spec fields)
-                        name=site_name,  # Copy from site_name
-                        city=town,  # Copy from town
-                        site_code=site_id,  # Copy from site_id
-                        state=str(row.get('state', '')).strip(),
-                        country=str(row.get('country', 'India')).strip(),
-                        postal_code=str(row.get('postal_code', '')).strip(),
-                        description=str(row.get('description', '')).strip(),
-                        contact_email=str(row.get('contact_email', '')).strip(),
-                    )
-                    
-                    created_sites.append({
-                        'row': index + 2,
-                        'site_id': site.site_id,
-                        'global_id': site.global_id,
-                        'site_name': site.site_name,
-                        'id': site.id
-                    })
-                    success_count += 1
-                    
-                except Exception as e:
-                    errors.append({
-                        "row": index + 2,
-                        "error": f"Failed to create site: {str(e)}"
-                    })
-                    error_count += 1
+        errors = []
+        for chunk_df in reader.iter_chunks():
+            result = service.import_frame(chunk_df)
+            total_rows += len(chunk_df)
+            created_sites.extend(result['created_sites'])
+            errors.extend(result['errors'])
+        success_count = len(created_sites)
+        error_count = len(errors)
         
         return {
             "message": f"Bulk upload completed. {success_count} sites created, {error_count} errors.",
             "summary": {
-                "total_rows": len(df),
+                "total_rows": total_rows,
                 "success_count": success_count,
                 "error_count": error_count
             },
@@ -1393,51 +1028,20 @@ class BulkSiteUploadView(APIView):
         }
 
 
-class AsyncBulkSiteUploadView(APIView):
+class AsyncBulkSiteUploadView(SitePermissionMixin, APIView):
     """
     Asynchronous Bulk Site Upload for Large Files
     Handles uploads with more than 1000 rows using background processing
     """
     permission_classes = [IsAuthenticated, IsTenantMember]
     
-    def _check_permission(self, user, action):
-        """Check if user has specific permission for sites"""
-        try:
-            if not hasattr(user, 'tenant_user_profile'):
-                return False
-                
-            profile = user.tenant_user_profile
-            rbac_service = TenantRBACService(profile.tenant)
-            
-            permissions = rbac_service.get_user_effective_permissions(profile)
-            user_permissions = permissions.get('permissions', {})
-            
-            # Check for specific action permission (exact match)
-            permission_code = f"site.{action}"
-            if permission_code in user_permissions:
-                return True
-            
-            # Check for compound permissions (e.g., site.read_create for create action)
-            for code in user_permissions.keys():
-                if code.startswith('site.'):
-                    # Extract actions from permission code
-                    if '.' in code:
-                        actions_part = code.split('.', 1)[1]  # Get part after 'site.'
-                        if action in actions_part.split('_'):
-                            return True
-            
-            return False
-        except Exception as e:
-            logger.error(f"Error checking permission {action} for user {user.id}: {str(e)}")
-            return False
-    
     def post(self, request):
         """Start asynchronous bulk upload for large files"""
         try:
             logger.info(f"Async bulk upload request received from user {request.user.id}")
             
             # Check create permission for bulk upload
-            if not self._check_permission(request.user, "create"):
+            if not self._check_permission(request, "create"):
                 return Response(
                     {"detail": "You don't have permission to bulk upload sites."},
                     status=status.HTTP_403_FORBIDDEN
@@ -1459,20 +1063,16 @@ class AsyncBulkSiteUploadView(APIView):
             uploaded_file = request.FILES['file']
             logger.info(f"Processing file: {uploaded_file.name}, size: {uploaded_file.size} bytes")
             
-            # Check file size and row count
+            # Check file size and row count without loading the sheet
             try:
-                import pandas as pd
-                if uploaded_file.name.endswith('.xlsx') or uploaded_file.name.endswith('.xls'):
-                    df = pd.read_excel(uploaded_file)
-                elif uploaded_file.name.endswith('.csv'):
-                    df = pd.read_csv(uploaded_file)
-                else:
+                if not uploaded_file.name.endswith(('.xlsx', '.xls', '.csv')):
                     return Response(
                         {"error": "Unsupported file format. Please upload Excel (.xlsx, .xls) or CSV (.csv) files."}, 
                         status=status.HTTP_400_BAD_REQUEST
                     )
                 
-                total_rows = len(df)
+                reader = SpreadsheetReader(uploaded_file, chunk_size=SiteImportService.BATCH_SIZE)
+                total_rows = reader.count_rows(exact=True)
                 
                 # For small files (< 1000 rows), use synchronous processing
                 if total_rows < 1000:
@@ -1481,6 +1081,14 @@ class AsyncBulkSiteUploadView(APIView):
                         status=status.HTTP_400_BAD_REQUEST
                     )
                 
+                missing_columns = SiteImportService.missing_columns(reader.headers)
+                if missing_columns:
+                    return Response({
+                        "error": f"Missing required columns: {', '.join(missing_columns)}",
+                        "required_columns": REQUIRED_COLUMNS,
+                        "found_columns": reader.headers
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                
                 # Create bulk upload job
                 from .models import BulkUploadJob
                 job = BulkUploadJob.objects.create(
@@ -1491,21 +1099,15 @@ class AsyncBulkSiteUploadView(APIView):
                     status='pending'
                 )
                 
-                # Start background processing in a separate thread
-                import threading
-                thread = threading.Thread(
-                    target=self._process_large_upload_async,
-                    args=(job, df, tenant, request.user)
-                )
-                thread.daemon = True
-                thread.start()
+                # Queue durable background processing of the stored upload
+                start_bulk_job(SiteBulkUploadRunner, job, uploaded_file)
                 
                 return Response({
                     "message": f"Large file upload started. Processing {total_rows} sites in background.",
                     "job_id": job.id,
                     "status": "processing",
                     "total_rows": total_rows,
-                    "estimated_time": f"~{total_rows // 100} minutes"
+                    "estimated_time": f"~{max(1, total_rows // 20000)} minutes"
                 }, status=status.HTTP_202_ACCEPTED)
                 
             except Exception as e:
@@ -1521,169 +1123,6 @@ class AsyncBulkSiteUploadView(APIView):
                 {"error": "Failed to start upload process"}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-    
-    def _process_large_upload_async(self, job, df, tenant, user):
-        """Process large upload asynchronously in chunks"""
-        try:
-            logger.info(f"Starting async processing for job {job.id}, {len(df)} rows")
-            job.status = 'processing'
-            job.started_at = timezone.now()
-            job.detailed_errors = []  # Initialize errors list
-            job.save()
-            
-            # Process in chunks of 100 rows
-            chunk_size = 100
-            total_chunks = (len(df) + chunk_size - 1) // chunk_size
-            logger.info(f"Processing {len(df)} rows in {total_chunks} chunks of {chunk_size}")
-            
-            all_errors = []
-            
-            for chunk_idx in range(total_chunks):
-                start_idx = chunk_idx * chunk_size
-                end_idx = min(start_idx + chunk_size, len(df))
-                chunk_df = df.iloc[start_idx:end_idx]
-                
-                # Process chunk
-                chunk_result = self._process_chunk(chunk_df, tenant, user, start_idx)
-                
-                # Collect errors from this chunk
-                if chunk_result.get('errors'):
-                    all_errors.extend(chunk_result['errors'])
-                
-                # Update job progress
-                job.processed_rows = end_idx
-                job.success_count += chunk_result['success_count']
-                job.error_count += chunk_result['error_count']
-                job.detailed_errors = all_errors  # Store all errors collected so far
-                job.save()
-                
-                # Small delay to prevent overwhelming the database
-                import time
-                time.sleep(0.1)
-            
-            # Mark job as completed
-            job.status = 'completed'
-            job.completed_at = timezone.now()
-            job.save()
-            
-            logger.info(f"Bulk upload job {job.id} completed successfully. {job.success_count} sites created, {job.error_count} errors.")
-            
-        except Exception as e:
-            logger.error(f"Error in async bulk upload job {job.id}: {str(e)}")
-            job.status = 'failed'
-            job.error_message = str(e)
-            job.completed_at = timezone.now()
-            job.save()
-    
-    def _process_chunk(self, chunk_df, tenant, user, start_idx):
-        """Process a chunk of rows"""
-        success_count = 0
-        error_count = 0
-        errors = []
-        
-        for index, row in chunk_df.iterrows():
-            try:
-                # Validate required fields
-                site_id = str(row['site_id']).strip()
-                global_id = str(row['global_id']).strip()
-                site_name = str(row['site_name']).strip()
-                town = str(row['town']).strip()
-                cluster = str(row['cluster']).strip()
-                
-                if not all([site_id, global_id, site_name, town, cluster]):
-                    errors.append({
-                        "row": index + 2,  # +2 for 1-indexed and header row
-                        "error": "Missing required field(s): site_id, global_id, site_name, town, cluster are all required"
-                    })
-                    error_count += 1
-                    continue
-                
-                # Validate coordinates
-                try:
-                    latitude = float(row['latitude'])
-                    longitude = float(row['longitude'])
-                    
-                    if not (-90 <= latitude <= 90):
-                        errors.append({
-                            "row": index + 2,
-                            "error": "Latitude must be between -90 and 90 degrees"
-                        })
-                        error_count += 1
-                        continue
-                    
-                    if not (-180 <= longitude <= 180):
-                        errors.append({
-                            "row": index + 2,
-                            "error": "Longitude must be between -180 and 180 degrees"
-                        })
-                        error_count += 1
-                        continue
-                        
-                except (ValueError, TypeError):
-                    errors.append({
-                        "row": index + 2,
-                        "error": "Invalid latitude or longitude format"
-                    })
-                    error_count += 1
-                    continue
-                
-                # Check for duplicates
-                if Site.objects.filter(tenant=tenant, site_id=site_id, deleted_at__isnull=True).exists():
-                    errors.append({
-                        "row": index + 2,
-                        "error": f"Site ID '{site_id}' already exists in this circle"
-                    })
-                    error_count += 1
-                    continue
-                
-                if Site.objects.filter(tenant=tenant, global_id=global_id, deleted_at__isnull=True).exists():
-                    errors.append({
-                        "row": index + 2,
-                        "error": f"Global ID '{global_id}' already exists in this circle"
-                    })
-                    error_count += 1
-                    continue
-                
-                # Create the site
-                Site.objects.create(
-                    tenant=tenant,
-                    created_by=user,
-                    site_id=site_id,
-                    global_id=global_id,
-                    site_name=site_name,
-                    town=town,
-                    cluster=cluster,
-                    latitude=latitude,
-                    longitude=longitude,
-                    address=str(row.get('address', '')).strip(),
-                    site_type=str(row.get('site_type', 'tower')).strip(),
-                    contact_person=str(row.get('contact_person', '')).strip(),
-                    contact_phone=str(row.get('contact_phone', '')).strip(),
-                    name=site_name,
-                    city=town,
-                    site_code=site_id,
-                    state=str(row.get('state', '')).strip(),
-                    country=str(row.get('country', 'India')).strip(),
-                    postal_code=str(row.get('postal_code', '')).strip(),
-                    description=str(row.get('description', '')).strip(),
-                    contact_email=str(row.get('contact_email', '')).strip(),
-                )
-                
-                success_count += 1
-                
-            except Exception as e:
-                errors.append({
-                    "row": index + 2,
-                    "error": f"Failed to create site: {str(e)}"
-                })
-                error_count += 1
-                logger.error(f"Error creating site in chunk: {str(e)}")
-        
-        return {
-            'success_count': success_count,
-            'error_count': error_count,
-            'errors': errors
-        }
 
 
 class BulkUploadJobStatusView(APIView):
@@ -1721,7 +1160,7 @@ class BulkUploadJobStatusView(APIView):
                         'completed_at': job.completed_at,
                         'duration': str(job.duration) if job.duration else None,
                         'error_message': job.error_message,
-                        'errors': job.detailed_errors or []  # Include detailed errors
+                        'errors': list(job.row_errors.values('row', 'error')) or job.detailed_errors or []
                     })
                 except BulkUploadJob.DoesNotExist:
                     return Response(
@@ -1752,49 +1191,18 @@ class BulkUploadJobStatusView(APIView):
             )
 
 
-class GeographicAnalysisView(APIView):
+class GeographicAnalysisView(SitePermissionMixin, APIView):
     """
     Geographic Analysis for Sites
     Provides geographic calculations and analysis on-demand
     """
     permission_classes = [IsAuthenticated, IsTenantMember]
     
-    def _check_permission(self, user, action):
-        """Check if user has specific permission for sites"""
-        try:
-            if not hasattr(user, 'tenant_user_profile'):
-                return False
-                
-            profile = user.tenant_user_profile
-            rbac_service = TenantRBACService(profile.tenant)
-            
-            permissions = rbac_service.get_user_effective_permissions(profile)
-            user_permissions = permissions.get('permissions', {})
-            
-            # Check for specific action permission (exact match)
-            permission_code = f"site.{action}"
-            if permission_code in user_permissions:
-                return True
-            
-            # Check for compound permissions (e.g., site.read_create for create action)
-            for code in user_permissions.keys():
-                if code.startswith('site.'):
-                    # Extract actions from permission code
-                    if '.' in code:
-                        actions_part = code.split('.', 1)[1]  # Get part after 'site.'
-                        if action in actions_part.split('_'):
-                            return True
-            
-            return False
-        except Exception as e:
-            logger.error(f"Error checking permission {action} for user {user.id}: {str(e)}")
-            return False
-    
     def get(self, request):
         """Get geographic analysis for the current tenant's sites"""
         try:
             # Check read permission
-            if not self._check_permission(request.user, "read"):
+            if not self._check_permission(request, "read"):
                 return Response(
                     {"detail": "You don't have permission to view site analysis."},
                     status=status.HTTP_403_FORBIDDEN
@@ -1813,22 +1221,19 @@ class GeographicAnalysisView(APIView):
                 deleted_at__isnull=True
             ).order_by('-created_at')
             
-            # Calculate geographic analysis
-            coverage_radius = self._calculate_coverage_radius(sites)
-            geographic_center = self._calculate_geographic_center(sites)
-            total_area_covered = self._calculate_coverage_area(sites)
+            # Calculate geographic analysis (one coordinate fetch)
+            analysis = SiteGeoAnalysisService(sites).analyze()
             
             # Get GPS statistics
-            sites_with_coords = sites.exclude(latitude__isnull=True, longitude__isnull=True)
             total_sites = sites.count()
-            sites_with_coordinates = sites_with_coords.count()
+            sites_with_coordinates = analysis['sites_with_coordinates']
             sites_without_coordinates = total_sites - sites_with_coordinates
             
             response_data = {
                 'geographic_analysis': {
-                    'coverage_radius_km': coverage_radius,
-                    'geographic_center': geographic_center,
-                    'total_area_covered': total_area_covered,
+                    'coverage_radius_km': analysis['coverage_radius_km'],
+                    'geographic_center': analysis['geographic_center'],
+                    'total_area_covered': analysis['total_area_covered'],
                 },
                 'gps_statistics': {
                     'total_sites': total_sites,
@@ -1846,72 +1251,96 @@ class GeographicAnalysisView(APIView):
                 {"error": "Failed to calculate geographic analysis"}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-    
-    def _calculate_coverage_radius(self, sites):
-        """Calculate the radius of coverage area in kilometers"""
-        sites_with_coords = sites.exclude(latitude__isnull=True, longitude__isnull=True)
-        if sites_with_coords.count() < 2:
-            return 0
-        
-        import math
-        
-        # Find the maximum distance between any two sites
-        max_distance = 0
-        coords = [(float(site.latitude), float(site.longitude)) for site in sites_with_coords]
-        
-        for i, coord1 in enumerate(coords):
-            for coord2 in coords[i+1:]:
-                distance = self._haversine_distance(coord1[0], coord1[1], coord2[0], coord2[1])
-                max_distance = max(max_distance, distance)
-        
-        return round(max_distance / 2, 2)  # Radius is half the maximum distance
-    
-    def _calculate_geographic_center(self, sites):
-        """Calculate the geographic center of all sites"""
-        sites_with_coords = sites.exclude(latitude__isnull=True, longitude__isnull=True)
-        if not sites_with_coords.exists():
-            return None
-        
-        total_lat = sum(float(site.latitude) for site in sites_with_coords)
-        total_lng = sum(float(site.longitude) for site in sites_with_coords)
-        count = sites_with_coords.count()
-        
-        return {
-            'latitude': round(total_lat / count, 6),
-            'longitude': round(total_lng / count, 6)
-        }
-    
-    def _calculate_coverage_area(self, sites):
-        """Calculate approximate coverage area in square kilometers"""
-        sites_with_coords = sites.exclude(latitude__isnull=True, longitude__isnull=True)
-        if sites_with_coords.count() < 3:
-            return 0
-        
-        # Simple bounding box calculation
-        latitudes = [float(site.latitude) for site in sites_with_coords]
-        longitudes = [float(site.longitude) for site in sites_with_coords]
-        
-        lat_range = max(latitudes) - min(latitudes)
-        lng_range = max(longitudes) - min(longitudes)
-        
-        # Approximate area calculation (rough estimate)
-        lat_km = lat_range * 111  # 1 degree latitude ≈ 111 km
-        lng_km = lng_range * 111 * abs(sum(latitudes) / len(latitudes) / 180)  # Adjust for latitude
-        
-        return round(lat_km * lng_km, 2)
-    
-    def _haversine_distance(self, lat1, lon1, lat2, lon2):
-        """Calculate the great circle distance between two points on earth (in kilometers)"""
-        import math
-        
-        # Convert decimal degrees to radians
-        lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-        
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        r = 6371  # Radius of earth in kilometers
-        
-        return c * r 
\ No newline at end of file
+ 
+
+class SiteSpatialSearchView(SitePermissionMixin, APIView):
+    """
+    Spatial Site Search
+    Nearest sites around a point (optionally within a radius) and map viewport
+    (bounding box) queries, backed by the geohash index
+    """
+    permission_classes = [IsAuthenticated, IsTenantMember]
+
+    MAX_NEARBY_RESULTS = 500
+    MAX_BOUNDS_RESULTS = 5000
+
+    @staticmethod
+    def _coordinate(params, name, low, high):
+        value = float(params[name])
+        if not (low <= value <= high):
+            raise ValueError(f"{name} must be between {low} and {high}")
+        return value
+
+    def get(self, request):
+        """
+        Search the current tenant's sites.
+
+        ?lat=&lng=[&radius_km=][&limit=]            nearest sites, nearest first
+        ?min_lat=&min_lng=&max_lat=&max_lng=[&limit=] sites inside the box
+        """
+        try:
+            if not self._check_permission(request, "read"):
+                return Response(
+                    {"detail": "You don't have permission to view sites."},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+
+            tenant = getattr(request, 'tenant', None)
+            if not tenant:
+                return Response(
+                    {"error": "Tenant context not found"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            search = SiteSpatialSearch(Site.objects.filter(tenant=tenant, deleted_at__isnull=True))
+            params = request.GET
+
+            try:
+                if 'min_lat' in params:
+                    min_lat = self._coordinate(params, 'min_lat', -90, 90)
+                    max_lat = self._coordinate(params, 'max_lat', -90, 90)
+                    min_lng = self._coordinate(params, 'min_lng', -180, 180)
+                    max_lng = self._coordinate(params, 'max_lng', -180, 180)
+                    if min_lat > max_lat or min_lng > max_lng:
+                        raise ValueError("min_lat/min_lng must not exceed max_lat/max_lng")
+                    limit = min(int(params.get('limit', 1000)), self.MAX_BOUNDS_RESULTS)
+                else:
+                    latitude = self._coordinate(params, 'lat', -90, 90)
+                    longitude = self._coordinate(params, 'lng', -180, 180)
+                    radius_km = float(params['radius_km']) if params.get('radius_km') else None
+                    if radius_km is not None and not (math.isfinite(radius_km) and 0 < radius_km <= NEAREST_MAX_RADIUS_KM):
+                        raise ValueError(f"radius_km must be greater than 0 and at most {NEAREST_MAX_RADIUS_KM:g}")
+                    limit = min(int(params.get('limit', 20)), self.MAX_NEARBY_RESULTS)
+                if limit < 1:
+                    raise ValueError("limit must be positive")
+            except KeyError as e:
+                return Response(
+                    {"error": f"Missing parameter: {e.args[0]}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+            if 'min_lat' in params:
+                sites, truncated = search.within_bounds(min_lat, min_lng, max_lat, max_lng, limit)
+                return Response({
+                    'sites': sites,
+                    'count': len(sites),
+                    'truncated': truncated,
+                }, status=status.HTTP_200_OK)
+
+            if radius_km is not None:
+                sites = search.within_radius(latitude, longitude, radius_km, limit)
+            else:
+                sites = search.nearest(latitude, longitude, limit)
+            return Response({
+                'sites': sites,
+                'count': len(sites),
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            logger.error(f"Error searching sites spatially: {str(e)}")
+            return Response(
+                {"error": "Failed to search sites"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
@@ -0,0 +1,36 @@
+"""
+Background job runners for bulk task creation
+"""
+
+from core.jobs import BulkJobRunner
+from core.spreadsheet_reader import SpreadsheetReader
+
+from .models import BulkTaskCreationJob, BulkTaskCreationError
+from .services import BulkTaskCreationService
+
+
+class BulkTaskCreationRunner(BulkJobRunner):
+    """Large task creation CSVs (AsyncBulkTaskCreationView)"""
+
+    job_model = BulkTaskCreationJob
+    error_model = BulkTaskCreationError
+    chunk_size = 50
+    counter_fields = {'success_count': 'success_count'}
+
+    def open_reader(self, stored_file):
+        return SpreadsheetReader(
+            stored_file, file_name=self.job.file_path, chunk_size=self.chunk_size,
+            csv_options=BulkTaskCreationService.CSV_READ_OPTIONS
+        )
+
+    def prepare(self, columns):
+        job = self.job
+        options = job.job_options or {}
+        self.importer = BulkTaskCreationService(
+            job.flow_template, job.project, job.tenant, job.created_by,
+            options.get('auto_id_prefix', ''), options.get('auto_id_start', ''), options.get('task_name', '')
+        )
+        return None
+
+    def process_chunk(self, chunk_df, start_row):
+        return self.importer.import_frame(chunk_df.fillna(''))
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.10 on 2026-10-16 23:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0028_bulk_job_resume_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bulktaskcreationjob",
+            name="attempts",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Consecutive runs stopped by an unexpected error"
+            ),
+        ),
+        migrations.CreateModel(
+            name="BulkTaskCreationError",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("row", models.IntegerField()),
+                ("error", models.TextField()),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="row_errors",
+                        to="tasks.bulktaskcreationjob",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "tasks_bulk_task_creation_error",
+                "ordering": ["row"],
+                "indexes": [models.Index(fields=["job", "row"], name="tasks_bulk_job_id_row_idx")],
+            },
+        ),
+    ]
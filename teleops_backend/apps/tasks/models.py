@@ -4,6 +4,8 @@ from django.core.validators import MinValueValidator
 from django.utils import timezone
 import uuid
 
+from core.jobs.models import BulkJobMixin
+
 # Import allocation models to register them with Django
 from .allocation_models import TaskAllocation, SubActivityAllocation, AllocationHistory
 
@@ -665,7 +667,7 @@ class TaskSubActivity(models.Model):
         self.save(update_fields=['status', 'actual_start', 'actual_end', 'updated_at']) 
 
 
-class BulkTaskCreationJob(models.Model):
+class BulkTaskCreationJob(BulkJobMixin):
     """
     Model to track bulk task creation jobs for large CSV uploads
     """
@@ -700,20 +702,26 @@ class BulkTaskCreationJob(models.Model):
     
     def __str__(self):
         return f"Bulk Task Creation {self.id} - {self.file_name} ({self.status})"
-    
-    @property
-    def progress_percentage(self):
-        if self.total_rows == 0:
-            return 0
-        return round((self.processed_rows / self.total_rows) * 100, 2)
-    
-    @property
-    def duration(self):
-        if not self.started_at:
-            return None
-        from django.utils import timezone
-        end_time = self.completed_at or timezone.now()
-        return end_time - self.started_at 
+
+
+class BulkTaskCreationError(models.Model):
+    """
+    One failed row of a bulk task creation job, appended per chunk instead of
+    rewriting the job's detailed_errors JSON
+    """
+    job = models.ForeignKey('BulkTaskCreationJob', on_delete=models.CASCADE, related_name='row_errors')
+    row = models.IntegerField()
+    error = models.TextField()
+
+    class Meta:
+        db_table = 'tasks_bulk_task_creation_error'
+        ordering = ['row']
+        indexes = [
+            models.Index(fields=['job', 'row'], name='tasks_bulk_job_id_row_idx'),
+        ]
+
+    def __str__(self):
+        return f"Job {self.job_id} row {self.row}: {self.error}"
 
 
  
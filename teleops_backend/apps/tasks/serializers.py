@@ -1136,6 +1136,7 @@ class BulkTaskCreationJobSerializer(serializers.ModelSerializer):
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
     flow_template_name = serializers.CharField(source='flow_template.name', read_only=True)
     project_name = serializers.CharField(source='project.name', read_only=True)
+    detailed_errors = serializers.SerializerMethodField()
     
     class Meta:
         model = BulkTaskCreationJob
@@ -1145,7 +1146,11 @@ class BulkTaskCreationJobSerializer(serializers.ModelSerializer):
             'error_count', 'status', 'error_message', 'detailed_errors', 'started_at', 'completed_at',
             'created_at', 'updated_at', 'progress_percentage', 'duration'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'progress_percentage', 'duration'] 
+        read_only_fields = ['id', 'created_at', 'updated_at', 'progress_percentage', 'duration']
+
+    def get_detailed_errors(self, obj):
+        # Jobs run before row_errors existed kept their errors in the JSON field
+        return list(obj.row_errors.values('row', 'error')) or obj.detailed_errors or []
 
 class TaskAllocationCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating new task allocations"""
@@ -0,0 +1,12 @@
+"""
+Task services package
+"""
+
+from .dashboard_stats_service import get_task_dashboard_stats
+from .task_creation_service import TaskCreationService, BulkTaskCreationService
+
+__all__ = [
+    'get_task_dashboard_stats',
+    'TaskCreationService',
+    'BulkTaskCreationService',
+]
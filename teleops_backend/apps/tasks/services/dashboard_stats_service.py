@@ -0,0 +1,17 @@
+"""
+Task Dashboard Stats
+Cached per-tenant task status, type and priority counts for TaskViewSet.stats.
+"""
+
+from core.dashboard_stats import DashboardStats
+
+from ..models import TaskFromFlow
+
+
+def get_task_dashboard_stats() -> DashboardStats:
+    """Counts of the tenant's tasks by status, task type and priority."""
+    return DashboardStats(
+        'tasks',
+        TaskFromFlow,
+        group_fields=('status', 'task_type', 'priority'),
+    )
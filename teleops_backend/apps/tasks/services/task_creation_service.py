@@ -0,0 +1,345 @@
+"""
+Task Creation Service
+Creates tasks (with their site groups and sub-activities) from flow templates,
+for CreateTaskFromFlowView and bulk task creation from CSV uploads.
+"""
+
+import logging
+from typing import Any, Dict
+
+import pandas as pd
+from django.core.exceptions import ValidationError
+
+from apps.projects.models import ProjectSite
+
+from ..models import TaskFromFlow, TaskSiteGroup, TaskSubActivity
+from ..utils import TaskIDGenerator
+
+logger = logging.getLogger(__name__)
+
+
+class TaskCreationService:
+    """Create a single task from a flow template and a site group"""
+
+    def __init__(self, tenant, user):
+        self.tenant = tenant
+        self.user = user
+
+    def create_from_site_group(self, flow_template, project, site_group, task_naming):
+        """Create a single task from a site group"""
+        tenant = self.tenant
+        client_task_id = site_group.get('client_task_id')
+
+        # Validate client ID if provided
+        if client_task_id:
+            is_valid, error_msg = TaskIDGenerator.validate_client_id(client_task_id, tenant)
+            if not is_valid:
+                raise ValidationError(error_msg)
+
+        # Generate task ID
+        task_id = TaskIDGenerator.generate_task_id(
+            flow_template=flow_template,
+            project=project,
+            client_id=client_task_id,
+            prefix=task_naming.get('auto_id_prefix'),
+            start_number=task_naming.get('auto_id_start'),
+            tenant=tenant
+        )
+
+        # Create main task
+        task = TaskFromFlow.objects.create(
+            task_id=task_id,
+            client_task_id=client_task_id,
+            is_client_id_provided=bool(client_task_id),
+            task_name=site_group.get('task_name', f"{flow_template.name}Task"),
+            description=f"Task created from flow template: {flow_template.name}",
+            flow_template=flow_template,
+            project=project,
+            tenant=tenant,
+            created_by=self.user,
+            status='pending',
+            priority='medium'
+        )
+
+        # Create site group mappings
+        for i, (alias, project_site_id) in enumerate(site_group['sites'].items()):
+            # Get the project site object first, then extract the actual site
+            try:
+                project_site = ProjectSite.objects.get(id=project_site_id)
+                actual_site = project_site.site
+            except ProjectSite.DoesNotExist:
+                raise ValidationError(f"Project site with ID {project_site_id} not found")
+            except AttributeError:
+                # Handle case where project_site.site might be None
+                raise ValidationError(f"Project site {project_site_id} has no associated site")
+
+            TaskSiteGroup.objects.create(
+                task_from_flow=task,
+                site=actual_site,
+                site_alias=alias,
+                assignment_order=i
+            )
+
+        # Create sub-activities for this task
+        self._create_sub_activities(task, flow_template, site_group)
+
+        return task
+
+    def _create_sub_activities(self, task, flow_template, site_group):
+        """Create sub-activities for a task based on flow template"""
+        template_activities = flow_template.activities.all().order_by('sequence_order')
+
+        if not template_activities.exists():
+            # If no activities exist, create a default one with a site assigned
+            if site_group['sites']:
+                first_alias = list(site_group['sites'].keys())[0]
+                project_site_id = site_group['sites'][first_alias]
+                try:
+                    project_site = ProjectSite.objects.get(id=project_site_id)
+                    actual_site = project_site.site
+                    TaskSubActivity.objects.create(
+                        task_from_flow=task,
+                        flow_activity=None,
+                        sequence_order=0,
+                        activity_type='general',
+                        activity_name='Default Activity',
+                        description='Default activity created for task',
+                        assigned_site=actual_site,  # Assign site immediately
+                        site_alias=first_alias,    # Assign alias immediately
+                        dependencies=[],
+                        dependency_scope='TASK_LOCAL',
+                        parallel_execution=False,
+                        status='pending',
+                        progress_percentage=0
+                    )
+                except (ProjectSite.DoesNotExist, AttributeError):
+                    pass
+            return
+
+        sub_task_map = {}  # Map template sequence to sub-task ID for dependencies
+
+        # Single pass: Create sub-activities with sites assigned immediately
+        for template_activity in template_activities:
+            # Determine which site to assign to this activity
+            assigned_site = None
+            site_alias = ''
+
+            # Try to assign site based on flow template configuration first
+            if hasattr(template_activity, 'assigned_sites') and template_activity.assigned_sites.exists():
+                for flow_activity_site in template_activity.assigned_sites.all():
+                    if flow_activity_site.flow_site.alias in site_group['sites']:
+                        # Get the project site ID for this alias
+                        project_site_id = site_group['sites'][flow_activity_site.flow_site.alias]
+
+                        # Get the actual site from the project site
+                        try:
+                            project_site = ProjectSite.objects.get(id=project_site_id)
+                            assigned_site = project_site.site
+                            site_alias = flow_activity_site.flow_site.alias
+                            break  # Use first matching site
+
+                        except (ProjectSite.DoesNotExist, AttributeError):
+                            continue
+
+            # If no site was assigned from flow template, use fallback assignment
+            if not assigned_site:
+                if site_group['sites']:
+                    first_alias = list(site_group['sites'].keys())[0]
+                    project_site_id = site_group['sites'][first_alias]
+
+                    try:
+                        project_site = ProjectSite.objects.get(id=project_site_id)
+                        assigned_site = project_site.site
+                        site_alias = first_alias
+
+                    except (ProjectSite.DoesNotExist, AttributeError):
+                        # If we can't get a site, skip this activity
+                        continue
+
+            # Create sub-activity with site already assigned
+            if assigned_site:
+                sub_task = TaskSubActivity.objects.create(
+                    task_from_flow=task,
+                    flow_activity=template_activity,
+                    sequence_order=template_activity.sequence_order,
+                    activity_type=template_activity.activity_type,
+                    activity_name=template_activity.activity_name,
+                    description=template_activity.description or '',
+                    assigned_site=assigned_site,  # Site assigned immediately
+                    site_alias=site_alias,        # Alias assigned immediately
+                    dependencies=[],  # Will be updated in second pass
+                    dependency_scope=template_activity.dependency_scope or 'TASK_LOCAL',
+                    parallel_execution=template_activity.parallel_execution or False,
+                    status='pending',
+                    progress_percentage=0
+                )
+
+                # Store mapping for dependency resolution
+                sub_task_map[template_activity.sequence_order] = sub_task.id
+
+        # Second pass: Update dependencies using sub_task_map
+        for template_activity in template_activities:
+            if not template_activity.dependencies:
+                continue
+            current_sub_task_id = sub_task_map.get(template_activity.sequence_order)
+            if not current_sub_task_id:
+                continue
+
+            dependency_sub_task_ids = []
+            for dep_sequence in template_activity.dependencies:
+                # Convert string dependency to integer for lookup
+                try:
+                    dep_sequence_int = int(dep_sequence)
+                except (ValueError, TypeError):
+                    logger.warning(f"Ignoring invalid dependency sequence {dep_sequence!r} of task {task.task_id}")
+                    continue
+                dep_sub_task_id = sub_task_map.get(dep_sequence_int)
+                if dep_sub_task_id:
+                    dependency_sub_task_ids.append(str(dep_sub_task_id))
+
+            # Update the current sub-task's dependencies
+            if dependency_sub_task_ids:
+                sub_task = TaskSubActivity.objects.get(id=current_sub_task_id)
+                sub_task.dependencies = dependency_sub_task_ids
+                sub_task.save(update_fields=['dependencies'])
+
+
+class BulkTaskCreationService:
+    """
+    Create one task per CSV row of a bulk task upload.
+
+    Each row names a site per flow template alias ("<alias> Site ID",
+    "<alias> Global ID") and optionally a client task id. Rows that cannot
+    be resolved or created are reported as errors numbered index + 1.
+    """
+
+    # Blank and NULL-like cells become NaN (then empty strings); the encoding is detected by the reader
+    CSV_READ_OPTIONS = {'na_values': ['', 'nan', 'NaN', 'NULL', 'null'], 'keep_default_na': False}
+
+    def __init__(self, flow_template, project, tenant, user, auto_id_prefix='', auto_id_start='', task_name=''):
+        self.flow_template = flow_template
+        self.project = project
+        self.tenant = tenant
+        self.user = user
+        self.task_name = task_name
+        # Convert auto_id_start to integer if provided
+        try:
+            auto_id_start_int = int(auto_id_start) if auto_id_start else 1
+        except (ValueError, TypeError):
+            auto_id_start_int = 1
+        self.task_naming = {
+            'auto_id_prefix': auto_id_prefix,
+            'auto_id_start': auto_id_start_int
+        }
+        self.creator = TaskCreationService(tenant, user)
+
+    def import_frame(self, df) -> Dict[str, Any]:
+        """Create tasks for every row of df; returns success_count, error_count and errors"""
+        success_count = 0
+        error_count = 0
+        errors = []
+        flow_sites = list(self.flow_template.sites.all())
+
+        for index, row in df.iterrows():
+            try:
+                csv_task_unique_id = row.get('Task Unique ID (Optional)', '')
+
+                # Check if this row has any meaningful data
+                row_has_data = False
+                for flow_site in flow_sites:
+                    site_id = row.get(f"{flow_site.alias} Site ID", '')
+                    global_id = row.get(f"{flow_site.alias} Global ID", '')
+                    if (site_id and site_id != '' and site_id != 'nan') or (global_id and global_id != '' and global_id != 'nan'):
+                        row_has_data = True
+                        break
+
+                if not row_has_data:
+                    error_count += 1
+                    errors.append({
+                        'row': index + 1,
+                        'error': 'Row is completely empty - no valid site IDs or global IDs found'
+                    })
+                    continue
+
+                # Process each site alias
+                sites_data = {}
+                for flow_site in flow_sites:
+                    project_site = self._resolve_project_site(row, flow_site.alias)
+                    if project_site:
+                        sites_data[flow_site.alias] = project_site.id
+
+                if not sites_data:
+                    error_count += 1
+                    errors.append({
+                        'row': index + 1,
+                        'error': 'No valid sites found for this row - all site IDs were empty, NaN, or invalid'
+                    })
+                    continue
+
+                site_group = {
+                    'sites': sites_data,
+                    'task_name': self.task_name,  # Use task name from Step 1
+                    'client_task_id': csv_task_unique_id if csv_task_unique_id and csv_task_unique_id.strip() else None
+                }
+
+                try:
+                    task = self.creator.create_from_site_group(
+                        self.flow_template, self.project, site_group, self.task_naming
+                    )
+                    if task:
+                        success_count += 1
+                    else:
+                        error_count += 1
+                        errors.append({
+                            'row': index + 1,
+                            'error': 'Task creation returned None'
+                        })
+                except Exception as task_error:
+                    error_count += 1
+                    errors.append({
+                        'row': index + 1,
+                        'error': f'Task creation failed: {str(task_error)}'
+                    })
+
+            except Exception as e:
+                error_count += 1
+                errors.append({
+                    'row': index + 1,
+                    'error': str(e)
+                })
+
+        return {
+            'success_count': success_count,
+            'error_count': error_count,
+            'errors': errors
+        }
+
+    def _resolve_project_site(self, row, alias):
+        site_id = row.get(f"{alias} Site ID", '')
+        global_id = row.get(f"{alias} Global ID", '')
+
+        # Handle pandas NaN values
+        if pd.isna(site_id) or site_id == 'nan':
+            site_id = ''
+        if pd.isna(global_id) or global_id == 'nan':
+            global_id = ''
+
+        # Use either site_id or global_id, prioritizing site_id if available
+        identifier = site_id if site_id else global_id
+        if not identifier:
+            return None
+
+        # First try by ProjectSite ID (if identifier is numeric)
+        try:
+            numeric_id = int(identifier)
+            return ProjectSite.objects.filter(id=numeric_id, project=self.project).first()
+        except ValueError:
+            pass
+
+        # If not numeric, try by site business ID (site_id) first, then global_id
+        project_site = None
+        if site_id:
+            project_site = ProjectSite.objects.filter(project=self.project, site__site_id=site_id).first()
+        if not project_site and global_id:
+            project_site = ProjectSite.objects.filter(project=self.project, site__global_id=global_id).first()
+        return project_site
@@ -0,0 +1,25 @@
+"""
+Task signals keeping the cached dashboard stats current
+"""
+
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import TaskFromFlow
+from .services.dashboard_stats_service import get_task_dashboard_stats
+
+
+@receiver(pre_save, sender=TaskFromFlow)
+def remember_task_stats_fields(sender, instance, update_fields=None, **kwargs):
+    """Record the stored counted fields so unrelated saves keep the cache"""
+    get_task_dashboard_stats().remember(instance, update_fields)
+
+
+@receiver(post_save, sender=TaskFromFlow)
+def invalidate_task_stats_on_save(sender, instance, created, **kwargs):
+    get_task_dashboard_stats().invalidate_if_changed(instance, created)
+
+
+@receiver(post_delete, sender=TaskFromFlow)
+def invalidate_task_stats_on_delete(sender, instance, **kwargs):
+    get_task_dashboard_stats().invalidate_on_commit(instance.tenant_id)
@@ -2,18 +2,17 @@ from rest_framework import viewsets, status, filters, serializers
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.db import models, transaction
+from django.db import transaction
 from django.db.models import Q, Count, Sum
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.http import Http404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.views import APIView
-import pandas as pd
 
 from .models import (
     TaskSiteAssignment, TaskTeamAssignment, TaskComment, TaskTemplate,
-    FlowTemplate, FlowInstance, TaskFromFlow, TaskSiteGroup, TaskSubActivity,
+    FlowTemplate, FlowInstance, TaskFromFlow,
     BulkTaskCreationJob, TaskTimeline, AllocationStatus
 )
 from .allocation_models import (
@@ -32,9 +31,13 @@ from .serializers import (
 from .allocation_serializers import AllocationActionSerializer, ReallocationSerializer, AllocationHistorySerializer
 from core.permissions.tenant_permissions import TenantScopedPermission, TaskPermission, EquipmentVerificationPermission
 from core.pagination import StandardResultsSetPagination, LargeResultsSetPagination
-from .utils import TaskIDGenerator, TaskCreationValidator
-from django.core.exceptions import ValidationError
-from apps.projects.models import Project, ProjectSite
+from core.dashboard_stats import DashboardStats
+from .utils import TaskCreationValidator
+from .jobs import BulkTaskCreationRunner
+from core.jobs import start_bulk_job
+from .services import get_task_dashboard_stats, TaskCreationService, BulkTaskCreationService
+from core.spreadsheet_reader import SpreadsheetReader
+from apps.projects.models import Project
 from apps.sites.models import Site
 
 
@@ -337,13 +340,15 @@ class TaskViewSet(viewsets.ModelViewSet):
         
         tasks = TaskFromFlow.objects.filter(tenant=tenant)
         
-        # Calculate statistics
-        total_tasks = tasks.count()
-        pending_tasks = tasks.filter(status='pending').count()
-        assigned_tasks = tasks.filter(status='assigned').count()
-        in_progress_tasks = tasks.filter(status='in_progress').count()
-        completed_tasks = tasks.filter(status='completed').count()
-        cancelled_tasks = tasks.filter(status='cancelled').count()
+        # Status, type and priority counts from one grouped query, cached per tenant
+        summary = get_task_dashboard_stats().get(tenant.id)
+        status_counts = summary['status']
+        total_tasks = summary['total']
+        pending_tasks = status_counts.get('pending', 0)
+        assigned_tasks = status_counts.get('assigned', 0)
+        in_progress_tasks = status_counts.get('in_progress', 0)
+        completed_tasks = status_counts.get('completed', 0)
+        cancelled_tasks = status_counts.get('cancelled', 0)
 
         
         # Equipment verification stats (fields not available in TaskFromFlow model)
@@ -352,14 +357,10 @@ class TaskViewSet(viewsets.ModelViewSet):
         verification_completed = 0
         
         # Task type breakdown
-        task_types = tasks.values('task_type').annotate(
-            count=models.Count('id')
-        ).order_by('task_type')
+        task_types = DashboardStats.breakdown(summary, 'task_type')
         
         # Priority breakdown
-        priority_breakdown = tasks.values('priority').annotate(
-            count=models.Count('id')
-        ).order_by('priority')
+        priority_breakdown = DashboardStats.breakdown(summary, 'priority')
         
         # Recent tasks
         recent_tasks = tasks.order_by('-created_at')[:5]
@@ -378,8 +379,8 @@ class TaskViewSet(viewsets.ModelViewSet):
                 'completed': verification_completed,
                 'completion_rate': (verification_completed / verification_required * 100) if verification_required > 0 else 0
             },
-            'task_types': list(task_types),
-            'priority_breakdown': list(priority_breakdown),
+            'task_types': task_types,
+            'priority_breakdown': priority_breakdown,
             'recent_tasks': TaskSerializer(recent_tasks, many=True).data
         }
         
@@ -1068,8 +1069,8 @@ class CreateTaskFromFlowView(APIView):
                 
                 for site_group in site_groups:
                     # Create task for this site group
-                    task = self._create_task_from_site_group(
-                        flow_template, project, site_group, task_naming, tenant, request.user
+                    task = TaskCreationService(tenant, request.user).create_from_site_group(
+                        flow_template, project, site_group, task_naming
                     )
                     created_tasks.append(task)
                     total_sites += len(site_group['sites'])
@@ -1096,227 +1097,6 @@ class CreateTaskFromFlowView(APIView):
                 {'success': False, 'message': f'An error occurred: {str(e)}'},
                 status=500
             )
-    
-    def _create_task_from_site_group(self, flow_template, project, site_group, task_naming, tenant, user):
-        """Create a single task from a site group"""
-        # Generate task ID
-        client_task_id = site_group.get('client_task_id')
-        
-        # Validate client ID if provided
-        if client_task_id:
-            is_valid, error_msg = TaskIDGenerator.validate_client_id(client_task_id, tenant)
-            if not is_valid:
-                raise ValidationError(error_msg)
-        
-        # Generate task ID
-        task_id = TaskIDGenerator.generate_task_id(
-            flow_template=flow_template,
-            project=project,
-            client_id=client_task_id,
-            prefix=task_naming.get('auto_id_prefix'),
-            start_number=task_naming.get('auto_id_start'),
-            tenant=tenant
-        )
-        
-        # Create main task
-        task = TaskFromFlow.objects.create(
-            task_id=task_id,
-            client_task_id=client_task_id,
-            is_client_id_provided=bool(client_task_id),
-            task_name=site_group.get('task_name', f"{flow_template.name}Task"),
-            description=f"Task created from flow template: {flow_template.name}",
-            flow_template=flow_template,
-            project=project,
-            tenant=tenant,
-            created_by=user,
-            status='pending',
-            priority='medium'
-        )
-        
-        # Create site group mappings
-        for i, (alias, project_site_id) in enumerate(site_group['sites'].items()):
-            # Get the project site object first, then extract the actual site
-            try:
-                project_site = ProjectSite.objects.get(id=project_site_id)
-                actual_site = project_site.site
-            except ProjectSite.DoesNotExist:
-                raise ValidationError(f"Project site with ID {project_site_id} not found")
-            except AttributeError:
-                # Handle case where project_site.site might be None
-                raise ValidationError(f"Project site {project_site_id} has no associated site")
-            
-            TaskSiteGroup.objects.create(
-                task_from_flow=task,
-                site=actual_site,
-                site_alias=alias,
-                assignment_order=i
-            )
-        
-        # Create sub-activities for this task
-        self._create_sub_activities_for_task(task, flow_template, site_group)
-        
-        return task
-    
-    def _create_sub_activities_for_task(self, task, flow_template, site_group):
-        """Create sub-activities for a task based on flow template"""
-        # Get all activities from the flow template
-        template_activities = flow_template.activities.all().order_by('sequence_order')
-        print(f"DEBUG: Found {template_activities.count()} template activities")
-        
-        # Let's also check the raw database values
-        print("DEBUG: Raw database query for dependencies:")
-        raw_activities = flow_template.activities.values('sequence_order', 'activity_name', 'dependencies').order_by('sequence_order')
-        for raw_ta in raw_activities:
-            print(f"DEBUG: Raw - Activity {raw_ta['sequence_order']}: {raw_ta['activity_name']}, dependencies: {raw_ta['dependencies']} (type: {type(raw_ta['dependencies'])})")
-        
-        for ta in template_activities:
-            print(f"DEBUG: Activity {ta.sequence_order}: {ta.activity_name}, dependencies: {ta.dependencies} (type: {type(ta.dependencies)})")
-            if ta.dependencies:
-                for i, dep in enumerate(ta.dependencies):
-                    print(f"DEBUG:   Dependency {i}: {dep} (type: {type(dep)})")
-        
-        if not template_activities.exists():
-            # If no activities exist, create a default one with a site assigned
-            if site_group['sites']:
-                first_alias = list(site_group['sites'].keys())[0]
-                project_site_id = site_group['sites'][first_alias]
-                try:
-                    project_site = ProjectSite.objects.get(id=project_site_id)
-                    actual_site = project_site.site
-                    sub_task = TaskSubActivity.objects.create(
-                        task_from_flow=task,
-                        flow_activity=None,
-                        sequence_order=0,
-                        activity_type='general',
-                        activity_name='Default Activity',
-                        description='Default activity created for task',
-                        assigned_site=actual_site,  # Assign site immediately
-                        site_alias=first_alias,    # Assign alias immediately
-                        dependencies=[],
-                        dependency_scope='TASK_LOCAL',
-                        parallel_execution=False,
-                        status='pending',
-                        progress_percentage=0
-                    )
-                    return
-                except (ProjectSite.DoesNotExist, AttributeError):
-                    return
-            else:
-                return
-        
-        sub_task_map = {}  # Map template sequence to sub-task ID for dependencies
-        
-        # Single pass: Create sub-activities with sites assigned immediately
-        for template_activity in template_activities:
-            # Determine which site to assign to this activity
-            assigned_site = None
-            site_alias = ''
-            
-            # Try to assign site based on flow template configuration first
-            if hasattr(template_activity, 'assigned_sites') and template_activity.assigned_sites.exists():
-                for flow_activity_site in template_activity.assigned_sites.all():
-                    if flow_activity_site.flow_site.alias in site_group['sites']:
-                        # Get the project site ID for this alias
-                        project_site_id = site_group['sites'][flow_activity_site.flow_site.alias]
-                        
-                        # Get the actual site from the project site
-                        try:
-                            project_site = ProjectSite.objects.get(id=project_site_id)
-                            assigned_site = project_site.site
-                            site_alias = flow_activity_site.flow_site.alias
-                            break  # Use first matching site
-                            
-                        except (ProjectSite.DoesNotExist, AttributeError):
-                            continue
-            
-            # If no site was assigned from flow template, use fallback assignment
-            if not assigned_site:
-                if site_group['sites']:
-                    first_alias = list(site_group['sites'].keys())[0]
-                    project_site_id = site_group['sites'][first_alias]
-                    
-                    try:
-                        project_site = ProjectSite.objects.get(id=project_site_id)
-                        assigned_site = project_site.site
-                        site_alias = first_alias
-                        
-                    except (ProjectSite.DoesNotExist, AttributeError):
-                        # If we can't get a site, skip this activity
-                        continue
-            
-            # Create sub-activity with site already assigned
-            if assigned_site:
-                sub_task = TaskSubActivity.objects.create(
-                    task_from_flow=task,
-                    flow_activity=template_activity,
-                    sequence_order=template_activity.sequence_order,
-                    activity_type=template_activity.activity_type,
-                    activity_name=template_activity.activity_name,
-                    description=template_activity.description or '',
-                    assigned_site=assigned_site,  # Site assigned immediately
-                    site_alias=site_alias,        # Alias assigned immediately
-                    dependencies=[],  # Will be updated in second pass
-                    dependency_scope=template_activity.dependency_scope or 'TASK_LOCAL',
-                    parallel_execution=template_activity.parallel_execution or False,
-                    status='pending',
-                    progress_percentage=0
-                )
-                
-                # Store mapping for dependency resolution
-                sub_task_map[template_activity.sequence_order] = sub_task.id
-        
-        # Second pass: Update dependencies using sub_task_map
-        print(f"DEBUG: Sub-task map: {sub_task_map}")
-        print(f"DEBUG: Sub-task map keys: {list(sub_task_map.keys())}")
-        print(f"DEBUG: Sub-task map values: {list(sub_task_map.values())}")
-        
-        for template_activity in template_activities:
-            print(f"DEBUG: Processing dependencies for sequence {template_activity.sequence_order}")
-            print(f"DEBUG: Template activity dependencies: {template_activity.dependencies}")
-            print(f"DEBUG: Template activity dependencies type: {type(template_activity.dependencies)}")
-            print(f"DEBUG: Template activity dependencies length: {len(template_activity.dependencies) if template_activity.dependencies else 0}")
-            
-            if template_activity.dependencies:
-                # Get the sub-task for this activity
-                current_sub_task_id = sub_task_map.get(template_activity.sequence_order)
-                print(f"DEBUG: Current sub-task ID: {current_sub_task_id}")
-                
-                if current_sub_task_id:
-                    # Get the dependent sub-task IDs
-                    dependency_sub_task_ids = []
-                    for dep_sequence in template_activity.dependencies:
-                        print(f"DEBUG: Processing dependency sequence: {dep_sequence} (type: {type(dep_sequence)})")
-                        
-                        # Convert string dependency to integer for lookup
-                        try:
-                            dep_sequence_int = int(dep_sequence)
-                            print(f"DEBUG: Converted dependency sequence '{dep_sequence}' to integer {dep_sequence_int}")
-                        except (ValueError, TypeError):
-                            print(f"DEBUG: ERROR: Could not convert dependency sequence '{dep_sequence}' to integer")
-                            continue
-                        
-                        print(f"DEBUG: Looking up dep_sequence {dep_sequence_int} in sub_task_map")
-                        dep_sub_task_id = sub_task_map.get(dep_sequence_int)
-                        print(f"DEBUG: Found dependent sub-task ID: {dep_sub_task_id}")
-                        if dep_sub_task_id:
-                            dependency_sub_task_ids.append(str(dep_sub_task_id))
-                        else:
-                            print(f"DEBUG: WARNING: No sub-task found for dependency sequence {dep_sequence_int}")
-                    
-                    print(f"DEBUG: Final dependency sub-task IDs: {dependency_sub_task_ids}")
-                    
-                    # Update the current sub-task's dependencies
-                    if dependency_sub_task_ids:
-                        sub_task = TaskSubActivity.objects.get(id=current_sub_task_id)
-                        sub_task.dependencies = dependency_sub_task_ids
-                        sub_task.save(update_fields=['dependencies'])
-                        print(f"DEBUG: Updated dependencies for sub-task {current_sub_task_id}: {dependency_sub_task_ids}")
-                    else:
-                        print(f"DEBUG: No valid dependencies found for sub-task {current_sub_task_id}")
-                else:
-                    print(f"DEBUG: No sub-task found for sequence {template_activity.sequence_order}")
-            else:
-                print(f"DEBUG: No dependencies for sequence {template_activity.sequence_order}") 
 
 
 class AsyncBulkTaskCreationView(APIView):
@@ -1365,31 +1145,10 @@ class AsyncBulkTaskCreationView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Read CSV file
-            import pandas as pd
-            import io
-            
+            # Stream the CSV: only the header and a row count are read here
             try:
-                csv_content = csv_file.read().decode('utf-8')
-                
-                # Log the raw bytes to see if there are encoding issues
-                csv_file.seek(0)  # Reset file pointer
-                raw_bytes = csv_file.read()
-                
-                # Try different encoding methods
-                try:
-                    csv_content_utf8 = raw_bytes.decode('utf-8')
-                except UnicodeDecodeError as e:
-                    try:
-                        csv_content_utf8 = raw_bytes.decode('utf-8-sig')  # Try with BOM
-                    except UnicodeDecodeError as e2:
-                        csv_content_utf8 = raw_bytes.decode('latin-1')  # Fallback
-                
-                # Read CSV with better handling of empty cells and NaN values
-                df = pd.read_csv(io.StringIO(csv_content_utf8), na_values=['', 'nan', 'NaN', 'NULL', 'null'], keep_default_na=False)
-                
-                # Clean the dataframe - replace any remaining NaN values with empty strings
-                df = df.fillna('')
+                reader = SpreadsheetReader(csv_file, chunk_size=BulkTaskCreationRunner.chunk_size, csv_options=BulkTaskCreationService.CSV_READ_OPTIONS)
+                columns = reader.headers
             except Exception as e:
                 return Response(
                     {"success": False, "message": f"Failed to read CSV file: {str(e)}"},
@@ -1401,18 +1160,19 @@ class AsyncBulkTaskCreationView(APIView):
             for site in flow_template.sites.all():
                 expected_columns.extend([f"{site.alias} Site ID", f"{site.alias} Global ID", f"{site.alias} Site Name"])
             
-            if not all(col in df.columns for col in expected_columns):
+            if not all(col in columns for col in expected_columns):
                 return Response(
                     {"success": False, "message": f"Invalid CSV structure. Expected columns: {', '.join(expected_columns)}"},
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            total_rows = len(df)
+            total_rows = reader.count_rows(exact=True)
             
             # For large files (>50 rows), use async processing
             if total_rows > 50:
-                return self._process_large_upload_async(request, df, flow_template, project, tenant, user, csv_file.name, auto_id_prefix, auto_id_start, task_name)
+                return self._process_large_upload_async(request, total_rows, flow_template, project, tenant, user, csv_file, auto_id_prefix, auto_id_start, task_name)
             else:
+                df = reader.read_frame().fillna('')
                 return self._process_small_upload_sync(request, df, flow_template, project, tenant, user, auto_id_prefix, auto_id_start, task_name)
                 
         except Exception as e:
@@ -1424,7 +1184,9 @@ class AsyncBulkTaskCreationView(APIView):
     def _process_small_upload_sync(self, request, df, flow_template, project, tenant, user, auto_id_prefix, auto_id_start, task_name):
         """Process small uploads synchronously"""
         try:
-            results = self._process_csv_data(df, flow_template, project, tenant, user, auto_id_prefix, auto_id_start, task_name)
+            results = BulkTaskCreationService(
+                flow_template, project, tenant, user, auto_id_prefix, auto_id_start, task_name
+            ).import_frame(df)
             
             return Response({
                 "success": True,
@@ -1443,7 +1205,7 @@ class AsyncBulkTaskCreationView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
-    def _process_large_upload_async(self, request, df, flow_template, project, tenant, user, file_name, auto_id_prefix, auto_id_start, task_name):
+    def _process_large_upload_async(self, request, total_rows, flow_template, project, tenant, user, csv_file, auto_id_prefix, auto_id_start, task_name):
         """Process large uploads asynchronously"""
         try:
             # Create job record
@@ -1452,26 +1214,24 @@ class AsyncBulkTaskCreationView(APIView):
                 created_by=user,
                 flow_template=flow_template,
                 project=project,
-                file_name=file_name,
-                total_rows=len(df),
+                file_name=csv_file.name,
+                total_rows=total_rows,
                 status='pending'
             )
             
-            # Start async processing
-            import threading
-            thread = threading.Thread(
-                target=self._process_large_upload_async_worker,
-                args=(job, df, flow_template, project, tenant, user, auto_id_prefix, auto_id_start, task_name)
-            )
-            thread.daemon = True
-            thread.start()
+            # Queue durable background processing of the stored upload
+            start_bulk_job(BulkTaskCreationRunner, job, csv_file, options={
+                'auto_id_prefix': auto_id_prefix,
+                'auto_id_start': auto_id_start,
+                'task_name': task_name,
+            })
             
             return Response({
                 "success": True,
                 "message": "Large file detected. Processing started asynchronously.",
                 "data": {
                     "job_id": job.id,
-                    "total_rows": len(df),
+                    "total_rows": total_rows,
                     "status": "processing"
                 }
             }, status=status.HTTP_202_ACCEPTED)
@@ -1481,219 +1241,6 @@ class AsyncBulkTaskCreationView(APIView):
                 {"success": False, "message": f"Failed to start async processing: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-    
-    def _process_large_upload_async_worker(self, job, df, flow_template, project, tenant, user, auto_id_prefix, auto_id_start, task_name):
-        """Worker thread for async processing"""
-        try:
-            job.status = 'processing'
-            job.started_at = timezone.now()
-            job.detailed_errors = []
-            job.save()
-            
-            # Process in chunks of 50 rows
-            chunk_size = 50
-            total_chunks = (len(df) + chunk_size - 1) // chunk_size
-            
-            all_errors = []
-            total_success = 0
-            
-            for chunk_idx in range(total_chunks):
-                start_idx = chunk_idx * chunk_size
-                end_idx = min(start_idx + chunk_size, len(df))
-                chunk_df = df.iloc[start_idx:end_idx]
-                
-                # Process chunk
-                chunk_result = self._process_csv_data(chunk_df, flow_template, project, tenant, user, auto_id_prefix, auto_id_start, task_name)
-                
-                # Collect errors from this chunk
-                if chunk_result.get('errors'):
-                    all_errors.extend(chunk_result['errors'])
-                
-                # Update job progress
-                job.processed_rows = end_idx
-                job.success_count += chunk_result['success_count']
-                job.error_count += chunk_result['error_count']
-                job.detailed_errors = all_errors
-                job.save()
-                
-                # Small delay to prevent overwhelming the database
-                import time
-                time.sleep(0.1)
-            
-            # Mark job as completed
-            job.status = 'completed'
-            job.completed_at = timezone.now()
-            job.save()
-            
-        except Exception as e:
-            job.status = 'failed'
-            job.error_message = str(e)
-            job.completed_at = timezone.now()
-            job.save()
-    
-    def _process_csv_data(self, df, flow_template, project, tenant, user, auto_id_prefix, auto_id_start, task_name):
-        """Process CSV data and create tasks with new Task ID generation logic"""
-        success_count = 0
-        error_count = 0
-        errors = []
-        
-        # Convert auto_id_start to integer if provided
-        try:
-            auto_id_start_int = int(auto_id_start) if auto_id_start else 1
-        except (ValueError, TypeError):
-            auto_id_start_int = 1
-        
-        for index, row in df.iterrows():
-            try:
-                # Extract data from row - Updated for new column structure
-                csv_task_unique_id = row.get('Task Unique ID (Optional)', '')
-                sites_data = {}
-                
-                # Check if this row has any meaningful data
-                row_has_data = False
-                
-                # Let's also check the raw values directly from the dataframe
-                for flow_site in flow_template.sites.all():
-                    alias = flow_site.alias
-                    site_id_col = f"{alias} Site ID"
-                    global_id_col = f"{alias} Global ID"
-                    
-                    # Get values directly from dataframe
-                    raw_site_id = df.iloc[index][site_id_col]
-                    raw_global_id = df.iloc[index][global_id_col]
-                    
-                    # Get values from row object
-                    site_id = row.get(site_id_col, '')
-                    global_id = row.get(global_id_col, '')
-                    
-                    # Check if the column exists in the row
-                    if site_id_col not in row:
-                        # Try to find similar columns
-                        similar_cols = [col for col in row.keys() if 'site' in col.lower() and 'id' in col.lower()]
-                    
-                    # Check if either site_id or global_id has valid data
-                    if (site_id and site_id != '' and site_id != 'nan') or (global_id and global_id != '' and global_id != 'nan'):
-                        row_has_data = True
-                        break
-                
-                if not row_has_data:
-                    error_count += 1
-                    errors.append({
-                        'row': index + 1,
-                        'error': 'Row is completely empty - no valid site IDs or global IDs found'
-                    })
-                    continue
-                
-                # Process each site alias
-                for flow_site in flow_template.sites.all():
-                    alias = flow_site.alias
-                    site_id_col = f"{alias} Site ID"
-                    global_id_col = f"{alias} Global ID"
-                    site_name_col = f"{alias} Site Name"
-                    
-                    site_id = row.get(site_id_col, '')
-                    global_id = row.get(global_id_col, '')
-                    site_name = row.get(site_name_col, '')
-                    
-                    # Handle pandas NaN values
-                    if pd.isna(site_id) or site_id == 'nan':
-                        site_id = ''
-                    if pd.isna(global_id) or global_id == 'nan':
-                        global_id = ''
-                    
-                    # Use either site_id or global_id, prioritizing site_id if available
-                    identifier = site_id if site_id else global_id
-                    
-                    if identifier:
-                        # Try to find project site by ID or global ID
-                        project_site = None
-                        
-                        # First try by ProjectSite ID (if identifier is numeric)
-                        try:
-                            numeric_id = int(identifier)
-                            project_site = ProjectSite.objects.filter(
-                                id=numeric_id,
-                                project=project
-                            ).first()
-                                
-                        except ValueError:
-                            # If not numeric, try by site business ID (site_id) first, then global_id
-                            if site_id:  # Try business site_id first if available
-                                project_site = ProjectSite.objects.filter(
-                                    project=project,
-                                    site__site_id=site_id
-                                ).first()
-                            
-                            # If still not found and we have a global_id, try that
-                            if not project_site and global_id:
-                                project_site = ProjectSite.objects.filter(
-                                    project=project,
-                                    site__global_id=global_id
-                                ).first()
-                        
-                        if project_site:
-                            sites_data[alias] = project_site.id
-                
-                # Create site group
-                if sites_data:
-                    site_group = {
-                        'sites': sites_data,
-                        'task_name': task_name,  # Use task name from Step 1
-                        'client_task_id': csv_task_unique_id if csv_task_unique_id and csv_task_unique_id.strip() else None
-                    }
-                    
-                    # Create task using existing logic
-                    task_config = {
-                        'flow_template_id': str(flow_template.id),
-                        'project_id': project.id,
-                        'site_groups': [site_group],
-                        'task_naming': {
-                            'auto_id_prefix': auto_id_prefix,
-                            'auto_id_start': auto_id_start_int
-                        }
-                    }
-                    
-                    # Create task using the existing task creation logic
-                    try:
-                        # Create task using the same logic as CreateTaskFromFlowView
-                        task = CreateTaskFromFlowView()._create_task_from_site_group(
-                            flow_template, project, site_group, task_config['task_naming'], tenant, user
-                        )
-                        
-                        if task:
-                            success_count += 1
-                        else:
-                            error_count += 1
-                            errors.append({
-                                'row': index + 1,
-                                'error': 'Task creation returned None'
-                            })
-                            
-                    except Exception as task_error:
-                        error_count += 1
-                        errors.append({
-                            'row': index + 1,
-                            'error': f'Task creation failed: {str(task_error)}'
-                        })
-                else:
-                    error_count += 1
-                    errors.append({
-                        'row': index + 1,
-                        'error': 'No valid sites found for this row - all site IDs were empty, NaN, or invalid'
-                    })
-                    
-            except Exception as e:
-                error_count += 1
-                errors.append({
-                    'row': index + 1,
-                    'error': str(e)
-                })
-        
-        return {
-            'success_count': success_count,
-            'error_count': error_count,
-            'errors': errors
-        }
 
 
 class BulkTaskCreationJobStatusView(APIView):
@@ -2317,6 +1864,7 @@ class TaskTimelineViewSet(viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing task timeline events"""
     permission_classes = [IsAuthenticated, TenantScopedPermission]
     serializer_class = TaskTimelineSerializer
+    keyset_ordering = ('-timestamp', '-id')  # ?pagination=cursor
     
     def get_queryset(self):
         """Filter timeline events by tenant through task relationship"""
@@ -0,0 +1,37 @@
+"""
+Management command to rebuild the inverted permission index.
+
+Usage:
+    python manage.py rebuild_permission_index                 # All tenants
+    python manage.py rebuild_permission_index --tenant-id ID  # One tenant
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.tenants.models import Tenant
+from apps.tenants.services.permission_index_service import PermissionIndexService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the permission code -> user index used by permission search and analysis'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant-id',
+            type=str,
+            help='Only rebuild the index for a specific tenant',
+        )
+
+    def handle(self, *args, **options):
+        tenant_id = options.get('tenant_id')
+
+        tenants = Tenant.objects.all()
+        if tenant_id:
+            tenants = tenants.filter(id=tenant_id)
+            if not tenants.exists():
+                raise CommandError(f'Tenant {tenant_id} not found')
+
+        for tenant in tenants:
+            indexed = PermissionIndexService(tenant).rebuild()
+            self.stdout.write(f'{tenant.organization_name}: indexed {indexed} permissions')
+
+        self.stdout.write(self.style.SUCCESS('Permission index rebuilt'))
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.10 on 2026-10-16 20:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tenants", "0032_transfer_circle_vendor_data"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserPermissionIndex",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("permission_code", models.CharField(max_length=100)),
+                ("source", models.CharField(max_length=50)),
+                (
+                    "source_type",
+                    models.CharField(
+                        choices=[
+                            ("designation", "Designation"),
+                            ("group", "Permission Group"),
+                            ("override", "User Override"),
+                            ("administrator", "Administrator"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "permission_level",
+                    models.CharField(default="granted", max_length=20),
+                ),
+                ("scope_configuration", models.JSONField(blank=True, default=dict)),
+                ("indexed_at", models.DateTimeField(auto_now=True)),
+                (
+                    "tenant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="permission_index_entries",
+                        to="tenants.tenant",
+                    ),
+                ),
+                (
+                    "user_profile",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="permission_index_entries",
+                        to="tenants.tenantuserprofile",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "User Permission Index Entry",
+                "verbose_name_plural": "User Permission Index",
+                "db_table": "user_permission_index",
+                "indexes": [
+                    models.Index(
+                        fields=["tenant", "permission_code"],
+                        name="user_permis_tenant__0eafd5_idx",
+                    ),
+                    models.Index(
+                        fields=["tenant", "permission_code", "source_type"],
+                        name="user_permis_tenant__c614ac_idx",
+                    ),
+                ],
+                "unique_together": {("user_profile", "permission_code")},
+            },
+        ),
+    ]
@@ -2939,6 +2939,45 @@ class UserEffectivePermissionsCache(models.Model):
         return f"Cache for {self.user_profile.user.full_name}"
 
 
+class UserPermissionIndex(models.Model):
+    """Inverted index of effective permissions (permission code -> users) for "who has X" lookups"""
+
+    SOURCE_TYPE_CHOICES = [
+        ('designation', 'Designation'),
+        ('group', 'Permission Group'),
+        ('override', 'User Override'),
+        ('administrator', 'Administrator'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, related_name='permission_index_entries')
+    user_profile = models.ForeignKey(
+        'TenantUserProfile', on_delete=models.CASCADE, related_name='permission_index_entries'
+    )
+    permission_code = models.CharField(max_length=100)
+
+    # Winning source after conflict resolution
+    source = models.CharField(max_length=50)  # e.g. designation_12, group_3, user_override_7
+    source_type = models.CharField(max_length=20, choices=SOURCE_TYPE_CHOICES)
+    permission_level = models.CharField(max_length=20, default='granted')
+    scope_configuration = models.JSONField(default=dict, blank=True)
+
+    indexed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'user_permission_index'
+        verbose_name = _('User Permission Index Entry')
+        verbose_name_plural = _('User Permission Index')
+        unique_together = [('user_profile', 'permission_code')]
+        indexes = [
+            models.Index(fields=['tenant', 'permission_code']),
+            models.Index(fields=['tenant', 'permission_code', 'source_type']),
+        ]
+
+    def __str__(self):
+        return f"{self.permission_code} -> {self.user_profile_id} ({self.source})"
+
+
 # ============================================================================
 # Designation Management Models
 # ============================================================================
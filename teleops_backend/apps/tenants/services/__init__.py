@@ -12,6 +12,7 @@ from .dual_mode_vendor_service import DualModeVendorService
 # RBAC Services
 from .rbac_service import TenantRBACService, get_rbac_service, check_user_permission, get_user_permissions
 from .permission_management_service import PermissionManagementService, get_permission_management_service
+from .permission_index_service import PermissionIndexService, get_permission_index_service
 
 # Designation Management Services
 from .designation_service import (
@@ -35,6 +36,8 @@ __all__ = [
     'get_user_permissions',
     'PermissionManagementService',
     'get_permission_management_service',
+    'PermissionIndexService',
+    'get_permission_index_service',
     # Designation Management Services
     'DesignationService',
     'get_designation_service',
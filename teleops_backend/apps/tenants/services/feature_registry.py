@@ -3,8 +3,8 @@ Feature Registry Service
 Maps permissions to actual application functionality
 """
 
-from typing import Dict, List, Set
-from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
 from django.conf import settings
 from apps.tenants.constants import BUSINESS_TEMPLATE_ACTIONS
 
@@ -27,13 +27,112 @@ class PermissionMapping:
     action_type: str  # view, create, edit, delete, approve, etc.
     feature_ids: List[str]  # Which features this permission controls
 
+def build_resource_actions(permissions: Dict[str, Any]) -> Dict[str, List[str]]:
+    """
+    Collapse effective permissions into {resource_type: actions}.
+    
+    Actions come from each permission's business template. Templates are
+    nested (view_only < creator_only < contributor < full_access), so the union
+    per resource type grants exactly what the strongest single permission does.
+    """
+    resource_actions: Dict[str, Set[str]] = {}
+    for perm_data in permissions.values():
+        permission = perm_data.get('permission', {})
+        resource_type = permission.get('resource_type')
+        if not resource_type:
+            continue
+        actions = resource_actions.setdefault(resource_type, set())
+        actions.update(BUSINESS_TEMPLATE_ACTIONS.get(permission.get('business_template'), []))
+    # Lists keep the payload JSON-serialisable for the database cache tier
+    return {resource_type: sorted(actions) for resource_type, actions in resource_actions.items()}
+
+
+@dataclass
+class _EndpointNode:
+    """Path segment trie node used by EndpointRouter"""
+    children: Dict[str, '_EndpointNode'] = field(default_factory=dict)
+    id_child: Optional['_EndpointNode'] = None  # {id} placeholder - digits only
+    features: Tuple[FeatureDefinition, ...] = ()
+
+
+class EndpointRouter:
+    """
+    Feature endpoints compiled into a trie keyed by path segment.
+    
+    Matching walks the request path once, so lookup cost depends on the path
+    length rather than the number of registered endpoints. Each terminal node
+    holds the precomputed tuple of features mapped to that endpoint.
+    
+    Only {id} is a placeholder (it matches a numeric segment). Braces
+    anywhere else are dropped and the text between them is matched
+    literally, as the per-endpoint regex matching did.
+    """
+    
+    def __init__(self, features):
+        self._root = _EndpointNode()
+        for feature in features:
+            for endpoint in feature.api_endpoints:
+                node = self._root
+                for segment in endpoint.split('/'):
+                    node = self._child_for(node, segment)
+                if feature not in node.features:
+                    node.features = node.features + (feature,)
+    
+    @staticmethod
+    def _child_for(node: _EndpointNode, segment: str) -> _EndpointNode:
+        if segment == '{id}':
+            if node.id_child is None:
+                node.id_child = _EndpointNode()
+            return node.id_child
+        segment = segment.replace('{', '').replace('}', '')
+        child = node.children.get(segment)
+        if child is None:
+            child = node.children[segment] = _EndpointNode()
+        return child
+    
+    def match(self, path: str) -> Tuple[FeatureDefinition, ...]:
+        """Return the features mapped to a request path (empty tuple if none)."""
+        return self._match(self._root, path.split('/'), 0)
+    
+    def _match(self, node: _EndpointNode, segments: List[str], index: int) -> Tuple[FeatureDefinition, ...]:
+        # Literal segments are followed iteratively; the {id} branch only
+        # recurses where the registry actually defines one.
+        while index < len(segments):
+            segment = segments[index]
+            child = node.children.get(segment)
+            if node.id_child is None:
+                if child is None:
+                    return ()
+                node = child
+                index += 1
+                continue
+            
+            matched = ()
+            if child is not None:
+                matched = self._match(child, segments, index + 1)
+            if segment.isdigit():
+                matched = self._merge(matched, self._match(node.id_child, segments, index + 1))
+            return matched
+        return node.features
+    
+    @staticmethod
+    def _merge(first: Tuple, second: Tuple) -> Tuple:
+        if not first:
+            return second
+        if not second:
+            return first
+        return first + tuple(f for f in second if f not in first)
+
+
 class FeatureRegistry:
     """Registry of application features and their permission requirements"""
     
     def __init__(self):
         self._features: Dict[str, FeatureDefinition] = {}
         self._permission_mappings: Dict[str, PermissionMapping] = {}
+        self._endpoint_router: Optional[EndpointRouter] = None
         self._initialize_features()
+        self._endpoint_router = EndpointRouter(self._features.values())
     
     def _initialize_features(self):
         """Initialize all application features"""
@@ -523,6 +622,13 @@ class FeatureRegistry:
     def register_feature(self, feature: FeatureDefinition):
         """Register a new feature"""
         self._features[feature.feature_id] = feature
+        self._endpoint_router = None  # Recompiled on next lookup
+    
+    def get_features_for_endpoint(self, path: str) -> Tuple[FeatureDefinition, ...]:
+        """Get features mapped to an API path (supports {id} placeholders)"""
+        if self._endpoint_router is None:
+            self._endpoint_router = EndpointRouter(self._features.values())
+        return self._endpoint_router.match(path)
     
     def get_features_for_resource_type(self, resource_type: str) -> List[FeatureDefinition]:
         """Get all features for a specific resource type"""
@@ -533,7 +639,8 @@ class FeatureRegistry:
         Check if user has access to a resource type with specific actions
         
         Args:
-            user_permissions: Dict of user's permissions from RBAC service
+            user_permissions: Effective permissions payload from the RBAC service
+                (uses its precomputed 'resource_actions'), or its 'permissions' dict
             resource_type: The resource type to check (e.g., 'vendor', 'user', etc.)
             required_actions: List of actions needed (e.g., ['read', 'create'])
         
@@ -542,26 +649,17 @@ class FeatureRegistry:
         """
         if required_actions is None:
             required_actions = ["read"]  # Default to read access
-            
-        # Get all permissions for this resource type
-        from apps.tenants.models import PermissionRegistry
-        resource_permissions = PermissionRegistry.objects.filter(
-            resource_type=resource_type,
-            is_active=True
-        )
-        
-        # Check if user has any permission with required actions
-        for perm in resource_permissions:
-            perm_code = perm.permission_code
-            if perm_code in user_permissions:
-                # Get actions for this permission's business template
-                user_actions = BUSINESS_TEMPLATE_ACTIONS.get(perm.business_template, [])
-                
-                # Check if user's actions cover all required actions
-                if all(action in user_actions for action in required_actions):
-                    return True
-        
-        return False
+        
+        resource_actions = user_permissions.get('resource_actions')
+        if resource_actions is None:
+            resource_actions = build_resource_actions(user_permissions)
+        
+        user_actions = resource_actions.get(resource_type)
+        if user_actions is None:
+            return False
+        
+        # Check if user's actions cover all required actions
+        return all(action in user_actions for action in required_actions)
     
     def get_features_user_can_access(self, user_permissions: Dict, resource_type: str = None) -> List[FeatureDefinition]:
         """
@@ -580,6 +678,9 @@ class FeatureRegistry:
         if resource_type:
             features_to_check = self.get_features_for_resource_type(resource_type)
         
+        if 'resource_actions' not in user_permissions:
+            user_permissions = {'resource_actions': build_resource_actions(user_permissions)}
+        
         for feature in features_to_check:
             if self.user_has_resource_access(user_permissions, feature.resource_type, feature.required_actions):
                 accessible_features.append(feature)
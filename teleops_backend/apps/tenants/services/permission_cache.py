@@ -0,0 +1,305 @@
+"""
+Effective Permission Cache
+Two-tier cache (per-worker LRU + shared Django/Redis cache) for calculated
+effective permissions. The UserEffectivePermissionsCache table remains the
+cold fallback and is handled by TenantRBACService.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SETTINGS = {
+    'LOCAL_MAX_ENTRIES': 2048,  # Users kept in each worker's LRU
+    'LOCAL_TIMEOUT': 30,        # Seconds a worker trusts its own copy
+    'SHARED_TIMEOUT': 3600,     # Seconds entries live in Redis
+    'KEY_PREFIX': 'rbac_perms',
+}
+
+
+def get_cache_settings() -> Dict[str, Any]:
+    """Merge project overrides from settings.RBAC_PERMISSION_CACHE with defaults."""
+    return {**DEFAULT_CACHE_SETTINGS, **getattr(settings, 'RBAC_PERMISSION_CACHE', {})}
+
+
+class LocalLRUCache:
+    """
+    Thread-safe in-process LRU cache with a per-entry TTL.
+
+    Values are returned as stored (no copy), so callers must treat them as
+    read-only.
+    """
+
+    def __init__(self, max_entries: int = 1024, timeout: float = 30):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._data: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, timeout: Optional[float] = None):
+        expires_at = time.monotonic() + (self.timeout if timeout is None else timeout)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate):
+        """Drop every entry whose key matches predicate(key)."""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class EffectivePermissionCache:
+    """
+    Cache hierarchy for effective permissions.
+
+    Lookup order:
+    1. Per-worker LRU (no network I/O for the payload)
+    2. Shared Django cache (django_redis in production)
+
+    Misses fall through to the caller, which consults the database cache table
+    and finally recalculates.
+
+    Every entry is stamped with a (tenant_generation, user_generation) version.
+    The generations are monotonic counters kept in the shared cache and bumped
+    whenever an assignment that feeds a user's (or a whole tenant's) permissions
+    changes, so invalidation is a single INCR and an entry is only served while
+    its version still matches the current counters.
+    """
+
+    def __init__(self, local_cache: Optional[LocalLRUCache] = None, shared_cache=None):
+        config = get_cache_settings()
+        self.key_prefix = config['KEY_PREFIX']
+        self.shared_timeout = config['SHARED_TIMEOUT']
+        self.local = local_cache or LocalLRUCache(
+            max_entries=config['LOCAL_MAX_ENTRIES'],
+            timeout=config['LOCAL_TIMEOUT'],
+        )
+        self.shared = shared_cache if shared_cache is not None else cache
+
+    def _local_key(self, tenant_id, user_profile_id) -> tuple:
+        return (str(tenant_id), int(user_profile_id))
+
+    def _shared_key(self, tenant_id, user_profile_id) -> str:
+        return f"{self.key_prefix}:{tenant_id}:{user_profile_id}"
+
+    def _tenant_generation_key(self, tenant_id) -> str:
+        return f"{self.key_prefix}:gen:tenant:{tenant_id}"
+
+    def _user_generation_key(self, user_profile_id) -> str:
+        return f"{self.key_prefix}:gen:user:{user_profile_id}"
+
+    # === Generation Counters ===
+
+    def get_version(self, tenant_id, user_profile_id) -> Optional[Tuple[int, int]]:
+        """
+        Return the current (tenant_generation, user_generation) pair.
+
+        Returns None when the shared cache is unreachable, in which case the
+        in-memory tiers are bypassed.
+        """
+        tenant_key = self._tenant_generation_key(tenant_id)
+        user_key = self._user_generation_key(user_profile_id)
+        try:
+            values = self.shared.get_many([tenant_key, user_key])
+        except Exception as e:
+            logger.warning(f"Permission generation counters unavailable: {str(e)}")
+            return None
+        return (int(values.get(tenant_key, 0)), int(values.get(user_key, 0)))
+
+    def get_versions(self, tenant_id, user_profile_ids: Iterable[int]) -> Optional[Dict[int, Tuple[int, int]]]:
+        """Return current versions for many users of one tenant in a single round-trip."""
+        user_profile_ids = list(user_profile_ids)
+        tenant_key = self._tenant_generation_key(tenant_id)
+        user_keys = {user_profile_id: self._user_generation_key(user_profile_id) for user_profile_id in user_profile_ids}
+        try:
+            values = self.shared.get_many([tenant_key, *user_keys.values()])
+        except Exception as e:
+            logger.warning(f"Permission generation counters unavailable: {str(e)}")
+            return None
+        tenant_generation = int(values.get(tenant_key, 0))
+        return {
+            user_profile_id: (tenant_generation, int(values.get(user_key, 0)))
+            for user_profile_id, user_key in user_keys.items()
+        }
+
+    def get_tenant_generation(self, tenant_id) -> Optional[int]:
+        """Return the current tenant-wide generation, or None if unavailable."""
+        try:
+            return int(self.shared.get(self._tenant_generation_key(tenant_id), 0))
+        except Exception as e:
+            logger.warning(f"Permission generation counters unavailable: {str(e)}")
+            return None
+
+    def _bump(self, key: str) -> Optional[int]:
+        try:
+            try:
+                return self.shared.incr(key)
+            except ValueError:
+                # Counter not initialised yet (or evicted); add() loses
+                # gracefully to a concurrent initialiser.
+                if self.shared.add(key, 1, timeout=None):
+                    return 1
+                return self.shared.incr(key)
+        except Exception as e:
+            logger.warning(f"Failed to bump permission generation {key}: {str(e)}")
+            return None
+
+    def bump_user(self, user_profile_id, tenant_id=None) -> Optional[int]:
+        """Invalidate one user's cached permissions in every worker."""
+        if tenant_id is not None:
+            self.local.delete(self._local_key(tenant_id, user_profile_id))
+        else:
+            profile_key = int(user_profile_id)
+            self.local.delete_where(lambda key: key[1] == profile_key)
+        return self._bump(self._user_generation_key(user_profile_id))
+
+    def bump_tenant(self, tenant_id) -> Optional[int]:
+        """Invalidate every cached permission set in a tenant in every worker."""
+        self.delete_tenant_local(tenant_id)
+        return self._bump(self._tenant_generation_key(tenant_id))
+
+    # === Entries ===
+
+    def get(self, tenant_id, user_profile_id, version: Optional[Tuple[int, int]]) -> Optional[Dict[str, Any]]:
+        """Return cached permissions from the fastest tier holding a current entry."""
+        if version is None:
+            return None
+
+        local_key = self._local_key(tenant_id, user_profile_id)
+        entry = self.local.get(local_key)
+        if entry is not None:
+            if entry[0] == version:
+                return entry[1]
+            self.local.delete(local_key)
+
+        try:
+            entry = self.shared.get(self._shared_key(tenant_id, user_profile_id))
+        except Exception as e:
+            logger.warning(f"Shared permission cache unavailable: {str(e)}")
+            return None
+
+        if entry is None or tuple(entry[0]) != version:
+            return None
+
+        # Promote to the local tier so subsequent hits skip the payload fetch
+        self.local.set(local_key, (version, entry[1]))
+        return entry[1]
+
+    def set(self, tenant_id, user_profile_id, permissions: Dict[str, Any], version: Optional[Tuple[int, int]]):
+        """Store permissions in both tiers, stamped with the version they were built at."""
+        if version is None:
+            return
+        entry = (version, permissions)
+        self.local.set(self._local_key(tenant_id, user_profile_id), entry)
+        try:
+            self.shared.set(
+                self._shared_key(tenant_id, user_profile_id),
+                entry,
+                timeout=self.shared_timeout
+            )
+        except Exception as e:
+            logger.warning(f"Failed to write shared permission cache: {str(e)}")
+
+    def get_many(self, tenant_id, versions: Dict[int, Tuple[int, int]]) -> Dict[int, Dict[str, Any]]:
+        """Return {user_profile_id: permissions} for every user with a current entry."""
+        found = {}
+        missing = {}
+        for user_profile_id, version in versions.items():
+            entry = self.local.get(self._local_key(tenant_id, user_profile_id))
+            if entry is not None and entry[0] == version:
+                found[user_profile_id] = entry[1]
+            else:
+                missing[self._shared_key(tenant_id, user_profile_id)] = user_profile_id
+
+        if not missing:
+            return found
+
+        try:
+            entries = self.shared.get_many(list(missing))
+        except Exception as e:
+            logger.warning(f"Shared permission cache unavailable: {str(e)}")
+            return found
+
+        for shared_key, entry in entries.items():
+            user_profile_id = missing[shared_key]
+            version = versions[user_profile_id]
+            if tuple(entry[0]) == version:
+                self.local.set(self._local_key(tenant_id, user_profile_id), (version, entry[1]))
+                found[user_profile_id] = entry[1]
+        return found
+
+    def set_many(self, tenant_id, entries: Dict[int, Tuple[Dict[str, Any], Tuple[int, int]]]):
+        """Store {user_profile_id: (permissions, version)} in both tiers."""
+        shared_entries = {}
+        for user_profile_id, (permissions, version) in entries.items():
+            if version is None:
+                continue
+            entry = (version, permissions)
+            self.local.set(self._local_key(tenant_id, user_profile_id), entry)
+            shared_entries[self._shared_key(tenant_id, user_profile_id)] = entry
+        if not shared_entries:
+            return
+        try:
+            self.shared.set_many(shared_entries, timeout=self.shared_timeout)
+        except Exception as e:
+            logger.warning(f"Failed to write shared permission cache: {str(e)}")
+
+    def delete(self, tenant_id, user_profile_id):
+        """Remove a user's entry from both tiers."""
+        self.local.delete(self._local_key(tenant_id, user_profile_id))
+        try:
+            self.shared.delete(self._shared_key(tenant_id, user_profile_id))
+        except Exception as e:
+            logger.warning(f"Failed to delete shared permission cache entry: {str(e)}")
+
+    def delete_tenant_local(self, tenant_id):
+        """Drop all of a tenant's entries from this worker's LRU."""
+        tenant_key = str(tenant_id)
+        self.local.delete_where(lambda key: key[0] == tenant_key)
+
+
+_permission_cache: Optional[EffectivePermissionCache] = None
+_permission_cache_lock = threading.Lock()
+
+
+def get_permission_cache() -> EffectivePermissionCache:
+    """Get the process-wide effective permission cache."""
+    global _permission_cache
+    if _permission_cache is None:
+        with _permission_cache_lock:
+            if _permission_cache is None:
+                _permission_cache = EffectivePermissionCache()
+    return _permission_cache
@@ -0,0 +1,329 @@
+"""
+Permission Index Service
+Maintains the inverted permission index (permission code -> user profiles) used
+to answer "who has permission X" without recalculating every user's permissions.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from ..models import (
+    Tenant, TenantUserProfile, UserPermissionIndex, TenantDesignation, PermissionGroup,
+    UserDesignationAssignment, UserPermissionGroupAssignment, UserPermissionOverride
+)
+from .permission_cache import get_permission_cache
+from .rbac_service import get_rbac_service
+
+logger = logging.getLogger(__name__)
+
+SOURCE_TYPES = ('designation', 'group', 'override', 'administrator')
+
+# User-level grants whose effective_from/effective_to window changes the index
+# without any write (and so without any signal)
+WINDOWED_ASSIGNMENT_MODELS = (UserDesignationAssignment, UserPermissionGroupAssignment, UserPermissionOverride)
+
+
+def get_source_type(source: str) -> str:
+    """Map an effective permission source (e.g. 'group_3') to its index source type."""
+    if source == 'designation_admin':
+        return 'administrator'
+    if source.startswith('user_override'):
+        return 'override'
+    if source.startswith('group'):
+        return 'group'
+    return 'designation'
+
+
+class PermissionIndexService:
+    """
+    Read and maintain a tenant's UserPermissionIndex rows.
+
+    Rows are derived from the effective permissions calculated by
+    TenantRBACService, so conflict resolution and administrator handling are
+    identical to permission checks. A tenant without any rows is built lazily
+    on first read.
+    """
+
+    INSERT_BATCH_SIZE = 1000
+
+    def __init__(self, tenant: Tenant):
+        self.tenant = tenant
+
+    # === Maintenance ===
+
+    def rebuild(self) -> int:
+        """Re-index every user profile of the tenant."""
+        profiles = TenantUserProfile.objects.filter(tenant=self.tenant)
+        return self.reindex_users(profiles, replace_all=True)
+
+    def reindex_users(self, user_profiles: Iterable, replace_all: bool = False) -> int:
+        """
+        Recalculate and replace the index rows of the given profiles.
+
+        Accepts profile instances or ids; profiles outside the tenant are ignored.
+        """
+        profile_ids = [getattr(p, 'id', p) for p in user_profiles]
+        profiles = list(TenantUserProfile.objects.filter(tenant=self.tenant, id__in=profile_ids))
+
+        # Always calculate from the database: the generation bump that
+        # invalidates cache entries may not have landed yet.
+        effective_permissions = get_rbac_service(self.tenant).compute_effective_permissions_bulk(profiles)
+
+        rows = []
+        for profile_id, permissions in effective_permissions.items():
+            for permission_code, perm_data in permissions.get('permissions', {}).items():
+                source = perm_data.get('source', '')
+                rows.append(UserPermissionIndex(
+                    tenant=self.tenant,
+                    user_profile_id=profile_id,
+                    permission_code=permission_code,
+                    source=source,
+                    source_type=get_source_type(source),
+                    permission_level=perm_data.get('level') or 'granted',
+                    scope_configuration=perm_data.get('scope_configuration') or {},
+                ))
+
+        with transaction.atomic():
+            stale = UserPermissionIndex.objects.filter(tenant=self.tenant)
+            if not replace_all:
+                stale = stale.filter(user_profile_id__in=profile_ids)
+            stale.delete()
+            UserPermissionIndex.objects.bulk_create(rows, batch_size=self.INSERT_BATCH_SIZE)
+
+        logger.info(f"Indexed {len(rows)} permissions for {len(profiles)} users in tenant {self.tenant.id}")
+        return len(rows)
+
+    def ensure_built(self):
+        """Build the index for tenants that have never been indexed."""
+        if UserPermissionIndex.objects.filter(tenant=self.tenant).exists():
+            return
+        if TenantUserProfile.objects.filter(tenant=self.tenant).exists():
+            self.rebuild()
+
+    # === Lookups ===
+
+    def users_with_permission(self, permission_code: str, source_type: Optional[str] = None):
+        """Index rows of active users holding a permission, with user data joined."""
+        self.ensure_built()
+        queryset = UserPermissionIndex.objects.filter(
+            tenant=self.tenant,
+            permission_code=permission_code,
+            user_profile__is_active=True
+        )
+        if source_type:
+            queryset = queryset.filter(source_type=source_type)
+        return queryset.select_related('user_profile__user').order_by('user_profile_id')
+
+    def source_breakdown(self, permission_code: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """Return {permission_code: {source_type: user_count}} for active users."""
+        self.ensure_built()
+        queryset = UserPermissionIndex.objects.filter(tenant=self.tenant, user_profile__is_active=True)
+        if permission_code:
+            queryset = queryset.filter(permission_code=permission_code)
+
+        breakdown = defaultdict(lambda: dict.fromkeys(SOURCE_TYPES, 0))
+        for row in queryset.values('permission_code', 'source_type').annotate(users=Count('id')):
+            breakdown[row['permission_code']][row['source_type']] = row['users']
+        return dict(breakdown)
+
+    def permission_matrix(self) -> Dict[int, Dict[str, str]]:
+        """Return {user_profile_id: {permission_code: permission_level}} for active users."""
+        self.ensure_built()
+        matrix = defaultdict(dict)
+        for user_profile_id, permission_code, level in UserPermissionIndex.objects.filter(
+            tenant=self.tenant,
+            user_profile__is_active=True
+        ).values_list('user_profile_id', 'permission_code', 'permission_level'):
+            matrix[user_profile_id][permission_code] = level
+        return dict(matrix)
+
+
+def get_permission_index_service(tenant: Tenant) -> PermissionIndexService:
+    """Get permission index service instance for tenant."""
+    return PermissionIndexService(tenant)
+
+
+# ============================================================================
+# Incremental maintenance
+# ============================================================================
+# Signal handlers record the affected profiles and the index is refreshed once
+# the surrounding transaction commits. Pending work is keyed per thread and
+# drained by whichever commit callback runs first, so a burst of assignment
+# changes in one transaction is re-indexed in a single pass. A user's own
+# assignment changes are re-indexed inline; changes that fan out to every
+# holder of a designation or group are handed to a Celery task.
+
+_pending = threading.local()
+
+
+def _pending_reindex() -> Dict[Any, Optional[set]]:
+    if not hasattr(_pending, 'tenants'):
+        _pending.tenants = {}
+    return _pending.tenants
+
+
+def _pending_background_reindex() -> Dict[Any, Optional[set]]:
+    if not hasattr(_pending, 'background_tenants'):
+        _pending.background_tenants = {}
+    return _pending.background_tenants
+
+
+def _add_pending(pending: Dict[Any, Optional[set]], tenant_id, user_profile_ids: Optional[Iterable[int]]):
+    if user_profile_ids is None:
+        pending[tenant_id] = None
+    elif tenant_id not in pending or pending[tenant_id] is not None:
+        pending.setdefault(tenant_id, set()).update(user_profile_ids)
+
+
+def schedule_permission_reindex(tenant_id, user_profile_ids: Optional[Iterable[int]] = None, background: bool = False):
+    """
+    Re-index the given profiles (or the whole tenant when None) after commit.
+
+    With background=True the re-index runs in a Celery task instead of the
+    committing thread.
+    """
+    if tenant_id is None:
+        return
+    if background:
+        _add_pending(_pending_background_reindex(), tenant_id, user_profile_ids)
+        transaction.on_commit(flush_background_permission_reindex)
+    else:
+        _add_pending(_pending_reindex(), tenant_id, user_profile_ids)
+        transaction.on_commit(flush_permission_reindex)
+
+
+def flush_permission_reindex():
+    """Apply every pending re-index for this thread."""
+    pending = _pending_reindex()
+    while pending:
+        tenant_id, profile_ids = pending.popitem()
+        try:
+            tenant = Tenant.objects.get(id=tenant_id)
+            service = PermissionIndexService(tenant)
+            if profile_ids is None:
+                service.rebuild()
+            elif profile_ids:
+                service.reindex_users(profile_ids)
+        except Tenant.DoesNotExist:
+            continue
+        except Exception as e:
+            logger.error(f"Failed to update permission index for tenant {tenant_id}: {str(e)}")
+
+
+def flush_background_permission_reindex():
+    """Queue one Celery re-index per tenant for this thread's pending holder changes."""
+    from ..tasks import rebuild_tenant_permission_index, reindex_user_permissions
+
+    pending = _pending_background_reindex()
+    while pending:
+        tenant_id, profile_ids = pending.popitem()
+        try:
+            if profile_ids is None:
+                rebuild_tenant_permission_index.delay(str(tenant_id))
+            elif profile_ids:
+                reindex_user_permissions.delay(str(tenant_id), sorted(profile_ids))
+        except Exception as e:
+            logger.error(f"Failed to queue permission index update for tenant {tenant_id}: {str(e)}")
+
+
+def schedule_designation_holders_reindex(designation_id):
+    """Re-index everyone assigned to a designation (in a Celery task)."""
+    tenant_id = TenantDesignation.objects.filter(pk=designation_id).values_list('tenant_id', flat=True).first()
+    profile_ids = UserDesignationAssignment.objects.filter(
+        designation_id=designation_id
+    ).values_list('user_profile_id', flat=True)
+    schedule_permission_reindex(tenant_id, set(profile_ids), background=True)
+
+
+def schedule_group_members_reindex(group_id):
+    """Re-index every member of a permission group (in a Celery task)."""
+    tenant_id = PermissionGroup.objects.filter(pk=group_id).values_list('tenant_id', flat=True).first()
+    profile_ids = UserPermissionGroupAssignment.objects.filter(
+        group_id=group_id
+    ).values_list('user_profile_id', flat=True)
+    schedule_permission_reindex(tenant_id, set(profile_ids), background=True)
+
+
+def schedule_tenant_permission_rebuild(tenant_id):
+    """
+    Rebuild the whole tenant's index in a Celery task after commit, keeping
+    the full recalculation out of the request thread.
+    """
+    if tenant_id is None:
+        return
+    pending = _pending_rebuilds()
+    pending.add(tenant_id)
+    transaction.on_commit(flush_tenant_permission_rebuilds)
+
+
+def _pending_rebuilds() -> set:
+    if not hasattr(_pending, 'rebuilds'):
+        _pending.rebuilds = set()
+    return _pending.rebuilds
+
+
+def flush_tenant_permission_rebuilds():
+    """Queue one rebuild per tenant touched in this thread's transactions."""
+    from ..tasks import rebuild_tenant_permission_index
+
+    pending = _pending_rebuilds()
+    while pending:
+        tenant_id = pending.pop()
+        try:
+            rebuild_tenant_permission_index.delay(str(tenant_id))
+        except Exception as e:
+            logger.error(f"Failed to queue permission index rebuild for tenant {tenant_id}: {str(e)}")
+
+
+# ============================================================================
+# Time-window maintenance
+# ============================================================================
+# Assignments and overrides start and expire on their own; nothing is saved
+# when that happens, so a periodic task re-indexes the affected profiles.
+
+def _window_bounds(model, field_name, since, until):
+    if model._meta.get_field(field_name).get_internal_type() == 'DateField':
+        # Date windows turn over at midnight (local time, as DateField lookups convert)
+        return timezone.localdate(since), timezone.localdate(until)
+    return since, until
+
+
+def profiles_crossing_windows(since, until) -> Dict[Any, set]:
+    """{tenant_id: profile ids} with an assignment or override that started or ended in (since, until]"""
+    crossed = defaultdict(set)
+    for model in WINDOWED_ASSIGNMENT_MODELS:
+        from_lower, from_upper = _window_bounds(model, 'effective_from', since, until)
+        to_lower, to_upper = _window_bounds(model, 'effective_to', since, until)
+        rows = model.objects.filter(
+            Q(effective_from__gt=from_lower, effective_from__lte=from_upper)
+            | Q(effective_to__gt=to_lower, effective_to__lte=to_upper)
+        ).values_list('user_profile__tenant_id', 'user_profile_id').distinct()
+        for tenant_id, profile_id in rows:
+            crossed[tenant_id].add(profile_id)
+    return dict(crossed)
+
+
+def reindex_crossed_windows(since, until=None) -> int:
+    """Re-index (and expire cached permissions of) profiles whose windows crossed; returns the profile count"""
+    until = until or timezone.now()
+    reindexed = 0
+    for tenant_id, profile_ids in profiles_crossing_windows(since, until).items():
+        try:
+            tenant = Tenant.objects.get(id=tenant_id)
+            PermissionIndexService(tenant).reindex_users(profile_ids)
+        except Tenant.DoesNotExist:
+            continue
+        except Exception as e:
+            logger.error(f"Failed to re-index permission windows for tenant {tenant_id}: {str(e)}")
+            continue
+        cache = get_permission_cache()
+        for profile_id in profile_ids:
+            cache.bump_user(profile_id, tenant_id)
+        reindexed += len(profile_ids)
+    return reindexed
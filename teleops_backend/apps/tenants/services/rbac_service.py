@@ -5,19 +5,21 @@ Handles tenant-scoped permission management, calculation, and enforcement.
 
 import logging
 from typing import Dict, List, Optional, Set, Tuple, Any
+from collections import defaultdict
 from datetime import datetime, timedelta
 from django.utils import timezone
 from django.db import transaction
-from django.core.cache import cache
 from django.contrib.auth import get_user_model
-from django.db.models import Q, Prefetch
+from django.db.models import Q, Prefetch, BooleanField, ExpressionWrapper
 
 from ..models import (
     Tenant, TenantUserProfile, PermissionRegistry, DesignationBasePermission,
     UserPermissionOverride, PermissionGroup, PermissionGroupPermission,
     UserPermissionGroupAssignment, UserEffectivePermissionsCache,
-    PermissionAuditTrail, TenantDesignation
+    PermissionAuditTrail, TenantDesignation, UserDesignationAssignment
 )
+from .permission_cache import get_permission_cache
+from .feature_registry import build_resource_actions
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -38,6 +40,7 @@ class TenantRBACService:
         self.tenant = tenant
         self.cache_prefix = f"rbac_tenant_{tenant.id}"
         self.cache_timeout = 3600  # 1 hour default
+        self.permission_cache = get_permission_cache()
     
     def get_user_effective_permissions(
         self, 
@@ -54,21 +57,37 @@ class TenantRBACService:
             - scope_limitations: Combined scope restrictions
             - permission_summary: High-level summary of access levels
             - metadata: Calculation metadata (sources, conflicts, etc.)
+        
+        Lookup order is worker LRU -> Redis -> UserEffectivePermissionsCache
+        table -> full calculation. Every tier is validated against the current
+        tenant/user permission generation; when the generations cannot be read
+        every tier is skipped and the permissions are recalculated. The
+        returned dict may be shared with other requests in the same worker and
+        must not be mutated.
         """
-        cache_key = f"{self.cache_prefix}_user_perms_{user_profile.id}"
+        # Read the generation before calculating so a concurrent admin edit
+        # leaves the stored entry stale rather than silently current.
+        version = self.permission_cache.get_version(self.tenant.id, user_profile.id)
         
         # Check cache first unless forced refresh
         if not force_refresh:
-            cached_result = self._get_cached_permissions(user_profile)
+            cached_result = self.permission_cache.get(self.tenant.id, user_profile.id, version)
+            if cached_result is not None and 'resource_actions' in cached_result:
+                return cached_result
+            
+            # Cold fallback: persisted cache table
+            cached_result = self._get_cached_permissions(user_profile, version)
             if cached_result:
+                self.permission_cache.set(self.tenant.id, user_profile.id, cached_result, version)
                 return cached_result
         
         try:
             # Calculate effective permissions
-            effective_permissions = self._calculate_effective_permissions(user_profile)
+            effective_permissions = self._calculate_effective_permissions(user_profile, version)
             
-            # Cache the result
-            self._cache_permissions(user_profile, effective_permissions)
+            # Cache the result in every tier
+            self._cache_permissions(user_profile, effective_permissions, version)
+            self.permission_cache.set(self.tenant.id, user_profile.id, effective_permissions, version)
             
             # Log the permission calculation
             self._log_permission_calculation(user_profile, effective_permissions)
@@ -83,18 +102,36 @@ class TenantRBACService:
             # Return minimal permissions on error
             return self._get_minimal_permissions()
     
-    def _calculate_effective_permissions(self, user_profile: TenantUserProfile) -> Dict[str, Any]:
+    def _calculate_effective_permissions(
+        self,
+        user_profile: TenantUserProfile,
+        version: Optional[Tuple[int, int]] = None
+    ) -> Dict[str, Any]:
         """Calculate the effective permissions by combining all sources."""
+        cache_version = self._get_cache_version(version)
         
         # Check if user has Administrator designation - grant all permissions
         if self._is_administrator(user_profile):
-            return self._get_administrator_permissions()
+            return self._get_administrator_permissions(cache_version)
         
         # Get all permission sources
         designation_permissions = self._get_designation_permissions(user_profile)
         group_permissions = self._get_group_permissions(user_profile)
         user_overrides = self._get_user_overrides(user_profile)
         
+        return self._assemble_effective_permissions(
+            designation_permissions, group_permissions, user_overrides, cache_version
+        )
+    
+    def _assemble_effective_permissions(
+        self,
+        designation_permissions: Dict[str, Any],
+        group_permissions: Dict[str, Any],
+        user_overrides: Dict[str, Any],
+        cache_version: int
+    ) -> Dict[str, Any]:
+        """Combine already-loaded permission sources into the effective permission payload."""
+        
         # Combine permissions with conflict resolution
         combined_permissions = self._resolve_permission_conflicts(
             designation_permissions, group_permissions, user_overrides
@@ -117,16 +154,82 @@ class TenantRBACService:
                 'override_count': len(user_overrides)
             },
             'conflicts_resolved': getattr(self, '_conflicts_resolved', 0),
-            'cache_version': self._get_cache_version()
+            'cache_version': cache_version
         }
         
         return {
             'permissions': combined_permissions,
+            'resource_actions': build_resource_actions(combined_permissions),
             'scope_limitations': scope_limitations,
             'permission_summary': permission_summary,
             'metadata': metadata
         }
     
+    def _serialize_permission(self, permission: PermissionRegistry) -> Dict[str, Any]:
+        """Serialize a PermissionRegistry row for the effective permission payload."""
+        return {
+            'id': permission.id,
+            'code': permission.permission_code,
+            'name': permission.permission_name,
+            'description': getattr(permission, 'description', ''),
+            'category': getattr(permission, 'permission_category', None),
+            'risk_level': getattr(permission, 'risk_level', 'low'),
+            'permission_type': getattr(permission, 'permission_type', 'action'),
+            'is_system_permission': getattr(permission, 'is_system_permission', False),
+            'requires_mfa': getattr(permission, 'requires_mfa', False),
+            'is_active': getattr(permission, 'is_active', True),
+            'scope': getattr(permission, 'scope', 'global'),
+            'resource_type': permission.resource_type,
+            'business_template': permission.business_template
+        }
+    
+    def _designation_permission_entry(self, base_perm: DesignationBasePermission, designation_id: int) -> Dict[str, Any]:
+        """Build the permission entry contributed by a designation."""
+        return {
+            'permission': self._serialize_permission(base_perm.permission),
+            'level': base_perm.permission_level,
+            'source': f'designation_{designation_id}',
+            'scope_configuration': base_perm.scope_configuration,
+            'geographic_scope': base_perm.geographic_scope,
+            'functional_scope': base_perm.functional_scope,
+            'temporal_scope': base_perm.temporal_scope,
+            'is_mandatory': base_perm.is_mandatory,
+            'priority_level': base_perm.priority_level,
+            'conditions': base_perm.conditions,
+            'is_inherited': base_perm.is_inherited
+        }
+    
+    def _group_permission_entry(
+        self,
+        group_perm: PermissionGroupPermission,
+        assignment: UserPermissionGroupAssignment
+    ) -> Dict[str, Any]:
+        """Build the permission entry contributed by a permission group."""
+        return {
+            'permission': self._serialize_permission(group_perm.permission),
+            'level': group_perm.permission_level,
+            'source': f'group_{assignment.group_id}',
+            'scope_configuration': group_perm.scope_configuration,
+            'is_mandatory': group_perm.is_mandatory,
+            'scope_override': assignment.scope_override
+        }
+    
+    def _override_permission_entry(self, override: UserPermissionOverride) -> Dict[str, Any]:
+        """Build the permission entry contributed by a user override."""
+        return {
+            'permission': self._serialize_permission(override.permission),
+            'override_type': override.override_type,
+            'level': override.permission_level,
+            'source': f'user_override_{override.id}',
+            'scope_override': override.scope_override,
+            'geographic_scope_override': override.geographic_scope_override,
+            'functional_scope_override': override.functional_scope_override,
+            'temporal_scope_override': override.temporal_scope_override,
+            'conditions': override.conditions,
+            'requires_mfa': override.requires_mfa,
+            'business_justification': override.business_justification
+        }
+    
     def _get_designation_permissions(self, user_profile: TenantUserProfile) -> Dict[str, Any]:
         """Get permissions from user's designations."""
         designation_permissions = {}
@@ -139,7 +242,7 @@ class TenantRBACService:
             Q(effective_to__isnull=True) | Q(effective_to__gt=timezone.now())
         ).select_related('designation').prefetch_related(
             'designation__base_permissions__permission'
-        )
+        ).order_by('id')
         
         for assignment in current_assignments:
             designation = assignment.designation
@@ -149,39 +252,16 @@ class TenantRBACService:
                 is_active=True,
                 permission__is_active=True,
                 permission__tenant=self.tenant
-            ).select_related('permission')
+            ).select_related('permission').order_by('id')
             
             for base_perm in base_permissions:
-                permission = base_perm.permission
-                perm_code = permission.permission_code
+                perm_code = base_perm.permission.permission_code
                 
                 # Add permission if not already present or if this has higher priority
                 if perm_code not in designation_permissions:
-                    designation_permissions[perm_code] = {
-                        'permission': {
-                            'id': permission.id,
-                            'code': permission.permission_code,
-                            'name': permission.permission_name,
-                            'description': getattr(permission, 'description', ''),
-                            'category': getattr(permission, 'permission_category', None),
-                            'risk_level': getattr(permission, 'risk_level', 'low'),
-                            'permission_type': getattr(permission, 'permission_type', 'action'),
-                            'is_system_permission': getattr(permission, 'is_system_permission', False),
-                            'requires_mfa': getattr(permission, 'requires_mfa', False),
-                            'is_active': getattr(permission, 'is_active', True),
-                            'scope': getattr(permission, 'scope', 'global')
-                        },
-                        'level': base_perm.permission_level,
-                        'source': f'designation_{designation.id}',
-                        'scope_configuration': base_perm.scope_configuration,
-                        'geographic_scope': base_perm.geographic_scope,
-                        'functional_scope': base_perm.functional_scope,
-                        'temporal_scope': base_perm.temporal_scope,
-                        'is_mandatory': base_perm.is_mandatory,
-                        'priority_level': base_perm.priority_level,
-                        'conditions': base_perm.conditions,
-                        'is_inherited': base_perm.is_inherited
-                    }
+                    designation_permissions[perm_code] = self._designation_permission_entry(
+                        base_perm, designation.id
+                    )
         
         return designation_permissions
     
@@ -197,7 +277,7 @@ class TenantRBACService:
             Q(effective_to__isnull=True) | Q(effective_to__gt=timezone.now())
         ).select_related('group').prefetch_related(
             'group__group_permissions__permission'
-        )
+        ).order_by('id')
         
         for assignment in group_assignments:
             group = assignment.group
@@ -207,34 +287,14 @@ class TenantRBACService:
                 is_active=True,
                 permission__is_active=True,
                 permission__tenant=self.tenant
-            ).select_related('permission')
+            ).select_related('permission').order_by('id')
             
             for group_perm in group_perms:
-                permission = group_perm.permission
-                perm_code = permission.permission_code
+                perm_code = group_perm.permission.permission_code
                 
                 # Add or update permission from group
                 if perm_code not in group_permissions or group_perm.is_mandatory:
-                    group_permissions[perm_code] = {
-                        'permission': {
-                            'id': permission.id,
-                            'code': permission.permission_code,
-                            'name': permission.permission_name,
-                            'description': getattr(permission, 'description', ''),
-                            'category': getattr(permission, 'permission_category', None),
-                            'risk_level': getattr(permission, 'risk_level', 'low'),
-                            'permission_type': getattr(permission, 'permission_type', 'action'),
-                            'is_system_permission': getattr(permission, 'is_system_permission', False),
-                            'requires_mfa': getattr(permission, 'requires_mfa', False),
-                            'is_active': getattr(permission, 'is_active', True),
-                            'scope': getattr(permission, 'scope', 'global')
-                        },
-                        'level': group_perm.permission_level,
-                        'source': f'group_{group.id}',
-                        'scope_configuration': group_perm.scope_configuration,
-                        'is_mandatory': group_perm.is_mandatory,
-                        'scope_override': assignment.scope_override
-                    }
+                    group_permissions[perm_code] = self._group_permission_entry(group_perm, assignment)
         
         return group_permissions
     
@@ -252,34 +312,7 @@ class TenantRBACService:
         ).select_related('permission')
         
         for override in overrides:
-            permission = override.permission
-            perm_code = permission.permission_code
-            
-            user_overrides[perm_code] = {
-                'permission': {
-                    'id': permission.id,
-                    'code': permission.permission_code,
-                    'name': permission.permission_name,
-                    'description': getattr(permission, 'description', ''),
-                    'category': getattr(permission, 'permission_category', None),
-                    'risk_level': getattr(permission, 'risk_level', 'low'),
-                    'permission_type': getattr(permission, 'permission_type', 'action'),
-                    'is_system_permission': getattr(permission, 'is_system_permission', False),
-                    'requires_mfa': getattr(permission, 'requires_mfa', False),
-                    'is_active': getattr(permission, 'is_active', True),
-                    'scope': getattr(permission, 'scope', 'global')
-                },
-                'override_type': override.override_type,
-                'level': override.permission_level,
-                'source': f'user_override_{override.id}',
-                'scope_override': override.scope_override,
-                'geographic_scope_override': override.geographic_scope_override,
-                'functional_scope_override': override.functional_scope_override,
-                'temporal_scope_override': override.temporal_scope_override,
-                'conditions': override.conditions,
-                'requires_mfa': override.requires_mfa,
-                'business_justification': override.business_justification
-            }
+            user_overrides[override.permission.permission_code] = self._override_permission_entry(override)
         
         return user_overrides
     
@@ -450,19 +483,33 @@ class TenantRBACService:
         
         return summary
     
-    def _get_cached_permissions(self, user_profile: TenantUserProfile) -> Optional[Dict[str, Any]]:
-        """Get cached permissions if valid."""
+    def _get_cached_permissions(
+        self,
+        user_profile: TenantUserProfile,
+        version: Optional[Tuple[int, int]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get cached permissions if valid for the given generation.
+        
+        Without a generation nothing can prove a row current (it may predate
+        a revocation), so None is returned.
+        """
+        if version is None:
+            return None
         try:
             cached_data = UserEffectivePermissionsCache.objects.filter(
                 user_profile=user_profile,
-                is_valid=True
+                is_valid=True,
+                cache_version=version[0],
+                designation_version=version[1]
             ).filter(
                 Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now())
             ).first()
             
-            if cached_data:
+            if cached_data and self._has_resource_metadata(cached_data.effective_permissions):
                 return {
                     'permissions': cached_data.effective_permissions,
+                    'resource_actions': build_resource_actions(cached_data.effective_permissions),
                     'scope_limitations': cached_data.scope_limitations,
                     'permission_summary': cached_data.permission_summary,
                     'metadata': {
@@ -476,32 +523,92 @@ class TenantRBACService:
         
         return None
     
-    def _cache_permissions(self, user_profile: TenantUserProfile, permissions: Dict[str, Any]):
-        """Cache the calculated permissions."""
-        try:
-            # Invalidate existing cache
-            UserEffectivePermissionsCache.objects.filter(
-                user_profile=user_profile
-            ).update(is_valid=False)
+    def _has_resource_metadata(self, permissions: Dict[str, Any]) -> bool:
+        """Rows written before permissions carried resource_type must be recalculated."""
+        return all('resource_type' in perm_data.get('permission', {}) for perm_data in permissions.values())
+    
+    # Fields refreshed when an existing cache row is upserted
+    CACHE_UPSERT_FIELDS = [
+        'effective_permissions', 'permission_summary', 'scope_limitations',
+        'cache_version', 'calculated_at', 'expires_at',
+        'designation_version', 'override_version', 'is_valid',
+    ]
+    
+    def _build_cache_entry(
+        self,
+        user_profile_id: int,
+        permissions: Dict[str, Any],
+        version: Optional[Tuple[int, int]],
+        calculated_at: datetime
+    ) -> UserEffectivePermissionsCache:
+        """
+        Build an unsaved cache row.
+        
+        cache_version stores the tenant generation; designation_version and
+        override_version both store the user generation, which is bumped by
+        designation, group and override assignment changes alike.
+        """
+        tenant_generation, user_generation = version if version is not None else (0, None)
+        return UserEffectivePermissionsCache(
+            user_profile_id=user_profile_id,
+            effective_permissions=permissions['permissions'],
+            permission_summary=permissions['permission_summary'],
+            scope_limitations=permissions['scope_limitations'],
+            cache_version=tenant_generation,
+            calculated_at=calculated_at,
+            expires_at=calculated_at + timedelta(seconds=self.cache_timeout),
+            designation_version=user_generation,
+            override_version=user_generation,
+            is_valid=True
+        )
+    
+    def _cache_permissions(
+        self,
+        user_profile: TenantUserProfile,
+        permissions: Dict[str, Any],
+        version: Optional[Tuple[int, int]] = None
+    ):
+        """Cache the calculated permissions with a single upsert."""
+        self._cache_permissions_bulk([(user_profile.id, permissions, version)])
+    
+    def _cache_permissions_bulk(
+        self,
+        entries: List[Tuple[int, Dict[str, Any], Optional[Tuple[int, int]]]],
+        batch_size: int = 500
+    ) -> int:
+        """
+        Persist many users' permissions as INSERT ... ON CONFLICT DO UPDATE.
+        
+        Args:
+            entries: (user_profile_id, permissions, version) tuples
+            batch_size: Rows per statement
             
-            # Create new cache entry
-            cache_entry = UserEffectivePermissionsCache.objects.create(
-                user_profile=user_profile,
-                effective_permissions=permissions['permissions'],
-                permission_summary=permissions['permission_summary'],
-                scope_limitations=permissions['scope_limitations'],
-                cache_version=self._get_cache_version(),
-                calculated_at=timezone.now(),
-                expires_at=timezone.now() + timedelta(seconds=self.cache_timeout),
-                designation_version=self._get_designation_version(user_profile),
-                override_version=self._get_override_version(user_profile),
-                is_valid=True
+        Returns:
+            Number of rows written
+        """
+        if not entries:
+            return 0
+        
+        calculated_at = timezone.now()
+        cache_rows = [
+            self._build_cache_entry(user_profile_id, permissions, version, calculated_at)
+            for user_profile_id, permissions, version in entries
+        ]
+        
+        try:
+            UserEffectivePermissionsCache.objects.bulk_create(
+                cache_rows,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=['user_profile'],
+                update_fields=self.CACHE_UPSERT_FIELDS
             )
-            
-            logger.info(f"Cached permissions for user {user_profile.user.id}")
+            logger.debug(f"Cached permissions for {len(cache_rows)} user profile(s) in tenant {self.tenant.id}")
+            return len(cache_rows)
             
         except Exception as e:
             logger.error(f"Error caching permissions: {str(e)}")
+            return 0
     
     def _log_permission_calculation(self, user_profile: TenantUserProfile, permissions: Dict[str, Any]):
         """Log permission calculation for audit trail."""
@@ -523,40 +630,17 @@ class TenantRBACService:
         except Exception as e:
             logger.error(f"Error logging permission calculation: {str(e)}")
     
-    def _get_cache_version(self) -> int:
-        """Get current cache version for invalidation."""
-        return int(timezone.now().timestamp())
-    
-    def _get_designation_version(self, user_profile: TenantUserProfile) -> Optional[int]:
-        """Get version of user's designation assignments."""
-        try:
-            latest_assignment = user_profile.designation_assignments.filter(
-                is_active=True
-            ).order_by('-updated_at').first()
-            
-            if latest_assignment:
-                return int(latest_assignment.updated_at.timestamp())
-        except Exception:
-            pass
-        return None
-    
-    def _get_override_version(self, user_profile: TenantUserProfile) -> Optional[int]:
-        """Get version of user's permission overrides."""
-        try:
-            latest_override = user_profile.permission_overrides.filter(
-                is_active=True
-            ).order_by('-updated_at').first()
-            
-            if latest_override:
-                return int(latest_override.updated_at.timestamp())
-        except Exception:
-            pass
-        return None
+    def _get_cache_version(self, version: Optional[Tuple[int, int]] = None) -> int:
+        """Get the tenant permission generation used to stamp calculations."""
+        if version is not None:
+            return version[0]
+        return self.permission_cache.get_tenant_generation(self.tenant.id) or 0
     
     def _get_minimal_permissions(self) -> Dict[str, Any]:
         """Return minimal permissions for error cases."""
         return {
             'permissions': {},
+            'resource_actions': {},
             'scope_limitations': {
                 'geographic_scope': [],
                 'functional_scope': [],
@@ -591,15 +675,20 @@ class TenantRBACService:
         
         return admin_designations
 
-    def _get_administrator_permissions(self) -> Dict[str, Any]:
+    def _get_administrator_permissions(
+        self,
+        cache_version: Optional[int] = None,
+        all_tenant_permissions: Optional[List[PermissionRegistry]] = None
+    ) -> Dict[str, Any]:
         """Return all permissions for an administrator."""
         all_permissions = {}
         
         # Get all permissions from the tenant's permission registry
-        all_tenant_permissions = PermissionRegistry.objects.filter(
-            tenant=self.tenant,
-            is_active=True
-        )
+        if all_tenant_permissions is None:
+            all_tenant_permissions = PermissionRegistry.objects.filter(
+                tenant=self.tenant,
+                is_active=True
+            )
         
         for permission in all_tenant_permissions:
             perm_code = permission.permission_code
@@ -614,7 +703,9 @@ class TenantRBACService:
                     'risk_level': getattr(permission, 'risk_level', 'low'),
                     'requires_mfa': getattr(permission, 'requires_mfa', False),
                     'is_active': getattr(permission, 'is_active', True),
-                    'scope': getattr(permission, 'scope', 'global')
+                    'scope': getattr(permission, 'scope', 'global'),
+                    'resource_type': permission.resource_type,
+                    'business_template': permission.business_template
                 },
                 'level': 'granted',
                 'source': 'designation_admin',  # Changed from source_type for consistency
@@ -630,6 +721,7 @@ class TenantRBACService:
         
         return {
             'permissions': all_permissions,
+            'resource_actions': build_resource_actions(all_permissions),
             'scope_limitations': {},
             'permission_summary': {
                 'total_permissions': len(all_permissions),
@@ -647,18 +739,218 @@ class TenantRBACService:
                     'override_count': 0
                 },
                 'conflicts_resolved': 0,
-                'cache_version': self._get_cache_version(),
+                'cache_version': cache_version if cache_version is not None else self._get_cache_version(),
                 'administrator_bypass': True
             }
         }
     
+    # === Bulk Calculation ===
+    
+    BULK_CHUNK_SIZE = 2000
+    
+    def get_effective_permissions_bulk(
+        self,
+        user_profiles,
+        force_refresh: bool = False
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Get effective permissions for many users of this tenant.
+        
+        Current cache entries are served from the LRU/Redis tiers; only the
+        misses are calculated, together, by compute_effective_permissions_bulk.
+        
+        Returns:
+            Dict of user_profile_id -> effective permissions
+        """
+        user_profiles = list(user_profiles)
+        if not user_profiles:
+            return {}
+        
+        versions = self.permission_cache.get_versions(self.tenant.id, [p.id for p in user_profiles])
+        results = {}
+        if not force_refresh and versions is not None:
+            results = {
+                profile_id: permissions
+                for profile_id, permissions in self.permission_cache.get_many(self.tenant.id, versions).items()
+                if 'resource_actions' in permissions
+            }
+        
+        missing_profiles = [p for p in user_profiles if p.id not in results]
+        if missing_profiles:
+            results.update(self.compute_effective_permissions_bulk(missing_profiles, versions=versions))
+        return results
+    
+    def compute_effective_permissions_bulk(
+        self,
+        user_profiles,
+        persist: bool = True,
+        versions: Optional[Dict[int, Tuple[int, int]]] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Calculate effective permissions for many users in a fixed number of queries.
+        
+        Loads designation assignments, designation base permissions, group
+        assignments, group permissions and overrides for every profile at once
+        (per chunk of BULK_CHUNK_SIZE profiles) and resolves conflicts in memory
+        with the same rules as get_user_effective_permissions.
+        
+        Args:
+            user_profiles: TenantUserProfile instances (or queryset) of this tenant
+            persist: Write the results to every cache tier
+            versions: Pre-fetched generations per profile id
+            
+        Returns:
+            Dict of user_profile_id -> effective permissions
+        """
+        profile_ids = [p.id for p in user_profiles]
+        if not profile_ids:
+            return {}
+        
+        if versions is None:
+            versions = self.permission_cache.get_versions(self.tenant.id, profile_ids)
+        
+        results = {}
+        admin_registry = None
+        for start in range(0, len(profile_ids), self.BULK_CHUNK_SIZE):
+            chunk_ids = profile_ids[start:start + self.BULK_CHUNK_SIZE]
+            chunk_results, admin_registry = self._compute_effective_permissions_chunk(
+                chunk_ids, versions, admin_registry
+            )
+            results.update(chunk_results)
+        
+        if persist:
+            entries = [
+                (profile_id, permissions, versions.get(profile_id) if versions else None)
+                for profile_id, permissions in results.items()
+            ]
+            self._cache_permissions_bulk(entries)
+            if versions is not None:
+                self.permission_cache.set_many(self.tenant.id, {
+                    profile_id: (permissions, versions.get(profile_id))
+                    for profile_id, permissions in results.items()
+                })
+        
+        logger.info(f"Bulk calculated permissions for {len(results)} users in tenant {self.tenant.id}")
+        return results
+    
+    def _compute_effective_permissions_chunk(
+        self,
+        profile_ids: List[int],
+        versions: Optional[Dict[int, Tuple[int, int]]],
+        admin_registry: Optional[List[PermissionRegistry]] = None
+    ) -> Tuple[Dict[int, Dict[str, Any]], Optional[List[PermissionRegistry]]]:
+        """Calculate one chunk of profiles; returns results and the (lazily loaded) admin registry."""
+        now = timezone.now()
+        effective_q = Q(effective_from__lte=now) & (Q(effective_to__isnull=True) | Q(effective_to__gt=now))
+        
+        # Query 1: active designation assignments (admin check uses all active,
+        # permission inheritance only the currently effective ones)
+        designation_assignments = UserDesignationAssignment.objects.filter(
+            user_profile_id__in=profile_ids,
+            is_active=True
+        ).annotate(
+            is_effective=ExpressionWrapper(effective_q, output_field=BooleanField())
+        ).select_related('designation').order_by('id')
+        
+        admin_profile_ids = set()
+        designations_by_profile = defaultdict(list)
+        for assignment in designation_assignments:
+            designation = assignment.designation
+            if ('admin' in (designation.designation_code or '').lower()
+                    or 'administrator' in (designation.designation_name or '').lower()):
+                admin_profile_ids.add(assignment.user_profile_id)
+            if assignment.is_effective:
+                designations_by_profile[assignment.user_profile_id].append(designation.id)
+        
+        # Query 2: base permissions for every effective designation
+        base_permissions_by_designation = defaultdict(list)
+        designation_ids = {d for ids in designations_by_profile.values() for d in ids}
+        if designation_ids:
+            for base_perm in DesignationBasePermission.objects.filter(
+                designation_id__in=designation_ids,
+                is_active=True,
+                permission__is_active=True,
+                permission__tenant=self.tenant
+            ).select_related('permission').order_by('id'):
+                base_permissions_by_designation[base_perm.designation_id].append(base_perm)
+        
+        # Query 3: currently effective group assignments
+        group_assignments_by_profile = defaultdict(list)
+        for assignment in UserPermissionGroupAssignment.objects.filter(
+            user_profile_id__in=profile_ids,
+            is_active=True
+        ).filter(effective_q).order_by('id'):
+            group_assignments_by_profile[assignment.user_profile_id].append(assignment)
+        
+        # Query 4: permissions for every assigned group
+        group_permissions_by_group = defaultdict(list)
+        group_ids = {a.group_id for assignments in group_assignments_by_profile.values() for a in assignments}
+        if group_ids:
+            for group_perm in PermissionGroupPermission.objects.filter(
+                group_id__in=group_ids,
+                is_active=True,
+                permission__is_active=True,
+                permission__tenant=self.tenant
+            ).select_related('permission').order_by('id'):
+                group_permissions_by_group[group_perm.group_id].append(group_perm)
+        
+        # Query 5: approved, currently effective overrides
+        overrides_by_profile = defaultdict(list)
+        for override in UserPermissionOverride.objects.filter(
+            user_profile_id__in=profile_ids,
+            is_active=True,
+            approval_status='approved'
+        ).filter(effective_q).select_related('permission'):
+            overrides_by_profile[override.user_profile_id].append(override)
+        
+        # Query 6 (only when needed): full registry for administrators
+        if admin_profile_ids and admin_registry is None:
+            admin_registry = list(PermissionRegistry.objects.filter(tenant=self.tenant, is_active=True))
+        
+        results = {}
+        for profile_id in profile_ids:
+            version = versions.get(profile_id) if versions else None
+            cache_version = version[0] if version is not None else 0
+            
+            if profile_id in admin_profile_ids:
+                results[profile_id] = self._get_administrator_permissions(cache_version, admin_registry)
+                continue
+            
+            designation_permissions = {}
+            for designation_id in designations_by_profile.get(profile_id, []):
+                for base_perm in base_permissions_by_designation.get(designation_id, []):
+                    perm_code = base_perm.permission.permission_code
+                    if perm_code not in designation_permissions:
+                        designation_permissions[perm_code] = self._designation_permission_entry(
+                            base_perm, designation_id
+                        )
+            
+            group_permissions = {}
+            for assignment in group_assignments_by_profile.get(profile_id, []):
+                for group_perm in group_permissions_by_group.get(assignment.group_id, []):
+                    perm_code = group_perm.permission.permission_code
+                    if perm_code not in group_permissions or group_perm.is_mandatory:
+                        group_permissions[perm_code] = self._group_permission_entry(group_perm, assignment)
+            
+            user_overrides = {
+                override.permission.permission_code: self._override_permission_entry(override)
+                for override in overrides_by_profile.get(profile_id, [])
+            }
+            
+            results[profile_id] = self._assemble_effective_permissions(
+                designation_permissions, group_permissions, user_overrides, cache_version
+            )
+        
+        return results, admin_registry
+    
     # === Permission Checking Methods ===
     
     def check_permission(
         self, 
         user_profile: TenantUserProfile, 
         permission_code: str,
-        scope_context: Optional[Dict] = None
+        scope_context: Optional[Dict] = None,
+        effective_permissions: Optional[Dict[str, Any]] = None
     ) -> Tuple[bool, Dict[str, Any]]:
         """
         Check if user has a specific permission with optional scope context.
@@ -667,12 +959,14 @@ class TenantRBACService:
             user_profile: The user to check
             permission_code: Permission code to check
             scope_context: Optional context for scope validation
+            effective_permissions: Already loaded permissions for user_profile
             
         Returns:
             Tuple of (has_permission, permission_details)
         """
         try:
-            effective_permissions = self.get_user_effective_permissions(user_profile)
+            if effective_permissions is None:
+                effective_permissions = self.get_user_effective_permissions(user_profile)
             permissions = effective_permissions['permissions']
             
             if permission_code not in permissions:
@@ -796,9 +1090,8 @@ class TenantRBACService:
                 user_profile=user_profile
             ).update(is_valid=False)
             
-            # Also clear any Redis cache entries
-            cache_key = f"{self.cache_prefix}_user_perms_{user_profile.id}"
-            cache.delete(cache_key)
+            # Bump the user's generation so every worker drops its copy
+            self.permission_cache.bump_user(user_profile.id, self.tenant.id)
             
             logger.info(f"Invalidated permissions cache for user {user_profile.user.id}")
             
@@ -812,9 +1105,8 @@ class TenantRBACService:
                 user_profile__tenant=self.tenant
             ).update(is_valid=False)
             
-            # Clear Redis cache patterns
-            cache_pattern = f"{self.cache_prefix}_*"
-            # Note: This requires Redis-specific implementation
+            # Bump the tenant generation; stale entries are rejected on read
+            self.permission_cache.bump_tenant(self.tenant.id)
             
             logger.info(f"Invalidated all permissions cache for tenant {self.tenant.id}")
             
@@ -826,15 +1118,11 @@ class TenantRBACService:
         try:
             if user_profile:
                 # Clear cache for specific user
-                UserEffectivePermissionsCache.objects.filter(
-                    user_profile=user_profile
-                ).update(is_valid=False)
+                self.invalidate_user_permissions(user_profile)
                 logger.info(f"Cleared permission cache for user {user_profile.user.id}")
             else:
                 # Clear cache for all users in tenant
-                UserEffectivePermissionsCache.objects.filter(
-                    user_profile__tenant=self.tenant
-                ).update(is_valid=False)
+                self.invalidate_tenant_permissions()
                 logger.info(f"Cleared permission cache for all users in tenant {self.tenant.id}")
         except Exception as e:
             logger.error(f"Error clearing permission cache: {str(e)}")
@@ -0,0 +1,97 @@
+"""
+Tenant Resolution Cache
+Per-worker LRU of active tenants keyed by id and subdomain, shared by
+TenantMiddleware and the tenant-scoped JWT authentication classes.
+"""
+
+import copy
+import logging
+import threading
+import uuid
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+
+from ..models import Tenant
+from .permission_cache import LocalLRUCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TENANT_CACHE_SETTINGS = {
+    'MAX_ENTRIES': 1024,
+    'TIMEOUT': 5,  # Seconds - bounds how long other workers serve a suspended tenant
+}
+
+# Marks ids/subdomains known not to resolve to an active tenant
+_NOT_FOUND = object()
+
+
+def get_tenant_cache_settings() -> Dict[str, Any]:
+    """Merge project overrides from settings.TENANT_RESOLUTION_CACHE with defaults."""
+    return {**DEFAULT_TENANT_CACHE_SETTINGS, **getattr(settings, 'TENANT_RESOLUTION_CACHE', {})}
+
+
+class TenantResolutionCache:
+    """
+    Resolve active tenants without a database round-trip per lookup.
+
+    Only active tenants are returned; misses are cached as well so repeated
+    lookups of an unknown id stay cheap. A Tenant save/delete clears this
+    worker's cache through a signal, other workers pick the change up once
+    their entries expire (TIMEOUT seconds).
+
+    Callers get a copy of the cached instance, so mutating request.tenant
+    never leaks into other requests.
+    """
+
+    def __init__(self, local_cache: Optional[LocalLRUCache] = None):
+        config = get_tenant_cache_settings()
+        self.local = local_cache or LocalLRUCache(
+            max_entries=config['MAX_ENTRIES'],
+            timeout=config['TIMEOUT'],
+        )
+
+    def get_by_id(self, tenant_id) -> Optional[Tenant]:
+        """
+        Return the active tenant with this id, or None.
+
+        Raises:
+            ValueError: tenant_id is not a valid UUID
+        """
+        tenant_uuid = tenant_id if isinstance(tenant_id, uuid.UUID) else uuid.UUID(str(tenant_id))
+        return self._resolve(('id', tenant_uuid), id=tenant_uuid)
+
+    def get_by_subdomain(self, subdomain: str) -> Optional[Tenant]:
+        """Return the active tenant using this subdomain, or None."""
+        return self._resolve(('subdomain', subdomain), subdomain=subdomain)
+
+    def _resolve(self, key, **lookup) -> Optional[Tenant]:
+        tenant = self.local.get(key)
+        if tenant is None:
+            try:
+                tenant = Tenant.objects.select_related('circle').get(is_active=True, **lookup)
+            except Tenant.DoesNotExist:
+                tenant = _NOT_FOUND
+            self.local.set(key, tenant)
+
+        if tenant is _NOT_FOUND:
+            return None
+        return copy.copy(tenant)
+
+    def invalidate(self):
+        """Drop every cached tenant in this worker."""
+        self.local.clear()
+
+
+_tenant_cache: Optional[TenantResolutionCache] = None
+_tenant_cache_lock = threading.Lock()
+
+
+def get_tenant_cache() -> TenantResolutionCache:
+    """Get the process-wide tenant resolution cache."""
+    global _tenant_cache
+    if _tenant_cache is None:
+        with _tenant_cache_lock:
+            if _tenant_cache is None:
+                _tenant_cache = TenantResolutionCache()
+    return _tenant_cache
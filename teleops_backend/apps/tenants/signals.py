@@ -2,11 +2,23 @@
 Tenant signals for automatic RBAC initialization
 """
 
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.core.management import call_command
 from django.contrib.auth import get_user_model
-from .models import Tenant, ClientVendorRelationship, TenantUserProfile
+from .models import (
+    Tenant, ClientVendorRelationship, TenantUserProfile, TenantDesignation, PermissionGroup,
+    DesignationBasePermission, PermissionGroupPermission, UserPermissionOverride,
+    UserDesignationAssignment, UserPermissionGroupAssignment, PermissionRegistry,
+    UserEffectivePermissionsCache
+)
+from .services.permission_cache import get_permission_cache
+from .services.tenant_cache import get_tenant_cache
+from .services.permission_index_service import (
+    schedule_permission_reindex, schedule_designation_holders_reindex, schedule_group_members_reindex,
+    schedule_tenant_permission_rebuild
+)
 import logging
 
 User = get_user_model()
@@ -125,6 +137,15 @@ def update_vendor_relationships_on_tenant_approval(sender, instance, created, **
         logger.error(f"Failed to update vendor relationships for tenant {instance.id}: {e}", exc_info=True)
 
 
+@receiver([post_save, post_delete], sender=Tenant)
+def invalidate_tenant_resolution_cache(sender, instance, **kwargs):
+    """
+    Drop this worker's cached tenants after a tenant changes (activation,
+    suspension, subdomain rename). Other workers expire within the cache TTL.
+    """
+    transaction.on_commit(get_tenant_cache().invalidate)
+
+
 @receiver(post_save, sender=User)
 def create_user_tenant_profile(sender, instance, created, **kwargs):
     """
@@ -176,4 +197,76 @@ def create_tenant_user_profile_for_user(user, tenant, **profile_data):
         
     except Exception as e:
         logger.error(f"Failed to create TenantUserProfile for user {user.email} in tenant {tenant.organization_name}: {str(e)}")
-        return None 
\ No newline at end of file
+        return None
+
+
+# ============================================================================
+# Effective permission cache invalidation
+# ============================================================================
+# Generations are bumped after commit so a concurrent reader can never stamp
+# permissions calculated from pre-commit rows with the new generation. The
+# persisted cache rows are marked stale as well: an evicted counter restarts
+# at 0 and could otherwise match an old row's generation again.
+
+def _mark_cached_permissions_stale(**filters):
+    try:
+        UserEffectivePermissionsCache.objects.filter(**filters).update(is_valid=False)
+    except Exception as e:
+        logger.error(f"Failed to mark cached permissions stale ({filters}): {str(e)}")
+
+
+def _invalidate_tenant_permissions(tenant_id):
+    def invalidate():
+        _mark_cached_permissions_stale(user_profile__tenant_id=tenant_id)
+        get_permission_cache().bump_tenant(tenant_id)
+
+    if tenant_id is not None:
+        transaction.on_commit(invalidate)
+
+
+def _invalidate_user_permissions(user_profile_id):
+    def invalidate():
+        _mark_cached_permissions_stale(user_profile_id=user_profile_id)
+        get_permission_cache().bump_user(user_profile_id)
+
+    if user_profile_id is not None:
+        transaction.on_commit(invalidate)
+
+
+@receiver([post_save, post_delete], sender=DesignationBasePermission)
+def invalidate_permissions_on_designation_permission_change(sender, instance, **kwargs):
+    """Designation permissions feed every holder of the designation - invalidate the tenant."""
+    tenant_id = TenantDesignation.objects.filter(
+        pk=instance.designation_id
+    ).values_list('tenant_id', flat=True).first()
+    _invalidate_tenant_permissions(tenant_id)
+    schedule_designation_holders_reindex(instance.designation_id)
+
+
+@receiver([post_save, post_delete], sender=PermissionGroupPermission)
+def invalidate_permissions_on_group_permission_change(sender, instance, **kwargs):
+    """Group permissions feed every member of the group - invalidate the tenant."""
+    tenant_id = PermissionGroup.objects.filter(
+        pk=instance.group_id
+    ).values_list('tenant_id', flat=True).first()
+    _invalidate_tenant_permissions(tenant_id)
+    schedule_group_members_reindex(instance.group_id)
+
+
+@receiver([post_save, post_delete], sender=PermissionRegistry)
+def invalidate_permissions_on_registry_change(sender, instance, **kwargs):
+    """Administrators hold every registered permission - invalidate and re-index the tenant."""
+    _invalidate_tenant_permissions(instance.tenant_id)
+    schedule_tenant_permission_rebuild(instance.tenant_id)
+
+
+@receiver([post_save, post_delete], sender=UserPermissionOverride)
+@receiver([post_save, post_delete], sender=UserDesignationAssignment)
+@receiver([post_save, post_delete], sender=UserPermissionGroupAssignment)
+def invalidate_permissions_on_user_assignment_change(sender, instance, **kwargs):
+    """User-level assignment changed - invalidate only that user."""
+    _invalidate_user_permissions(instance.user_profile_id)
+    tenant_id = TenantUserProfile.objects.filter(
+        pk=instance.user_profile_id
+    ).values_list('tenant_id', flat=True).first()
+    schedule_permission_reindex(tenant_id, [instance.user_profile_id])
@@ -0,0 +1,54 @@
+"""
+Celery tasks for the inverted permission index
+"""
+
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Tenant
+from .services.permission_index_service import PermissionIndexService, reindex_crossed_windows
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PERMISSION_INDEX_SETTINGS = {
+    'WINDOW_LOOKBACK': 2 * 60 * 60,  # Seconds; covers one missed hourly run
+}
+
+
+def get_permission_index_settings():
+    """Merge project overrides from settings.PERMISSION_INDEX with defaults."""
+    return {**DEFAULT_PERMISSION_INDEX_SETTINGS, **getattr(settings, 'PERMISSION_INDEX', {})}
+
+
+@shared_task(ignore_result=True)
+def rebuild_tenant_permission_index(tenant_id):
+    """Re-index every user profile of a tenant (e.g. after a registry change)"""
+    try:
+        tenant = Tenant.objects.get(id=tenant_id)
+    except Tenant.DoesNotExist:
+        logger.warning(f"Permission index rebuild skipped, tenant {tenant_id} no longer exists")
+        return
+    PermissionIndexService(tenant).rebuild()
+
+
+@shared_task(ignore_result=True)
+def reindex_user_permissions(tenant_id, user_profile_ids):
+    """Re-index some profiles of a tenant (e.g. every holder of an edited designation)"""
+    try:
+        tenant = Tenant.objects.get(id=tenant_id)
+    except Tenant.DoesNotExist:
+        logger.warning(f"Permission re-index skipped, tenant {tenant_id} no longer exists")
+        return
+    PermissionIndexService(tenant).reindex_users(user_profile_ids)
+
+
+@shared_task(ignore_result=True)
+def reindex_permission_windows():
+    """Re-index profiles whose assignments or overrides started or expired since the last run"""
+    now = timezone.now()
+    since = now - timedelta(seconds=get_permission_index_settings()['WINDOW_LOOKBACK'])
+    return reindex_crossed_windows(since, now)
@@ -31,7 +31,10 @@ from ..serializers.rbac_serializers import (
     PermissionCheckRequestSerializer, PermissionCheckResponseSerializer,
     DepartmentSerializer, TenantDesignationSerializer, TenantDepartmentSerializer
 )
-from ..services import get_rbac_service, get_permission_management_service
+from ..services import get_rbac_service, get_permission_management_service, get_permission_index_service
+from ..services.permission_index_service import (
+    SOURCE_TYPES, schedule_permission_reindex, schedule_designation_holders_reindex, schedule_group_members_reindex
+)
 from ..constants import RESOURCE_TYPES_FRONTEND
 
 User = get_user_model()
@@ -313,7 +316,7 @@ class PermissionRegistryViewSet(viewsets.ModelViewSet):
         """Bulk revoke permissions with smart override logic."""
         try:
             tenant = request.user.tenant_user_profile.tenant
-            rbac_service = get_rbac_service(tenant.id)
+            rbac_service = get_rbac_service(tenant)
             
             permission_ids = request.data.get('permission_ids', [])
             target_type = request.data.get('target_type')
@@ -381,6 +384,9 @@ class PermissionRegistryViewSet(viewsets.ModelViewSet):
                                         permission=permission,
                                         is_active=True
                                 ).update(is_active=False)
+                                # Queryset updates bypass the invalidation and re-index signals
+                                rbac_service.invalidate_user_permissions(user_profile)
+                                schedule_permission_reindex(tenant.id, [user_profile.id])
                                 
                             elif source.startswith('designation_') or source.startswith('group_'):
                                 # User has permission via designation or group - create deny override
@@ -410,6 +416,8 @@ class PermissionRegistryViewSet(viewsets.ModelViewSet):
                                 permission_id=permission_id,
                                 designation__tenant=tenant
                             ).update(is_active=False)
+                            rbac_service.invalidate_tenant_permissions()
+                            schedule_designation_holders_reindex(target_id)
                         
                         elif target_type == 'groups':
                             # Remove permission from group
@@ -422,6 +430,8 @@ class PermissionRegistryViewSet(viewsets.ModelViewSet):
                                 permission=permission,
                                 is_active=True
                             ).update(is_active=False)
+                            rbac_service.invalidate_tenant_permissions()
+                            schedule_group_members_reindex(group.id)
                             
                             # Count affected users for reporting
                             group_users_count = UserPermissionGroupAssignment.objects.filter(
@@ -491,22 +501,22 @@ class PermissionRegistryViewSet(viewsets.ModelViewSet):
             users = TenantUserProfile.objects.filter(
                 tenant=tenant,
                 is_active=True
-            ).select_related('user').values(
+            ).values(
                 'id', 
-                'user__username', 
+                'user__email', 
                 'user__first_name', 
                 'user__last_name'
             )
             
-            # Create matrix (simplified version)
+            # Build matrix from the inverted permission index
+            granted = get_permission_index_service(tenant).permission_matrix()
+            permission_codes = [permission['permission_code'] for permission in permissions]
             matrix = {}
             for user in users:
-                user_key = f"user_{user['id']}"
-                matrix[user_key] = {}
-                for permission in permissions:
-                    perm_key = permission['permission_code']
-                    # In a real implementation, check actual permissions
-                    matrix[user_key][perm_key] = False  # Placeholder
+                user_permissions = granted.get(user['id'], {})
+                matrix[f"user_{user['id']}"] = {
+                    code: code in user_permissions for code in permission_codes
+                }
             
             return Response({
                 'users': list(users),
@@ -2484,15 +2494,17 @@ class PermissionGroupViewSet(viewsets.ModelViewSet):
                 is_active=True
             )
         
-            # Calculate user permissions using reliable method
+            # Calculate user permissions for the whole tenant in one pass
             rbac_service = get_rbac_service(tenant)
+            users = list(users)
+            permissions = list(permissions)
+            all_effective_perms = rbac_service.get_effective_permissions_bulk(users)
             user_summaries = {}
             permission_matrix = {}
             total_assignments = 0
 
             for user in users:
-                # Get effective permissions (using the working individual logic)
-                effective_perms = rbac_service.get_user_effective_permissions(user, force_refresh=True)
+                effective_perms = all_effective_perms.get(user.id, {})
                 user_permissions = effective_perms.get('permissions', {})
                 
                 # Create user summary
@@ -2590,17 +2602,18 @@ class PermissionGroupViewSet(viewsets.ModelViewSet):
             if user_id:
                 # Single user analysis
                 try:
-                    user = TenantUserProfile.objects.get(
+                    user = TenantUserProfile.objects.select_related('user').get(
                         user_id=user_id,
                         tenant=tenant
                     )
                     
-                    effective_perms = rbac_service.get_user_effective_permissions(user, force_refresh=True)
+                    effective_perms = rbac_service.get_user_effective_permissions(user)
                     
                     # Count high risk permissions
+                    risk_levels = self._get_permission_risk_levels(tenant)
                     high_risk_count = sum(
-                        1 for perm_code, perm_data in effective_perms.get('permissions', {}).items()
-                        if self._get_permission_risk_level(tenant, perm_code) in ['high', 'critical']
+                        1 for perm_code in effective_perms.get('permissions', {})
+                        if risk_levels.get(perm_code, 'low') in ['high', 'critical']
                     )
                     
                     user_summary = {
@@ -2633,21 +2646,23 @@ class PermissionGroupViewSet(viewsets.ModelViewSet):
                         {'error': f'User {user_id} not found'}, 
                         status=status.HTTP_404_NOT_FOUND
                     )
-                else:
-                    # All users analysis
-                    users = TenantUserProfile.objects.filter(
+            else:
+                # All users analysis
+                users = list(TenantUserProfile.objects.filter(
                     tenant=tenant,
                     is_active=True
-                ).select_related('user')
+                ).select_related('user'))
+                all_effective_perms = rbac_service.get_effective_permissions_bulk(users)
+                risk_levels = self._get_permission_risk_levels(tenant)
 
                 user_analyses = []
                 for user in users:
-                    effective_perms = rbac_service.get_user_effective_permissions(user, force_refresh=True)
+                    effective_perms = all_effective_perms.get(user.id, {})
                     user_perms = effective_perms.get('permissions', {})
                     
                     high_risk_count = sum(
                         1 for perm_code in user_perms.keys()
-                        if self._get_permission_risk_level(tenant, perm_code) in ['high', 'critical']
+                        if risk_levels.get(perm_code, 'low') in ['high', 'critical']
                     )
                     
                     user_analyses.append({
@@ -2691,23 +2706,22 @@ class PermissionGroupViewSet(viewsets.ModelViewSet):
                         tenant=tenant
                     )
                     
-                    # Find users with this permission
+                    # Find users with this permission from the inverted permission index
+                    index_service = get_permission_index_service(tenant)
                     users_with_permission = []
-                    rbac_service = get_rbac_service(tenant)
-                    
-                    for user in TenantUserProfile.objects.filter(tenant=tenant, is_active=True):
-                        effective_perms = rbac_service.get_user_effective_permissions(user, force_refresh=True)
-                        if permission.permission_code in effective_perms.get('permissions', {}):
-                            perm_data = effective_perms['permissions'][permission.permission_code]
-                            users_with_permission.append({
-                                "user_id": user.user.id,
-                                "name": user.user.get_full_name() or user.user.username,
-                                "email": user.user.email,
-                                "employee_id": getattr(user, 'employee_id', '') or '',
-                                "source": perm_data.get('source', 'unknown'),
-                                "level": perm_data.get('permission_level', 'granted'),
-                                "scope_configuration": perm_data.get('scope_configuration', {})
-                            })
+                    by_source = dict.fromkeys(SOURCE_TYPES, 0)
+                    for entry in index_service.users_with_permission(permission.permission_code):
+                        user = entry.user_profile
+                        by_source[entry.source_type] += 1
+                        users_with_permission.append({
+                            "user_id": user.user.id,
+                            "name": user.user.get_full_name() or user.user.email,
+                            "email": user.user.email,
+                            "employee_id": getattr(user, 'employee_id', '') or '',
+                            "source": entry.source,
+                            "level": entry.permission_level,
+                            "scope_configuration": entry.scope_configuration
+                        })
 
                     response_data = {
                         "view_type": "permission_analysis",
@@ -2723,11 +2737,7 @@ class PermissionGroupViewSet(viewsets.ModelViewSet):
                         "users_with_permission": users_with_permission,
                         "assignment_breakdown": {
                             "total_users": len(users_with_permission),
-                            "by_source": {
-                                "designation": 0,  # TODO: Calculate
-                                "group": 0,
-                                "override": 0
-                            }
+                            "by_source": by_source
                         },
                         "generated_at": timezone.now().isoformat()
                     }
@@ -2744,9 +2754,12 @@ class PermissionGroupViewSet(viewsets.ModelViewSet):
                     is_active=True
                 )
                 
+                breakdown = get_permission_index_service(tenant).source_breakdown()
+                empty_counts = dict.fromkeys(SOURCE_TYPES, 0)
+
                 permission_analyses = []
                 for permission in permissions:
-                    # Count assignments (simplified)
+                    counts = breakdown.get(permission.permission_code, empty_counts)
                     permission_analyses.append({
                         "permission_id": permission.id,
                         "name": permission.permission_name,
@@ -2754,10 +2767,11 @@ class PermissionGroupViewSet(viewsets.ModelViewSet):
                         "category": permission.permission_category,
                         "risk_level": permission.risk_level,
                         "assignment_counts": {
-                            "designation_assignments": 0,  # TODO: Calculate
-                            "group_assignments": 0,
-                            "user_overrides": 0,
-                            "total": 0
+                            "designation_assignments": counts['designation'],
+                            "group_assignments": counts['group'],
+                            "user_overrides": counts['override'],
+                            "administrator_access": counts['administrator'],
+                            "total": sum(counts.values())
                         }
                     })
 
@@ -2782,8 +2796,9 @@ class PermissionGroupViewSet(viewsets.ModelViewSet):
             rbac_service = get_rbac_service(tenant)
             
             # Get all users and their permissions
-            users = TenantUserProfile.objects.filter(tenant=tenant, is_active=True)
+            users = list(TenantUserProfile.objects.filter(tenant=tenant, is_active=True).select_related('user'))
             permissions = PermissionRegistry.objects.filter(tenant=tenant, is_active=True)
+            all_effective_perms = rbac_service.get_effective_permissions_bulk(users)
             
             # Calculate permission usage
             permission_usage_map = {}
@@ -2791,7 +2806,7 @@ class PermissionGroupViewSet(viewsets.ModelViewSet):
             users_with_no_permissions = []
             
             for user in users:
-                effective_perms = rbac_service.get_user_effective_permissions(user, force_refresh=True)
+                effective_perms = all_effective_perms.get(user.id, {})
                 user_perms = effective_perms.get('permissions', {})
                 
                 permission_count = len(user_perms)
@@ -2877,6 +2892,12 @@ class PermissionGroupViewSet(viewsets.ModelViewSet):
             raise
 
     # Helper methods
+    def _get_permission_risk_levels(self, tenant) -> Dict[str, str]:
+        """Get a permission_code -> risk_level map for the tenant in one query."""
+        return dict(
+            PermissionRegistry.objects.filter(tenant=tenant).values_list('permission_code', 'risk_level')
+        )
+
     def _get_permission_risk_level(self, tenant, permission_code: str) -> str:
         """Get risk level for a permission code."""
         try:
@@ -3274,8 +3295,8 @@ class PermissionGroupViewSet(viewsets.ModelViewSet):
                 name='source_type',
                 type=OpenApiTypes.STR,
                 location=OpenApiParameter.QUERY,
-                description='Filter by permission source: designation, group, override',
-                enum=['designation', 'group', 'override']
+                description='Filter by permission source: designation, group, override, administrator',
+                enum=['designation', 'group', 'override', 'administrator']
             ),
         ],
         responses={200: OpenApiTypes.OBJECT}
@@ -3310,38 +3331,28 @@ class PermissionGroupViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            # Find users with this permission
-            rbac_service = get_rbac_service(tenant)
+            # Find users with this permission from the inverted permission index
+            index_service = get_permission_index_service(tenant)
             users_with_permission = []
-            source_breakdown = {"designation": 0, "group": 0, "override": 0}
+            for entry in index_service.users_with_permission(permission_code, source_type_filter):
+                user = entry.user_profile
+                users_with_permission.append({
+                    "user_id": user.user.id,
+                    "name": user.user.get_full_name() or user.user.email,
+                    "email": user.user.email,
+                    "employee_id": getattr(user, 'employee_id', '') or '',
+                    "job_title": getattr(user, 'job_title', '') or '',
+                    "department": getattr(user, 'department', '') or '',
+                    "permission_source": entry.source,
+                    "permission_level": entry.permission_level,
+                    "scope_configuration": entry.scope_configuration,
+                    "last_login": user.user.last_login.isoformat() if user.user.last_login else None
+                })
 
-            for user in TenantUserProfile.objects.filter(tenant=tenant, is_active=True):
-                effective_perms = rbac_service.get_user_effective_permissions(user, force_refresh=True)
-                
-                if permission_code in effective_perms.get('permissions', {}):
-                    perm_data = effective_perms['permissions'][permission_code]
-                    source = perm_data.get('source', 'unknown')
-                    
-                    # Apply source filter if specified
-                    if source_type_filter and source != source_type_filter:
-                        continue
-                    
-                    users_with_permission.append({
-                        "user_id": user.user.id,
-                        "name": user.user.get_full_name() or user.user.username,
-                        "email": user.user.email,
-                        "employee_id": getattr(user, 'employee_id', '') or '',
-                        "job_title": getattr(user, 'job_title', '') or '',
-                        "department": getattr(user, 'department', '') or '',
-                        "permission_source": source,
-                        "permission_level": perm_data.get('permission_level', 'granted'),
-                        "scope_configuration": perm_data.get('scope_configuration', {}),
-                        "last_login": user.user.last_login.isoformat() if user.user.last_login else None
-                    })
-                    
-                    # Count by source
-                    if source in source_breakdown:
-                        source_breakdown[source] += 1
+            # Count by source (unfiltered, so the breakdown describes the permission)
+            source_breakdown = index_service.source_breakdown(permission_code).get(
+                permission_code, dict.fromkeys(SOURCE_TYPES, 0)
+            )
 
             response_data = {
                 "permission_details": {
@@ -0,0 +1,18 @@
+"""
+Celery application for Teleops Backend
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+
+app = Celery('teleops')
+
+# CELERY_* settings, including CELERY_TASK_ALWAYS_EAGER in development
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# tasks.py in installed apps, plus the shared bulk job tasks
+app.autodiscover_tasks()
+app.autodiscover_tasks(['core.jobs'])
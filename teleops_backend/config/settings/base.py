@@ -282,6 +282,28 @@ CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
+CELERY_BEAT_SCHEDULE = {
+    'resume-stalled-bulk-jobs': {
+        'task': 'core.jobs.tasks.resume_stalled_bulk_jobs',
+        'schedule': 5 * 60,  # seconds
+    },
+    'reindex-permission-windows': {
+        'task': 'apps.tenants.tasks.reindex_permission_windows',
+        'schedule': 60 * 60,  # seconds; assignments/overrides starting or expiring
+    },
+    'rebuild-site-dimensions': {
+        'task': 'apps.sites.tasks.rebuild_site_dimensions',
+        'schedule': 24 * 60 * 60,  # seconds; repairs cluster/town count drift
+    },
+}
+
+# Bulk Upload Jobs (core.jobs)
+BULK_JOBS = {
+    'STORAGE_PREFIX': 'bulk_uploads',
+    'STALLED_AFTER': int(os.environ.get('BULK_JOB_STALLED_AFTER', 15 * 60)),  # seconds
+    'MAX_ATTEMPTS': int(os.environ.get('BULK_JOB_MAX_ATTEMPTS', 5)),
+    'RETRY_DELAY': int(os.environ.get('BULK_JOB_RETRY_DELAY', 60)),  # seconds, doubled per attempt
+}
 
 # Azure Blob Storage Configuration
 AZURE_ACCOUNT_NAME = os.environ.get('AZURE_ACCOUNT_NAME')
@@ -491,6 +513,17 @@ RATELIMIT_ENABLE = True
 RATELIMIT_USE_CACHE = 'default'
 RATELIMIT_VIEW = 'core.views.error_handlers.ratelimited'
 
+# Audit pipeline (AuditMiddleware): events are queued and written by a
+# background thread; requests are never blocked when the queue is full
+AUDIT_PIPELINE = {
+    'ASYNC': os.environ.get('AUDIT_ASYNC', 'True').lower() == 'true',
+    'QUEUE_SIZE': int(os.environ.get('AUDIT_QUEUE_SIZE', 10000)),
+    'BATCH_SIZE': 200,
+    'FLUSH_INTERVAL': 1.0,  # seconds
+    # Path prefix -> fraction of requests audited (longest prefix wins)
+    'SAMPLE_RATES': {},
+}
+
 # Health Checks Configuration
 HEALTH_CHECK = {
     'DISK_USAGE_MAX': 90,  # Disk usage percentage
@@ -504,6 +537,40 @@ CACHE_TIMEOUT = {
     'VERY_LONG': 86400,   # 24 hours
 }
 
+# Effective permission cache (per-worker LRU in front of Redis)
+RBAC_PERMISSION_CACHE = {
+    'LOCAL_MAX_ENTRIES': int(os.environ.get('RBAC_LOCAL_CACHE_MAX_ENTRIES', 2048)),
+    'LOCAL_TIMEOUT': int(os.environ.get('RBAC_LOCAL_CACHE_TIMEOUT', 30)),  # seconds
+    'SHARED_TIMEOUT': 3600,  # 1 hour
+}
+
+# Inverted permission index (apps.tenants.tasks.reindex_permission_windows)
+PERMISSION_INDEX = {
+    'WINDOW_LOOKBACK': 2 * 60 * 60,  # seconds; must exceed the beat interval
+}
+
+# Per-worker tenant lookup cache used by TenantMiddleware and JWT authentication
+TENANT_RESOLUTION_CACHE = {
+    'MAX_ENTRIES': 1024,
+    'TIMEOUT': int(os.environ.get('TENANT_RESOLUTION_CACHE_TIMEOUT', 5)),  # seconds
+}
+
+# Cached per-tenant site statistics for the circle site list
+SITE_STATISTICS_CACHE = {
+    'TIMEOUT': int(os.environ.get('SITE_STATISTICS_CACHE_TIMEOUT', 3600)),  # seconds
+}
+
+# Cached per-tenant counts behind the project and task dashboards
+DASHBOARD_STATS_CACHE = {
+    'TIMEOUT': int(os.environ.get('DASHBOARD_STATS_CACHE_TIMEOUT', 300)),  # seconds
+}
+
+# Equipment catalog lookups during dismantle/inventory imports
+EQUIPMENT_RESOLUTION = {
+    'PRELOAD_LIMIT': int(os.environ.get('EQUIPMENT_RESOLUTION_PRELOAD_LIMIT', 50000)),  # items
+    'LRU_MAX_ENTRIES': 10000,
+}
+
 # Multi-Tenant Configuration
 TENANT_MODEL = 'tenants.Tenant'
 TENANT_DOMAIN_MODEL = None
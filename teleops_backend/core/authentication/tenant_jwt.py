@@ -11,7 +11,7 @@ from rest_framework.authentication import get_authorization_header
 from rest_framework.request import Request
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
-from apps.tenants.models import Tenant
+from apps.tenants.services.tenant_cache import get_tenant_cache
 
 logger = logging.getLogger(__name__)
 
@@ -84,11 +84,12 @@ class TenantScopedJWTAuthentication(JWTAuthentication):
             return None
         
         try:
-            tenant = Tenant.objects.get(id=tenant_id, is_active=True)
-            return tenant
-        except Tenant.DoesNotExist:
+            tenant = get_tenant_cache().get_by_id(tenant_id)
+        except ValueError:
+            tenant = None
+        if tenant is None:
             logger.warning(f"Invalid tenant_id in JWT token: {tenant_id}")
-            return None
+        return tenant
     
     def authenticate_header(self, request):
         """
@@ -121,7 +122,9 @@ class TenantScopedJWTAuthentication(JWTAuthentication):
         Check if user belongs to the specified tenant
         """
         try:
-            tenant = Tenant.objects.get(id=tenant_id, is_active=True)
+            tenant = get_tenant_cache().get_by_id(tenant_id)
+            if tenant is None:
+                return False
             
             # Check user profile tenant association
             if hasattr(user, 'tenant_user_profile') and user.tenant_user_profile:
@@ -137,7 +140,7 @@ class TenantScopedJWTAuthentication(JWTAuthentication):
             
             return False
             
-        except Tenant.DoesNotExist:
+        except ValueError:
             return False
 
 
@@ -174,7 +177,9 @@ class MultiTenantJWTAuthentication(TenantScopedJWTAuthentication):
         Check if user can switch to the specified tenant
         """
         try:
-            tenant = Tenant.objects.get(id=tenant_id, is_active=True)
+            tenant = get_tenant_cache().get_by_id(tenant_id)
+            if tenant is None:
+                return False
             
             # Super users can switch to any tenant
             if user.is_superuser:
@@ -186,7 +191,7 @@ class MultiTenantJWTAuthentication(TenantScopedJWTAuthentication):
             # For now, allow if user has any tenant association
             return True
             
-        except Tenant.DoesNotExist:
+        except ValueError:
             return False
     
     def get_tenant_by_id(self, tenant_id):
@@ -194,8 +199,8 @@ class MultiTenantJWTAuthentication(TenantScopedJWTAuthentication):
         Get tenant by ID
         """
         try:
-            return Tenant.objects.get(id=tenant_id, is_active=True)
-        except Tenant.DoesNotExist:
+            return get_tenant_cache().get_by_id(tenant_id)
+        except ValueError:
             return None
 
 
@@ -0,0 +1,154 @@
+"""
+Dashboard statistics
+Per-tenant counts for the list dashboards (ProjectViewSet.stats,
+TaskViewSet.stats), aggregated in one grouped query per model and kept in the
+shared Django cache until a counted field changes.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DASHBOARD_STATS_CACHE_SETTINGS = {
+    'TIMEOUT': 300,  # Seconds; a backstop for writes that bypass model signals
+    'KEY_PREFIX': 'dashboard_stats',
+}
+
+
+def get_dashboard_stats_cache_settings() -> Dict[str, Any]:
+    """Merge project overrides from settings.DASHBOARD_STATS_CACHE with defaults."""
+    return {**DEFAULT_DASHBOARD_STATS_CACHE_SETTINGS, **getattr(settings, 'DASHBOARD_STATS_CACHE', {})}
+
+
+class DashboardStats:
+    """
+    Counts of a model's rows per tenant, broken down by each of group_fields.
+
+    compute() runs a single GROUP BY over all group_fields and folds the
+    groups into {'total': n, <field>: {value: count}, ...}, so every status
+    count and breakdown of a dashboard comes from one query. get() serves
+    that summary from the shared cache under a per-tenant generation
+    counter. The owning app's signals call remember() on pre_save and
+    invalidate_if_changed() on post_save, which retires the summary after
+    commit only when the row is new or one of the watched fields changed.
+    Bulk queryset updates must call invalidate_on_commit() themselves.
+    """
+
+    def __init__(self, name: str, model, group_fields: Iterable[str], filters: Optional[Dict[str, Any]] = None,
+                 watch_fields: Iterable[str] = (), shared_cache=None):
+        config = get_dashboard_stats_cache_settings()
+        self.name = name
+        self.model = model
+        self.group_fields = tuple(group_fields)
+        self.filters = filters or {}
+        # Fields whose change moves a row between groups or in/out of filters
+        self.watch_fields = self.group_fields + tuple(f for f in watch_fields if f not in self.group_fields)
+        self.shared = shared_cache or cache
+        self.timeout = config['TIMEOUT']
+        self.prefix = f"{config['KEY_PREFIX']}:{name}"
+
+    def _generation_key(self, tenant_id) -> str:
+        return f"{self.prefix}:gen:{tenant_id}"
+
+    def _summary_key(self, tenant_id, generation: int) -> str:
+        return f"{self.prefix}:{tenant_id}:{generation}"
+
+    def _get_generation(self, tenant_id) -> Optional[int]:
+        try:
+            return int(self.shared.get(self._generation_key(tenant_id), 0))
+        except Exception as e:
+            logger.warning(f"Dashboard stats generation unavailable ({self.name}): {str(e)}")
+            return None
+
+    def get(self, tenant_id) -> Dict[str, Any]:
+        """Cached summary for the tenant (computed directly if the cache is down)"""
+        generation = self._get_generation(tenant_id)
+        if generation is None:
+            return self.compute(tenant_id)
+
+        key = self._summary_key(tenant_id, generation)
+        try:
+            summary = self.shared.get(key)
+        except Exception as e:
+            logger.warning(f"Failed to read cached dashboard stats ({self.name}): {str(e)}")
+            summary = None
+        if summary is not None:
+            return summary
+
+        summary = self.compute(tenant_id)
+        try:
+            self.shared.set(key, summary, timeout=self.timeout)
+        except Exception as e:
+            logger.warning(f"Failed to cache dashboard stats ({self.name}): {str(e)}")
+        return summary
+
+    def compute(self, tenant_id) -> Dict[str, Any]:
+        """Aggregate the summary from the database in one query"""
+        rows = (
+            self.model.objects.filter(tenant_id=tenant_id, **self.filters)
+            .order_by().values_list(*self.group_fields).annotate(count=Count('pk'))
+        )
+        summary: Dict[str, Any] = {'total': 0, **{field: {} for field in self.group_fields}}
+        for row in rows:
+            *values, count = row
+            summary['total'] += count
+            for field, value in zip(self.group_fields, values):
+                summary[field][value] = summary[field].get(value, 0) + count
+        return summary
+
+    @staticmethod
+    def breakdown(summary: Dict[str, Any], field: str) -> List[Dict[str, Any]]:
+        """[{field: value, 'count': n}, ...] ordered by value, as values().annotate() returned"""
+        counts = summary[field]
+        return [
+            {field: value, 'count': counts[value]}
+            for value in sorted(counts, key=lambda value: (value is None, value))
+        ]
+
+    def invalidate(self, tenant_id) -> Optional[int]:
+        """Retire the tenant's cached summary in every worker"""
+        key = self._generation_key(tenant_id)
+        try:
+            try:
+                return self.shared.incr(key)
+            except ValueError:
+                # Counter not initialised yet (or evicted)
+                if self.shared.add(key, 1, timeout=None):
+                    return 1
+                return self.shared.incr(key)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate dashboard stats ({self.name}) for tenant {tenant_id}: {str(e)}")
+            return None
+
+    def invalidate_on_commit(self, tenant_id):
+        transaction.on_commit(lambda: self.invalidate(tenant_id))
+
+    # === Signal helpers ===
+
+    def _watched_values(self, instance) -> tuple:
+        return tuple(getattr(instance, field) for field in self.watch_fields)
+
+    def remember(self, instance, update_fields=None):
+        """pre_save: record the stored watched values of an existing row"""
+        stored = None
+        if update_fields is not None and not set(update_fields) & set(self.watch_fields):
+            # This save cannot touch the watched fields
+            stored = self._watched_values(instance)
+        elif not instance._state.adding:
+            stored = (
+                self.model._base_manager.filter(pk=instance.pk)
+                .values_list(*self.watch_fields).first()
+            )
+        instance._stored_dashboard_values = stored
+
+    def invalidate_if_changed(self, instance, created: bool):
+        """post_save: retire the tenant's summary if the row entered, left or moved between groups"""
+        stored = getattr(instance, '_stored_dashboard_values', None)
+        if created or stored is None or stored != self._watched_values(instance):
+            self.invalidate_on_commit(instance.tenant_id)
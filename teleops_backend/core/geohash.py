@@ -0,0 +1,87 @@
+"""
+Geohash encoding and bounding-box cover
+Grid cells for indexed prefix lookups of stored coordinates, so spatial
+queries work on any database backend without PostGIS.
+"""
+
+import math
+from typing import List, Optional
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Characters stored per coordinate (~4.8m x 4.8m cells)
+GEOHASH_PRECISION = 9
+
+# A bounding box is covered with at most this many cells (each one LIKE prefix)
+MAX_COVER_CELLS = 32
+
+# Mean kilometers per degree of latitude
+KM_PER_DEGREE = 111.195
+
+
+def encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Geohash of a point, `precision` characters long"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    latitude, longitude = float(latitude), float(longitude)
+    chars = []
+    bits, bit_count, even = 0, 0, True
+    while len(chars) < precision:
+        value, interval = (longitude, lng_range) if even else (latitude, lat_range)
+        mid = (interval[0] + interval[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+
+def cell_size(precision: int):
+    """(height, width) in degrees of a cell at the given precision"""
+    lat_bits = (5 * precision) // 2
+    lng_bits = 5 * precision - lat_bits
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def cover(min_lat: float, min_lng: float, max_lat: float, max_lng: float,
+          max_cells: int = MAX_COVER_CELLS) -> Optional[List[str]]:
+    """
+    Geohash prefixes whose cells together cover the bounding box, at the finest
+    precision that needs no more than max_cells cells. None means the box is
+    too large for any prefix to narrow the search. Boxes crossing the
+    antimeridian are not supported; clamp them first.
+    """
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        first_row, last_row = _cell_index(min_lat, -90.0, height), _cell_index(max_lat, -90.0, height)
+        first_col, last_col = _cell_index(min_lng, -180.0, width), _cell_index(max_lng, -180.0, width)
+        if (last_row - first_row + 1) * (last_col - first_col + 1) > max_cells:
+            continue
+        return sorted({
+            encode(-90.0 + (row + 0.5) * height, -180.0 + (col + 0.5) * width, precision)
+            for row in range(first_row, last_row + 1)
+            for col in range(first_col, last_col + 1)
+        })
+    return None
+
+
+def _cell_index(value: float, origin: float, size: float) -> int:
+    cells = int(round((-2 * origin) / size))
+    return min(int(math.floor((value - origin) / size)), cells - 1)
+
+
+def radius_bounds(latitude: float, longitude: float, radius_km: float):
+    """(min_lat, min_lng, max_lat, max_lng) enclosing a circle, clamped to valid coordinates"""
+    lat_delta = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = max(latitude - lat_delta, -90.0), min(latitude + lat_delta, 90.0)
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if cos_lat <= 1e-9:
+        return min_lat, -180.0, max_lat, 180.0
+    lng_delta = radius_km / (KM_PER_DEGREE * cos_lat)
+    return min_lat, max(longitude - lng_delta, -180.0), max_lat, min(longitude + lng_delta, 180.0)
@@ -0,0 +1,12 @@
+"""
+Resumable background jobs for bulk uploads
+"""
+
+from .runner import BulkJobRunner, start_bulk_job, dispatch_bulk_job, get_bulk_job_settings
+
+__all__ = [
+    'BulkJobRunner',
+    'start_bulk_job',
+    'dispatch_bulk_job',
+    'get_bulk_job_settings',
+]
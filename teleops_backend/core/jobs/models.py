@@ -0,0 +1,56 @@
+"""
+Shared fields and progress reporting for bulk upload job models
+"""
+
+from django.db import models
+from django.utils import timezone
+
+
+class BulkJobMixin(models.Model):
+    """
+    Abstract base for *BulkUploadJob models run by a BulkJobRunner.
+
+    Concrete models keep their own counters (success_count, linked_count, ...);
+    processed_rows doubles as the resume cursor and is only advanced in the
+    same transaction as the chunk it covers.
+    """
+    file_path = models.CharField(max_length=500, blank=True, help_text="Stored upload processed by the job")
+    task_id = models.CharField(max_length=255, blank=True, help_text="Celery task id of the latest run")
+    job_options = models.JSONField(default=dict, blank=True, help_text="Upload parameters needed to (re)run the job")
+    attempts = models.PositiveIntegerField(default=0, help_text="Consecutive runs stopped by an unexpected error")
+
+    class Meta:
+        abstract = True
+
+    @property
+    def progress_percentage(self):
+        if self.total_rows == 0:
+            return 0
+        return round((self.processed_rows / self.total_rows) * 100, 2)
+
+    @property
+    def duration(self):
+        if not self.started_at:
+            return None
+        end_time = self.completed_at or timezone.now()
+        return end_time - self.started_at
+
+    @property
+    def is_finished(self):
+        return self.status in ('completed', 'failed', 'cancelled')
+
+    def get_progress(self):
+        """Progress summary shared by every bulk job type"""
+        return {
+            'job_id': self.id,
+            'file_name': self.file_name,
+            'status': self.status,
+            'total_rows': self.total_rows,
+            'processed_rows': self.processed_rows,
+            'error_count': self.error_count,
+            'progress_percentage': self.progress_percentage,
+            'started_at': self.started_at,
+            'completed_at': self.completed_at,
+            'duration': str(self.duration) if self.duration else None,
+            'error_message': self.error_message,
+        }
@@ -0,0 +1,274 @@
+"""
+Bulk Job Runner
+Runs chunked spreadsheet imports as Celery tasks. The upload is persisted to
+storage and progress is committed together with each chunk, so a job
+interrupted by a worker restart or an unexpected error resumes from the last
+committed chunk.
+"""
+
+import logging
+import os
+import zipfile
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core.spreadsheet_reader import SpreadsheetReader
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BULK_JOB_SETTINGS = {
+    'STORAGE_PREFIX': 'bulk_uploads',
+    'STALLED_AFTER': 15 * 60,  # Seconds without progress before an unfinished job is re-queued
+    'MAX_ATTEMPTS': 5,  # Consecutive failed runs before a job is marked failed
+    'RETRY_DELAY': 60,  # Seconds before the first re-run after an error, doubled per attempt
+    'RUNNERS': [
+        'apps.sites.jobs.SiteBulkUploadRunner',
+        'apps.projects.jobs.ProjectSitesImportRunner',
+        'apps.projects.jobs.ProjectInventoryImportRunner',
+        'apps.tasks.jobs.BulkTaskCreationRunner',
+    ],
+}
+
+
+def get_bulk_job_settings() -> Dict[str, Any]:
+    """Merge project overrides from settings.BULK_JOBS with defaults."""
+    return {**DEFAULT_BULK_JOB_SETTINGS, **getattr(settings, 'BULK_JOBS', {})}
+
+
+def get_runner_class(runner_path: str):
+    """Resolve a configured runner class from its dotted path."""
+    if runner_path not in get_bulk_job_settings()['RUNNERS']:
+        raise ValueError(f"Unknown bulk job runner: {runner_path}")
+    return import_string(runner_path)
+
+
+class JobInterrupted(Exception):
+    """The job was cancelled or is being processed by another run"""
+
+
+class InvalidUpload(Exception):
+    """The stored upload cannot be parsed; re-running the job will not help"""
+
+
+# Raised by pandas/openpyxl for malformed files (ParserError and
+# UnicodeDecodeError are ValueErrors, a corrupt XLSX is a bad zip)
+UNREADABLE_UPLOAD_ERRORS = (ValueError, zipfile.BadZipFile)
+
+
+class BulkJobRunner:
+    """
+    Base class for resumable bulk upload jobs.
+
+    Subclasses set job_model (a BulkJobMixin model), chunk_size and
+    counter_fields, and implement process_chunk. Each chunk is processed in
+    one transaction that also advances job.processed_rows, locking the job
+    row so a re-delivered task never processes the same rows twice.
+
+    Only an invalid upload (prepare() rejects it or it cannot be parsed)
+    fails the job outright. Any other error keeps the upload and the
+    committed progress and re-queues the job with a growing delay, failing
+    it after MAX_ATTEMPTS consecutive runs that made no progress.
+    """
+
+    job_model = None
+    chunk_size = 100
+    # Job field -> chunk result key, accumulated after every chunk
+    counter_fields: Dict[str, str] = {}
+    # Optional model with (job, row, error) fields; when set, row errors are
+    # inserted there instead of being appended to job.detailed_errors
+    error_model = None
+
+    def __init__(self, job):
+        self.job = job
+
+    @classmethod
+    def get_path(cls) -> str:
+        return f"{cls.__module__}.{cls.__qualname__}"
+
+    # === Hooks ===
+
+    def open_reader(self, stored_file) -> SpreadsheetReader:
+        """Streaming reader over the stored upload"""
+        return SpreadsheetReader(stored_file, file_name=self.job.file_path, chunk_size=self.chunk_size)
+
+    def prepare(self, columns) -> Optional[str]:
+        """Validate the upload's columns; return an error message to fail the job"""
+        return None
+
+    def process_chunk(self, chunk_df, start_row: int) -> Dict[str, Any]:
+        """
+        Process a chunk of the upload. chunk_df is indexed by data row
+        offset and start_row is the offset of its first row.
+
+        Returns the counters named in counter_fields plus 'errors' (and
+        optionally 'error_count', defaulting to len(errors)).
+        """
+        raise NotImplementedError
+
+    # === Running ===
+
+    def run(self):
+        """Process the job from its last committed chunk to completion"""
+        job = self.job
+        if job.is_finished:
+            logger.info(f"Bulk job {job._meta.label} {job.id} already {job.status}, skipping")
+            return
+
+        try:
+            if not job.started_at:
+                job.started_at = timezone.now()
+            job.status = 'processing'
+            job.save(update_fields=['status', 'started_at', 'updated_at'])
+
+            with default_storage.open(job.file_path, 'rb') as stored_file:
+                reader = self.open_reader(stored_file)
+                try:
+                    headers = reader.headers
+                except UNREADABLE_UPLOAD_ERRORS as e:
+                    raise InvalidUpload(str(e)) from e
+                error = self.prepare(headers)
+                if error:
+                    self._finish('failed', error)
+                    return
+
+                if not job.total_rows:
+                    job.total_rows = reader.count_rows()
+                    job.save(update_fields=['total_rows', 'updated_at'])
+
+                if job.processed_rows:
+                    logger.info(f"Resuming bulk job {job._meta.label} {job.id} from row {job.processed_rows}")
+
+                for chunk_df in self._read_chunks(reader, job.processed_rows):
+                    start = self.job.processed_rows
+                    self._commit_chunk(chunk_df, start, int(chunk_df.index[-1]) + 1)
+
+            # The request-time count may be an estimate
+            self.job.total_rows = self.job.processed_rows
+            self.job.save(update_fields=['total_rows', 'updated_at'])
+            self._finish('completed')
+            logger.info(
+                f"Bulk job {job._meta.label} {job.id} completed: "
+                f"{self.job.processed_rows} rows, {self.job.error_count} errors"
+            )
+
+        except JobInterrupted as e:
+            logger.info(f"Bulk job {job._meta.label} {job.id} stopped: {str(e)}")
+            if self.job.status == 'cancelled':
+                self._discard_upload()
+        except InvalidUpload as e:
+            logger.warning(f"Bulk job {job._meta.label} {job.id} has an unreadable upload: {str(e)}")
+            self._finish('failed', f"Could not read file: {str(e)}")
+        except Exception as e:
+            logger.error(f"Error in bulk job {job._meta.label} {job.id}: {str(e)}")
+            self._retry_later(str(e))
+
+    @staticmethod
+    def _read_chunks(reader, start_row: int):
+        # Only parsing errors are wrapped; errors raised while a chunk is
+        # processed surface in run() unchanged
+        try:
+            yield from reader.iter_chunks(start_row=start_row)
+        except UNREADABLE_UPLOAD_ERRORS as e:
+            raise InvalidUpload(str(e)) from e
+
+    def _commit_chunk(self, chunk_df, start: int, end: int):
+        with transaction.atomic():
+            job = type(self.job).objects.select_for_update().get(pk=self.job.pk)
+            if job.status != 'processing':
+                self.job = job
+                raise JobInterrupted(f"status is {job.status}")
+            if job.processed_rows != start:
+                raise JobInterrupted(f"another run is at row {job.processed_rows}")
+
+            result = self.process_chunk(chunk_df, start)
+
+            for field, key in self.counter_fields.items():
+                setattr(job, field, getattr(job, field) + result.get(key, 0))
+            errors = result.get('errors', [])
+            job.error_count += result.get('error_count', len(errors))
+            if self.error_model is not None:
+                self.error_model.objects.bulk_create(
+                    [self.error_model(job=job, row=error['row'], error=error['error']) for error in errors]
+                )
+            else:
+                job.detailed_errors = (job.detailed_errors or []) + errors
+            job.processed_rows = end
+            job.attempts = 0
+            job.save()
+            self.job = job
+
+    def _retry_later(self, error_message: str):
+        """Keep the upload and committed chunks and queue another run"""
+        config = get_bulk_job_settings()
+        job = self.job
+        try:
+            job.attempts += 1
+            if job.attempts >= config['MAX_ATTEMPTS']:
+                self._finish('failed', error_message)
+                return
+            job.error_message = error_message
+            job.save(update_fields=['attempts', 'error_message', 'updated_at'])
+        except Exception as e:
+            # e.g. the database is unreachable; resume_stalled_bulk_jobs picks the job up later
+            logger.error(f"Failed to record error for bulk job {job._meta.label} {job.id}: {str(e)}")
+            return
+
+        countdown = config['RETRY_DELAY'] * 2 ** (job.attempts - 1)
+        logger.info(f"Retrying bulk job {job._meta.label} {job.id} in {countdown}s (attempt {job.attempts + 1})")
+        dispatch_bulk_job(self.get_path(), job.pk, countdown=countdown)
+
+    def _finish(self, status: str, error_message: Optional[str] = None):
+        job = self.job
+        job.status = status
+        job.completed_at = timezone.now()
+        if error_message:
+            job.error_message = error_message
+        job.save(update_fields=['status', 'completed_at', 'error_message', 'updated_at'])
+        self._discard_upload()
+
+    def _discard_upload(self):
+        try:
+            if self.job.file_path:
+                default_storage.delete(self.job.file_path)
+        except Exception as e:
+            logger.warning(f"Failed to delete upload {self.job.file_path}: {str(e)}")
+
+
+def start_bulk_job(runner_class, job, uploaded_file, options: Optional[Dict[str, Any]] = None):
+    """
+    Store uploaded_file for job and queue runner_class once the current
+    transaction commits.
+
+    options must be JSON serializable; runners read them from job.job_options.
+    """
+    uploaded_file.seek(0)
+    file_name = os.path.basename(uploaded_file.name)
+    storage_path = f"{get_bulk_job_settings()['STORAGE_PREFIX']}/{job._meta.model_name}/{job.pk}/{file_name}"
+
+    job.file_path = default_storage.save(storage_path, uploaded_file)
+    job.job_options = options or {}
+    job.save(update_fields=['file_path', 'job_options', 'updated_at'])
+
+    runner_path = runner_class.get_path()
+    transaction.on_commit(lambda: dispatch_bulk_job(runner_path, job.pk))
+
+
+def dispatch_bulk_job(runner_path: str, job_id, countdown: Optional[int] = None):
+    """
+    Queue a run of the job. If the broker is unavailable the job stays
+    pending and is picked up by resume_stalled_bulk_jobs.
+    """
+    from .tasks import run_bulk_job
+
+    job_model = get_runner_class(runner_path).job_model
+    try:
+        result = run_bulk_job.apply_async(args=[runner_path, job_id], countdown=countdown)
+    except Exception as e:
+        logger.error(f"Failed to queue bulk job {runner_path} {job_id}: {str(e)}")
+        return
+    job_model.objects.filter(pk=job_id).update(task_id=result.id)
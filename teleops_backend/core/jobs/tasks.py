@@ -0,0 +1,49 @@
+"""
+Celery tasks for bulk upload jobs
+"""
+
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .runner import dispatch_bulk_job, get_bulk_job_settings, get_runner_class
+
+logger = logging.getLogger(__name__)
+
+
+# acks_late + reject_on_worker_lost re-deliver the task when a worker dies
+# mid-job; the runner then resumes from the last committed chunk.
+@shared_task(acks_late=True, reject_on_worker_lost=True, ignore_result=True)
+def run_bulk_job(runner_path, job_id):
+    """Run (or resume) a bulk upload job"""
+    runner_class = get_runner_class(runner_path)
+    try:
+        job = runner_class.job_model.objects.get(pk=job_id)
+    except runner_class.job_model.DoesNotExist:
+        logger.warning(f"Bulk job {runner_path} {job_id} no longer exists")
+        return
+    runner_class(job).run()
+
+
+@shared_task(ignore_result=True)
+def resume_stalled_bulk_jobs():
+    """Re-queue unfinished jobs that made no progress for STALLED_AFTER seconds"""
+    config = get_bulk_job_settings()
+    cutoff = timezone.now() - timedelta(seconds=config['STALLED_AFTER'])
+
+    resumed = 0
+    for runner_path in config['RUNNERS']:
+        job_model = import_string(runner_path).job_model
+        stalled_ids = job_model.objects.filter(
+            status__in=['pending', 'processing'],
+            updated_at__lt=cutoff
+        ).exclude(file_path='').values_list('pk', flat=True)
+
+        for job_id in stalled_ids:
+            logger.info(f"Re-queueing stalled bulk job {runner_path} {job_id}")
+            dispatch_bulk_job(runner_path, job_id)
+            resumed += 1
+    return resumed
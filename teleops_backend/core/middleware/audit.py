@@ -2,9 +2,14 @@
 Audit middleware for tracking user actions and system events
 """
 
+import atexit
 import logging
 import json
 import hashlib
+import os
+import queue
+import random
+import threading
 from datetime import datetime
 from django.conf import settings
 from django.utils import timezone
@@ -17,6 +22,141 @@ SENSITIVE_FIELDS = {
     'refresh_token', 'authorization', 'x-api-key', 'csrf_token'
 }
 
+DEFAULT_AUDIT_PIPELINE_SETTINGS = {
+    'ASYNC': True,            # False writes events inline (tests, management commands)
+    'QUEUE_SIZE': 10000,      # Events buffered before new ones are dropped
+    'BATCH_SIZE': 200,        # Events written per writer wake-up
+    'FLUSH_INTERVAL': 1.0,    # Seconds the writer waits for a batch to fill
+    'SAMPLE_RATES': {},       # Path prefix -> fraction of requests audited
+}
+
+
+class AuditPipeline:
+    """
+    Bounded in-memory queue drained by a background batch writer.
+    
+    The request thread only captures raw request data and enqueues it;
+    decoding, sanitizing and serializing happen on the writer thread. When
+    the queue is full events are dropped (never blocking the request) and
+    counted, and the writer reports the drop count on its next batch.
+    """
+    
+    def __init__(self, audit_logger, config=None):
+        config = {**DEFAULT_AUDIT_PIPELINE_SETTINGS, **(config or {})}
+        self.audit_logger = audit_logger
+        self.async_mode = config['ASYNC']
+        self.batch_size = config['BATCH_SIZE']
+        self.flush_interval = config['FLUSH_INTERVAL']
+        # Longest prefix wins
+        self.sample_rates = sorted(config['SAMPLE_RATES'].items(), key=lambda item: len(item[0]), reverse=True)
+        self._queue = queue.Queue(maxsize=config['QUEUE_SIZE'])
+        self._lock = threading.Lock()
+        self._writer = None
+        self._writer_pid = None
+        self.dropped = 0
+        self._reported_dropped = 0
+        self.written = 0
+    
+    def should_sample(self, path):
+        """Decide once per request whether it is audited, using per-path sample rates."""
+        for prefix, rate in self.sample_rates:
+            if path.startswith(prefix):
+                return rate >= 1 or (rate > 0 and random.random() < rate)
+        return True
+    
+    def submit(self, builder, raw_event):
+        """
+        Queue raw_event for the writer, which logs builder(raw_event).
+        
+        builder returns a (level, message) tuple.
+        """
+        if not self.async_mode:
+            self._write_batch([(builder, raw_event)])
+            return
+        
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait((builder, raw_event))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+    
+    def flush(self):
+        """Write everything currently queued on the calling thread."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write_batch(batch)
+    
+    def get_stats(self):
+        return {
+            'queued': self._queue.qsize(),
+            'written': self.written,
+            'dropped': self.dropped,
+        }
+    
+    def _ensure_writer(self):
+        # Threads do not survive fork, so (re)start the writer in each worker
+        if self._writer_pid == os.getpid() and self._writer.is_alive():
+            return
+        with self._lock:
+            if self._writer_pid == os.getpid() and self._writer.is_alive():
+                return
+            self._writer = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+            self._writer_pid = os.getpid()
+            self._writer.start()
+    
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # Gather whatever else arrives within the flush interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=self.flush_interval))
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+    
+    def _write_batch(self, batch):
+        for builder, raw_event in batch:
+            try:
+                level, message = builder(raw_event)
+                self.audit_logger.log(level, message)
+            except Exception as e:
+                logger.error(f"Error writing audit event: {e}")
+        self.written += len(batch)
+        
+        dropped = self.dropped
+        if dropped != self._reported_dropped:
+            logger.warning(
+                f"Audit queue full: {dropped - self._reported_dropped} events dropped "
+                f"({dropped} since start)"
+            )
+            self._reported_dropped = dropped
+
+
+_audit_pipeline = None
+_audit_pipeline_lock = threading.Lock()
+
+
+def get_audit_pipeline():
+    """Get the process-wide audit pipeline."""
+    global _audit_pipeline
+    if _audit_pipeline is None:
+        with _audit_pipeline_lock:
+            if _audit_pipeline is None:
+                _audit_pipeline = AuditPipeline(
+                    logging.getLogger('teleops.audit'),
+                    getattr(settings, 'AUDIT_PIPELINE', None)
+                )
+                atexit.register(_audit_pipeline.flush)
+    return _audit_pipeline
+
+
 class AuditMiddleware:
     """
     Modern audit middleware for tracking user actions and system events
@@ -26,17 +166,21 @@ class AuditMiddleware:
         self.get_response = get_response
         self.audit_logger = logging.getLogger('teleops.audit')
         self.max_log_size = getattr(settings, 'AUDIT_MAX_LOG_SIZE', 1000)
+        self.pipeline = get_audit_pipeline()
     
     def __call__(self, request):
+        # Sample once so a request and its response are audited together
+        audited = self.should_audit_request(request) and self.pipeline.should_sample(request.path)
+        
         # Log request if needed
-        if self.should_audit_request(request):
+        if audited:
             self.log_request(request)
         
         # Process request
         response = self.get_response(request)
         
         # Log response if needed
-        if self.should_audit_response(request, response):
+        if audited and self.should_audit_response(request, response):
             self.log_response(request, response)
             
         return response
@@ -71,76 +215,114 @@ class AuditMiddleware:
         return self.should_audit_request(request)
     
     def log_request(self, request):
-        """Log incoming request details with data sanitization"""
+        """Queue incoming request details; sanitization happens on the writer thread"""
         try:
-            audit_data = {
-                'timestamp': timezone.now().isoformat(),
-                'type': 'request',
+            raw_event = {
+                'timestamp': timezone.now(),
                 'method': request.method,
                 'path': request.path,
-                'query_params': self._sanitize_data(dict(request.GET)),
-                'user_id': getattr(request.user, 'id', None) if hasattr(request, 'user') and request.user.is_authenticated else None,
-                'tenant_id': str(getattr(request.tenant, 'id', None)) if hasattr(request, 'tenant') and getattr(request.tenant, 'id', None) else None,
+                'query_params': dict(request.GET),
+                'user_id': self._get_user_id(request),
+                'tenant_id': self._get_tenant_id(request),
                 'ip_address': self._get_client_ip(request),
-                'user_agent': self._truncate_string(request.META.get('HTTP_USER_AGENT', ''), 200),
-                'headers': self._sanitize_headers(dict(request.headers)),
-                'session_key': self._hash_session_key(request),
+                'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+                'headers': dict(request.headers),
+                'session_key': self._get_session_key(request),
             }
             
-            # Log request body for write operations (with sanitization)
+            # Capture request body for write operations
             if request.method in ['POST', 'PUT', 'PATCH']:
-                audit_data['content_type'] = request.content_type
+                raw_event['content_type'] = request.content_type
                 if request.content_type and 'application/json' in request.content_type:
-                    try:
-                        body_data = json.loads(request.body.decode('utf-8'))
-                        audit_data['body'] = self._sanitize_data(body_data)
-                    except (json.JSONDecodeError, UnicodeDecodeError):
-                        audit_data['body'] = '[Unable to decode request body]'
-                elif request.content_type and 'multipart/form-data' in request.content_type:
-                    audit_data['body'] = '[File upload - content not logged]'
-                else:
-                    audit_data['body'] = '[Non-JSON content not logged]'
-            
-            # Truncate the log message if too large
-            log_message = json.dumps(audit_data, default=str)
-            if len(log_message) > self.max_log_size:
-                audit_data['body'] = '[Content too large - truncated]'
-                log_message = json.dumps(audit_data, default=str)
+                    raw_event['body'] = request.body
             
-            self.audit_logger.info(log_message)
+            self.pipeline.submit(self._build_request_event, raw_event)
             
         except Exception as e:
             logger.error(f"Error logging request audit: {e}")
     
+    def _build_request_event(self, raw_event):
+        """Format a queued request event (runs on the writer thread)"""
+        audit_data = {
+            'timestamp': raw_event['timestamp'].isoformat(),
+            'type': 'request',
+            'method': raw_event['method'],
+            'path': raw_event['path'],
+            'query_params': self._sanitize_data(raw_event['query_params']),
+            'user_id': raw_event['user_id'],
+            'tenant_id': raw_event['tenant_id'],
+            'ip_address': raw_event['ip_address'],
+            'user_agent': self._truncate_string(raw_event['user_agent'], 200),
+            'headers': self._sanitize_headers(raw_event['headers']),
+            'session_key': self._hash_session_key(raw_event['session_key']),
+        }
+        
+        # Log request body for write operations (with sanitization)
+        if raw_event['method'] in ['POST', 'PUT', 'PATCH']:
+            content_type = raw_event['content_type']
+            audit_data['content_type'] = content_type
+            if content_type and 'application/json' in content_type:
+                try:
+                    body_data = json.loads(raw_event['body'].decode('utf-8'))
+                    audit_data['body'] = self._sanitize_data(body_data)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    audit_data['body'] = '[Unable to decode request body]'
+            elif content_type and 'multipart/form-data' in content_type:
+                audit_data['body'] = '[File upload - content not logged]'
+            else:
+                audit_data['body'] = '[Non-JSON content not logged]'
+        
+        # Truncate the log message if too large
+        log_message = json.dumps(audit_data, default=str)
+        if len(log_message) > self.max_log_size:
+            audit_data['body'] = '[Content too large - truncated]'
+            log_message = json.dumps(audit_data, default=str)
+        
+        return logging.INFO, log_message
+    
     def log_response(self, request, response):
         """Log response details"""
-        audit_data = {
-            'timestamp': datetime.utcnow().isoformat(),
+        self.pipeline.submit(self._build_response_event, {
+            'timestamp': datetime.utcnow(),
             'type': 'response',
             'method': request.method,
             'path': request.path,
             'status_code': response.status_code,
-            'user_id': getattr(request.user, 'id', None) if hasattr(request, 'user') else None,
-            'tenant_id': str(getattr(request.tenant, 'id', None)) if hasattr(request, 'tenant') and getattr(request.tenant, 'id', None) else None,
-        }
-        
-        self.audit_logger.info(f"Response: {json.dumps(audit_data)}")
+            'user_id': self._get_user_id(request),
+            'tenant_id': self._get_tenant_id(request),
+        })
+    
+    def _build_response_event(self, audit_data):
+        audit_data['timestamp'] = audit_data['timestamp'].isoformat()
+        return logging.INFO, f"Response: {json.dumps(audit_data)}"
     
     def log_exception(self, request, exception):
         """Log exception details"""
-        audit_data = {
-            'timestamp': datetime.utcnow().isoformat(),
+        self.pipeline.submit(self._build_exception_event, {
+            'timestamp': datetime.utcnow(),
             'type': 'exception',
             'method': request.method,
             'path': request.path,
             'exception_type': type(exception).__name__,
             'exception_message': str(exception),
-            'user_id': getattr(request.user, 'id', None) if hasattr(request, 'user') else None,
-            'tenant_id': str(getattr(request.tenant, 'id', None)) if hasattr(request, 'tenant') and getattr(request.tenant, 'id', None) else None,
+            'user_id': self._get_user_id(request),
+            'tenant_id': self._get_tenant_id(request),
             'ip_address': self._get_client_ip(request),
-        }
-        
-        self.audit_logger.error(f"Exception: {json.dumps(audit_data)}")
+        })
+    
+    def _build_exception_event(self, audit_data):
+        audit_data['timestamp'] = audit_data['timestamp'].isoformat()
+        return logging.ERROR, f"Exception: {json.dumps(audit_data)}"
+    
+    def _get_user_id(self, request):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return user.id
+        return None
+    
+    def _get_tenant_id(self, request):
+        tenant_id = getattr(getattr(request, 'tenant', None), 'id', None)
+        return str(tenant_id) if tenant_id else None
     
     def _get_client_ip(self, request):
         """Get client IP address"""
@@ -181,10 +363,15 @@ class AuditMiddleware:
                 sanitized[key] = self._truncate_string(str(value), 200)
         return sanitized
     
-    def _hash_session_key(self, request):
+    def _get_session_key(self, request):
+        if hasattr(request, 'session'):
+            return request.session.session_key
+        return None
+    
+    def _hash_session_key(self, session_key):
         """Create a hash of session key for tracking without exposing actual key"""
-        if hasattr(request, 'session') and request.session.session_key:
-            return hashlib.sha256(request.session.session_key.encode()).hexdigest()[:16]
+        if session_key:
+            return hashlib.sha256(session_key.encode()).hexdigest()[:16]
         return None
     
     def _truncate_string(self, text, max_length):
@@ -5,9 +5,9 @@ Automatically enforces permission checks based on feature registry
 
 import logging
 from django.http import JsonResponse
-from django.urls import resolve
 from apps.tenants.services.feature_registry import get_feature_registry
 from apps.tenants.services import get_rbac_service
+from core.permissions.context import get_permission_context
 
 logger = logging.getLogger(__name__)
 
@@ -34,43 +34,31 @@ class PermissionEnforcementMiddleware:
         if not request.path.startswith('/api/'):
             return None
         
-        # Skip if user is not authenticated
-        if not hasattr(request, 'user') or not request.user.is_authenticated:
-            return None
+        # Find features required for this endpoint (precompiled router, no
+        # URL resolution needed)
+        endpoint_pattern = request.path
+        required_features = self.feature_registry.get_features_for_endpoint(endpoint_pattern)
         
-        # Skip if no tenant profile
-        if not hasattr(request.user, 'tenant_user_profile'):
+        if not required_features:
+            # No mapped features for this endpoint
             return None
         
-        # Get current URL pattern
-        try:
-            resolved = resolve(request.path)
-            endpoint_pattern = request.path
-        except:
+        # Skip if user is not authenticated
+        if not hasattr(request, 'user') or not request.user.is_authenticated:
             return None
         
-        # Find features required for this endpoint
-        required_features = self._get_required_permissions_for_endpoint(endpoint_pattern)
-        
-        if not required_features:
-            # No mapped features for this endpoint
+        # Skip if no tenant profile
+        permission_context = get_permission_context(request)
+        if permission_context.profile is None:
             return None
         
-        # Check if user has required permissions
-        tenant = request.user.tenant_user_profile.tenant
-        rbac_service = get_rbac_service(tenant)
-        user_profile = request.user.tenant_user_profile
-        
         try:
-            effective_perms = rbac_service.get_user_effective_permissions(user_profile)
-            user_permission_codes = set(effective_perms.get('permissions', {}).keys())
-            
             # Check if user has permission for ANY of the required features
             has_permission = False
             for feature in required_features:
                 # Check if user has permission for this feature's resource and actions
-                has_permission = self._check_feature_permission(
-                    user_permission_codes, feature.resource_type, feature.required_actions
+                has_permission = permission_context.has_resource_actions(
+                    feature.resource_type, feature.required_actions
                 )
                 if has_permission:
                     break
@@ -79,7 +67,7 @@ class PermissionEnforcementMiddleware:
                 feature_names = [f.feature_name for f in required_features]
                 logger.warning(
                     f"User {request.user.id} denied access to {endpoint_pattern}. "
-                    f"Required features: {feature_names}, Has permissions: {list(user_permission_codes)}"
+                    f"Required features: {feature_names}, Has permissions: {list(permission_context.permissions)}"
                 )
                 
                 return JsonResponse({
@@ -97,57 +85,9 @@ class PermissionEnforcementMiddleware:
         
         return None
     
-    def _check_feature_permission(self, user_permission_codes, resource_type, required_actions):
-        """Check if user has the required actions for a resource type"""
-        # Check for specific action permissions (exact match)
-        for action in required_actions:
-            permission_code = f"{resource_type}.{action}"
-            if permission_code in user_permission_codes:
-                return True
-        
-        # Check for compound permissions (e.g., site.read_create for create action)
-        for code in user_permission_codes:
-            if code.startswith(f"{resource_type}."):
-                # Extract actions from permission code
-                if '.' in code:
-                    actions_part = code.split('.', 1)[1]  # Get part after 'resource.'
-                    user_actions = actions_part.split('_')
-                    # Check if all required actions are covered
-                    if all(action in user_actions for action in required_actions):
-                        return True
-        
-        return False
-    
     def _get_required_permissions_for_endpoint(self, endpoint_pattern):
         """Get required permissions for an API endpoint"""
-        required_features = []
-        
-        # Check all registered features
-        for feature in self.feature_registry._features.values():
-            for api_endpoint in feature.api_endpoints:
-                if self._endpoint_matches_pattern(endpoint_pattern, api_endpoint):
-                    required_features.append(feature)
-        
-        return required_features
-    
-    def _endpoint_matches_pattern(self, actual_endpoint, pattern):
-        """Check if an endpoint matches a pattern (supports {id} placeholders)"""
-        
-        # Simple exact match
-        if actual_endpoint == pattern:
-            return True
-        
-        # Pattern matching for parametrized URLs
-        import re
-        
-        # Convert pattern like "/api/v1/deviations/{id}/" to regex
-        regex_pattern = pattern.replace('{id}', r'\d+').replace('{', '').replace('}', '')
-        regex_pattern = f"^{regex_pattern}$"
-        
-        try:
-            return bool(re.match(regex_pattern, actual_endpoint))
-        except:
-            return False
+        return list(self.feature_registry.get_features_for_endpoint(endpoint_pattern))
 
 class PermissionValidationUtils:
     """Utility functions for permission validation"""
@@ -170,11 +110,10 @@ class PermissionValidationUtils:
         
         try:
             effective_perms = rbac_service.get_user_effective_permissions(user.tenant_user_profile)
-            user_permission_codes = set(effective_perms.get('permissions', {}).keys())
             
-            # Use the feature registry's method for checking resource access
+            # Set-membership test against the precomputed resource_actions map
             return feature_registry.user_has_resource_access(
-                effective_perms.get('permissions', {}), 
+                effective_perms, 
                 feature.resource_type, 
                 feature.required_actions
             )
@@ -185,13 +124,19 @@ class PermissionValidationUtils:
     def get_accessible_features(user) -> list:
         """Get list of features user has access to"""
         feature_registry = get_feature_registry()
-        accessible_features = []
         
-        for feature_id, feature in feature_registry._features.items():
-            if PermissionValidationUtils.check_feature_permission(user, feature_id):
-                accessible_features.append(feature)
+        if not hasattr(user, 'tenant_user_profile'):
+            return []
+        
+        tenant = user.tenant_user_profile.tenant
+        rbac_service = get_rbac_service(tenant)
         
-        return accessible_features
+        try:
+            # Resolve permissions once, then every feature is a set-membership test
+            effective_perms = rbac_service.get_user_effective_permissions(user.tenant_user_profile)
+            return feature_registry.get_features_user_can_access(effective_perms)
+        except:
+            return []
     
     @staticmethod
     def validate_permission_mapping(permission_code: str) -> dict:
@@ -5,7 +5,7 @@ Tenant middleware for Circle-Based Multi-Tenant request scoping
 import logging
 from django.http import Http404
 from django.conf import settings
-from apps.tenants.models import Tenant
+from apps.tenants.services.tenant_cache import get_tenant_cache
 
 logger = logging.getLogger(__name__)
 
@@ -40,14 +40,14 @@ class TenantMiddleware:
         tenant_id = request.headers.get('X-Tenant-ID')
         if tenant_id:
             try:
-                tenant = Tenant.objects.select_related('circle').get(id=tenant_id, is_active=True)
+                tenant = get_tenant_cache().get_by_id(tenant_id)
+                if tenant is None:
+                    logger.warning(f"Tenant not found or inactive: {tenant_id}")
+                    request.tenant_error = f"Tenant not found: {tenant_id}"
             except ValueError as e:
                 logger.warning(f"Invalid tenant ID format in header: {tenant_id} - {e}")
                 # Set error context for better debugging
                 request.tenant_error = f"Invalid tenant ID format: {tenant_id}"
-            except Tenant.DoesNotExist:
-                logger.warning(f"Tenant not found or inactive: {tenant_id}")
-                request.tenant_error = f"Tenant not found: {tenant_id}"
             except Exception as e:
                 logger.error(f"Unexpected error fetching tenant {tenant_id}: {e}")
                 request.tenant_error = f"Error fetching tenant: {str(e)}"
@@ -83,14 +83,10 @@ class TenantMiddleware:
         if subdomain in ['www', 'api', 'admin', 'localhost', '127']:
             return None
         
-        try:
-            return Tenant.objects.get(
-                subdomain=subdomain,
-                is_active=True
-            )
-        except Tenant.DoesNotExist:
+        tenant = get_tenant_cache().get_by_subdomain(subdomain)
+        if tenant is None:
             logger.warning(f"Tenant not found for subdomain: {subdomain}")
-            return None
+        return tenant
     
     def get_tenant_from_path(self, request):
         """
@@ -113,8 +109,8 @@ class TenantMiddleware:
                     return None
                     
                 try:
-                    return Tenant.objects.get(id=tenant_id, is_active=True)
-                except (ValueError, Tenant.DoesNotExist):
+                    return get_tenant_cache().get_by_id(tenant_id)
+                except ValueError:
                     pass
         
         return None
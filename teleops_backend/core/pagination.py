@@ -2,23 +2,234 @@
 Custom pagination classes for Teleops API
 """
 
+import base64
+import datetime
+import json
+from collections import OrderedDict
+from typing import Any, List, Optional, Sequence
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
-from collections import OrderedDict
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# Default keyset for cursor pagination: newest first, id breaks ties
+DEFAULT_KEYSET_ORDERING = ('-created_at', '-id')
+
+CURSOR_QUERY_PARAM = 'cursor'
+PAGINATION_MODE_QUERY_PARAM = 'pagination'  # ?pagination=cursor starts a keyset walk
+COUNT_MODE_QUERY_PARAM = 'count'            # ?count=exact|estimate in cursor mode
+
+
+class InvalidCursor(Exception):
+    """The cursor query parameter could not be decoded"""
+
+
+class KeysetPage:
+    """One page of a keyset walk and the cursors around it"""
+
+    def __init__(self, rows: List[Any], next_cursor: Optional[str], previous_cursor: Optional[str]):
+        self.rows = rows
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
 
 
-class StandardResultsSetPagination(PageNumberPagination):
+def _flip(field: str) -> str:
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+def _row_value(row, name: str):
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+class CursorJSONEncoder(DjangoJSONEncoder):
     """
-    Standard pagination class for Circle Portal APIs
+    DjangoJSONEncoder, but datetimes keep their microseconds: a position cut
+    to milliseconds would skip the rest of that millisecond on the next page
     """
-    page_size = 20
-    page_size_query_param = 'page_size'
-    max_page_size = 100
-    
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values: Sequence[Any], backwards: bool = False) -> str:
+    payload = json.dumps({'v': list(values), 'b': backwards}, cls=CursorJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, model, ordering: Sequence[str]):
+    """Return (position, backwards); position values are converted with the model fields"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        values, backwards = payload['v'], bool(payload.get('b', False))
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor(cursor)
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise InvalidCursor(cursor)
+
+    position = []
+    for field, value in zip(ordering, values):
+        try:
+            position.append(model._meta.get_field(field.lstrip('-')).to_python(value))
+        except FieldDoesNotExist:
+            position.append(value)
+        except ValidationError:
+            raise InvalidCursor(cursor)
+    return position, backwards
+
+
+def _after(ordering: Sequence[str], position: Sequence[Any]) -> Q:
+    """Rows strictly after position in the given ordering (lexicographic keyset)"""
+    condition = None
+    equal = {}
+    for field, value in zip(ordering, position):
+        name = field.lstrip('-')
+        step = Q(**equal, **{f"{name}__{'lt' if field.startswith('-') else 'gt'}": value})
+        condition = step if condition is None else condition | step
+        equal[name] = value
+    return condition
+
+
+def paginate_keyset(queryset, page_size: int, cursor: Optional[str] = None,
+                    ordering: Sequence[str] = DEFAULT_KEYSET_ORDERING) -> KeysetPage:
+    """
+    Fetch one page of queryset in `ordering` after (or before) the cursor.
+
+    ordering must end in a unique field (id) and should be backed by an index;
+    every page then costs one indexed range scan of page_size + 1 rows however
+    deep the walk is. Raises InvalidCursor for a malformed cursor.
+    """
+    position, backwards = (None, False)
+    if cursor:
+        position, backwards = decode_cursor(cursor, queryset.model, ordering)
+
+    walk = [_flip(field) for field in ordering] if backwards else list(ordering)
+    queryset = queryset.order_by(*walk)
+    if position is not None:
+        queryset = queryset.filter(_after(walk, position))
+
+    rows = list(queryset[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if backwards:
+        rows.reverse()
+
+    def cursor_at(row, to_previous):
+        return encode_cursor([_row_value(row, field.lstrip('-')) for field in ordering], to_previous)
+
+    has_next = True if backwards else has_more
+    has_previous = has_more if backwards else position is not None
+    return KeysetPage(
+        rows,
+        cursor_at(rows[-1], False) if rows and has_next else None,
+        cursor_at(rows[0], True) if rows and has_previous else None,
+    )
+
+
+def estimate_count(queryset) -> int:
+    """
+    Planner row estimate for queryset on PostgreSQL (EXPLAIN, no scan); an
+    exact COUNT(*) on other backends.
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def keyset_count(queryset, count_mode: Optional[str]) -> Optional[int]:
+    """Total for a cursor page: exact, estimated or (by default) skipped"""
+    if count_mode == 'exact':
+        return queryset.count()
+    if count_mode == 'estimate':
+        return estimate_count(queryset)
+    return None
+
+
+def is_keyset_request(request) -> bool:
+    params = getattr(request, 'query_params', request.GET)
+    return bool(params.get(CURSOR_QUERY_PARAM)) or params.get(PAGINATION_MODE_QUERY_PARAM) == 'cursor'
+
+
+class KeysetPaginationMixin:
+    """
+    Adds a cursor mode to page-number pagination.
+
+    Views opt in by setting keyset_ordering (or get_keyset_ordering() for
+    per-action orderings, returning None where cursors are not supported).
+    On those views, requests with ?pagination=cursor (or a cursor) are
+    paginated by keyset on that ordering instead of OFFSET, and the total is
+    only computed when ?count=exact|estimate asks for it. Everything else,
+    including views that did not opt in, keeps page-number pagination and
+    the view's own ordering.
+    """
+
+    @staticmethod
+    def get_keyset_ordering(view) -> Optional[Sequence[str]]:
+        if view is None:
+            return None
+        getter = getattr(view, 'get_keyset_ordering', None)
+        if callable(getter):
+            return getter()
+        return getattr(view, 'keyset_ordering', None)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_page = None
+        ordering = self.get_keyset_ordering(view) if is_keyset_request(request) else None
+        if not ordering:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        try:
+            self.keyset_page = paginate_keyset(
+                queryset, self.get_page_size(request),
+                request.query_params.get(CURSOR_QUERY_PARAM), ordering,
+            )
+        except InvalidCursor:
+            raise NotFound('Invalid cursor')
+        self.keyset_total = keyset_count(queryset, request.query_params.get(COUNT_MODE_QUERY_PARAM))
+        return self.keyset_page.rows
+
+    def _cursor_link(self, cursor: Optional[str]) -> Optional[str]:
+        if cursor is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, CURSOR_QUERY_PARAM, cursor)
+
     def get_paginated_response(self, data):
         """
         Return a paginated style Response object with additional metadata
         """
+        if self.keyset_page is not None:
+            return Response(OrderedDict([
+                ('count', self.keyset_total),
+                ('next', self._cursor_link(self.keyset_page.next_cursor)),
+                ('previous', self._cursor_link(self.keyset_page.previous_cursor)),
+                ('page_size', self.get_page_size(self.request)),
+                ('results', data)
+            ]))
+
         return Response(OrderedDict([
             ('count', self.page.paginator.count),
             ('next', self.get_next_link()),
@@ -30,50 +241,31 @@ class StandardResultsSetPagination(PageNumberPagination):
         ]))
 
 
-class LargeResultsSetPagination(PageNumberPagination):
+class StandardResultsSetPagination(KeysetPaginationMixin, PageNumberPagination):
+    """
+    Standard pagination class for Circle Portal APIs
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class LargeResultsSetPagination(KeysetPaginationMixin, PageNumberPagination):
     """
     Pagination class for large datasets (e.g., sites, tasks)
     """
     page_size = 50
     page_size_query_param = 'page_size'
     max_page_size = 200
-    
-    def get_paginated_response(self, data):
-        """
-        Return a paginated style Response object with additional metadata
-        """
-        return Response(OrderedDict([
-            ('count', self.page.paginator.count),
-            ('next', self.get_next_link()),
-            ('previous', self.get_previous_link()),
-            ('page_size', self.page_size),
-            ('total_pages', self.page.paginator.num_pages),
-            ('current_page', self.page.number),
-            ('results', data)
-        ]))
 
 
-class SmallResultsSetPagination(PageNumberPagination):
+class SmallResultsSetPagination(KeysetPaginationMixin, PageNumberPagination):
     """
     Pagination class for small datasets (e.g., projects)
     """
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 50
-    
-    def get_paginated_response(self, data):
-        """
-        Return a paginated style Response object with additional metadata
-        """
-        return Response(OrderedDict([
-            ('count', self.page.paginator.count),
-            ('next', self.get_next_link()),
-            ('previous', self.get_previous_link()),
-            ('page_size', self.page_size),
-            ('total_pages', self.page.paginator.num_pages),
-            ('current_page', self.page.number),
-            ('results', data)
-        ]))
 
 
 class NoPagination:
@@ -85,4 +277,4 @@ class NoPagination:
         return None
 
     def get_paginated_response(self, data):
-        return Response(data) 
\ No newline at end of file
+        return Response(data)
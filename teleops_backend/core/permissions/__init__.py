@@ -15,6 +15,7 @@ from .tenant_permissions import (
     VendorRelationshipPermission,
     HasRBACPermission
 )
+from .context import PermissionContext, get_permission_context
 
 __all__ = [
     'TenantBasedPermission',
@@ -29,4 +30,6 @@ __all__ = [
     'EquipmentVerificationPermission',
     'VendorRelationshipPermission',
     'HasRBACPermission',
+    'PermissionContext',
+    'get_permission_context',
 ]
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+Request-scoped permission context shared by middleware, DRF permission
+classes and views
+"""
+
+import logging
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PermissionContext:
+    """
+    Lazily computed view of the requesting user's tenant permissions.
+
+    Each piece (profile, effective permissions, designations) is loaded at
+    most once per request, however many permission checks consult it.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.user_key = (user.__class__, getattr(user, 'pk', None))
+
+    @cached_property
+    def profile(self):
+        """The user's TenantUserProfile, or None"""
+        if not self.user.is_authenticated:
+            return None
+        try:
+            return self.user.tenant_user_profile
+        except Exception:
+            return None
+
+    @cached_property
+    def tenant(self):
+        return self.profile.tenant if self.profile else None
+
+    @cached_property
+    def rbac_service(self):
+        if self.tenant is None:
+            return None
+        from apps.tenants.services.rbac_service import get_rbac_service
+        return get_rbac_service(self.tenant)
+
+    @cached_property
+    def effective_permissions(self) -> Dict[str, Any]:
+        """Effective permissions payload from the RBAC service ({} without a profile)"""
+        if self.rbac_service is None:
+            return {}
+        return self.rbac_service.get_user_effective_permissions(self.profile)
+
+    @property
+    def permissions(self) -> Dict[str, Any]:
+        """permission_code -> permission details"""
+        return self.effective_permissions.get('permissions', {})
+
+    @cached_property
+    def designations(self) -> List:
+        """Currently effective designations (profile.all_designations, evaluated once)"""
+        if self.profile is None:
+            return []
+        return list(self.profile.all_designations)
+
+    def has_permission(self, permission_code: str) -> bool:
+        """Check for a permission code in the user's effective permissions"""
+        return permission_code in self.permissions
+
+    def has_resource_action(self, resource_type: str, action: str) -> bool:
+        """
+        Check for '<resource>.<action>' or a compound code covering the action
+        (e.g. site.read_create for create)
+        """
+        permissions = self.permissions
+        if f"{resource_type}.{action}" in permissions:
+            return True
+
+        prefix = f"{resource_type}."
+        for code in permissions:
+            if code.startswith(prefix) and action in code[len(prefix):].split('_'):
+                return True
+        return False
+
+    def has_resource_actions(self, resource_type: str, actions: List[str]) -> bool:
+        """
+        Check for any exact '<resource>.<action>' code, or one compound code
+        covering every action
+        """
+        permissions = self.permissions
+        for action in actions:
+            if f"{resource_type}.{action}" in permissions:
+                return True
+
+        prefix = f"{resource_type}."
+        for code in permissions:
+            if code.startswith(prefix):
+                user_actions = code[len(prefix):].split('_')
+                if all(action in user_actions for action in actions):
+                    return True
+        return False
+
+    def check_permission(self, permission_code: str, scope_context: Optional[Dict] = None) -> Tuple[bool, Dict[str, Any]]:
+        """TenantRBACService.check_permission against the already loaded permissions"""
+        if self.rbac_service is None:
+            return False, {'reason': 'no_tenant_profile'}
+        return self.rbac_service.check_permission(
+            self.profile,
+            permission_code,
+            scope_context,
+            effective_permissions=self.effective_permissions
+        )
+
+
+def get_permission_context(request) -> PermissionContext:
+    """
+    Return the permission context for request, creating it on first use.
+
+    The context lives on the underlying HttpRequest so middleware, DRF
+    permission classes and views share it. It is rebuilt if request.user
+    changes (e.g. JWT authentication runs after the middleware).
+    """
+    http_request = getattr(request, '_request', request)
+    user = request.user
+    context = getattr(http_request, 'rbac_context', None)
+    if context is None or context.user_key != (user.__class__, getattr(user, 'pk', None)):
+        context = PermissionContext(user)
+        http_request.rbac_context = context
+    return context
@@ -6,6 +6,7 @@ import logging
 from rest_framework.permissions import BasePermission
 from django.core.exceptions import PermissionDenied
 from apps.tenants.models import Tenant
+from .context import get_permission_context
 
 logger = logging.getLogger(__name__)
 
@@ -95,7 +96,7 @@ class IsTenantAdmin(BasePermission):
             profile = request.user.tenant_user_profile
             if profile and profile.tenant_id == tenant.id:
                 # Check if user has admin designation or permissions
-                designations = profile.all_designations
+                designations = get_permission_context(request).designations
                 for designation in designations:
                     if designation.can_manage_users or designation.approval_authority_level > 0:
                         return True
@@ -152,20 +153,13 @@ class CanViewRBACDashboard(BasePermission):
         if hasattr(request.user, 'tenant_user_profile'):
             profile = request.user.tenant_user_profile
             if profile and profile.tenant_id == tenant.id:
-                # Import here to avoid circular imports
-                from apps.tenants.services import get_rbac_service
-                
-                rbac_service = get_rbac_service(tenant)
-                has_view_permission, _ = rbac_service.check_permission(
-                    user_profile=profile,
-                    permission_code='rbac.read'
-                )
+                has_view_permission, _ = get_permission_context(request).check_permission('rbac.read')
                 
                 if has_view_permission:
                     return True
                 
                 # Also check if user has admin designation or permissions
-                designations = profile.all_designations
+                designations = get_permission_context(request).designations
                 for designation in designations:
                     if designation.can_manage_users or designation.approval_authority_level > 0:
                         return True
@@ -245,7 +239,7 @@ class ProjectPermission(BasePermission):
         if hasattr(request.user, 'tenant_user_profile'):
             profile = request.user.tenant_user_profile
             if profile:
-                designations = profile.all_designations
+                designations = get_permission_context(request).designations
                 for designation in designations:
                     if designation.can_create_projects:
                         return True
@@ -261,7 +255,7 @@ class ProjectPermission(BasePermission):
         if hasattr(request.user, 'tenant_user_profile'):
             profile = request.user.tenant_user_profile
             if profile:
-                designations = profile.all_designations
+                designations = get_permission_context(request).designations
                 for designation in designations:
                     if designation.can_create_projects or designation.can_manage_users:
                         return True
@@ -322,7 +316,7 @@ class TaskPermission(BasePermission):
         if hasattr(request.user, 'tenant_user_profile'):
             profile = request.user.tenant_user_profile
             if profile:
-                designations = profile.all_designations
+                designations = get_permission_context(request).designations
                 for designation in designations:
                     if designation.can_assign_tasks or designation.can_create_projects:
                         return True
@@ -338,7 +332,7 @@ class TaskPermission(BasePermission):
         if hasattr(request.user, 'tenant_user_profile'):
             profile = request.user.tenant_user_profile
             if profile:
-                designations = profile.all_designations
+                designations = get_permission_context(request).designations
                 for designation in designations:
                     if designation.can_assign_tasks or designation.can_manage_users:
                         return True
@@ -403,7 +397,7 @@ class EquipmentVerificationPermission(BasePermission):
         if hasattr(request.user, 'tenant_user_profile'):
             profile = request.user.tenant_user_profile
             if profile:
-                designations = profile.all_designations
+                designations = get_permission_context(request).designations
                 for designation in designations:
                     # Check if designation is field-capable and has verification permissions
                     if designation.designation_type == 'field':
@@ -458,7 +452,7 @@ class ReportingPermission(BasePermission):
         if hasattr(request.user, 'tenant_user_profile'):
             profile = request.user.tenant_user_profile
             if profile:
-                designations = profile.all_designations
+                designations = get_permission_context(request).designations
                 for designation in designations:
                     if designation.can_access_reports:
                         return True
@@ -500,13 +494,17 @@ class HasRBACPermission(BasePermission):
             return False
         
         try:
-            # Import RBAC service
-            from apps.tenants.services.rbac_service import get_rbac_service
-            rbac_service = get_rbac_service(tenant)
-            
-            # Get user's effective permissions
-            effective_perms = rbac_service.get_user_effective_permissions(profile, force_refresh=False)
-            user_permissions = effective_perms.get('permissions', {})
+            if tenant.id == profile.tenant_id:
+                # Reuse the permissions already loaded for this request
+                user_permissions = get_permission_context(request).permissions
+            else:
+                # Import RBAC service
+                from apps.tenants.services.rbac_service import get_rbac_service
+                rbac_service = get_rbac_service(tenant)
+                
+                # Get user's effective permissions
+                effective_perms = rbac_service.get_user_effective_permissions(profile, force_refresh=False)
+                user_permissions = effective_perms.get('permissions', {})
             
             # Check if user has the required permission
             return required_permission in user_permissions
@@ -0,0 +1,37 @@
+"""
+Text Search Backend
+Case-insensitive substring search over a model's search fields, backed on
+PostgreSQL by pg_trgm GIN indexes that match the SQL Django emits for
+icontains (UPPER(column::text) LIKE UPPER('%term%')).
+"""
+
+from functools import reduce
+from operator import or_
+from typing import Sequence
+
+from django.db.models import Q, QuerySet
+
+
+class TextSearch:
+    """
+    Filter a queryset to rows where any of `fields` contains the term.
+
+    Every field should have a trigram index (see the *_search_trigram_indexes
+    migrations); the OR of the per-column conditions then runs as a BitmapOr
+    of index scans instead of a sequential scan. Other backends run the same
+    query unindexed.
+    """
+
+    def __init__(self, fields: Sequence[str]):
+        self.fields = tuple(fields)
+
+    def condition(self, term: str) -> Q:
+        return reduce(or_, (Q(**{f'{field}__icontains': term}) for field in self.fields))
+
+    def filter(self, queryset: QuerySet, term: str) -> QuerySet:
+        """Apply the search; a blank term leaves the queryset unchanged"""
+        term = (term or '').strip()
+        if not term:
+            return queryset
+        return queryset.filter(self.condition(term))
+
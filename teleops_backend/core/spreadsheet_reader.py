@@ -0,0 +1,271 @@
+"""
+Streaming Spreadsheet Reader
+Iterates uploaded Excel/CSV files in fixed-size chunks so import memory is
+bounded by the chunk size rather than by the size of the upload.
+"""
+
+import codecs
+import logging
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bytes inspected to pick a CSV encoding when none is given
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+
+def _is_blank(values: Tuple) -> bool:
+    return all(v is None or (isinstance(v, str) and not v.strip()) for v in values)
+
+
+def _unique_headers(values: List[str]) -> List[str]:
+    """Name empty headers and de-duplicate repeated ones the way pandas does"""
+    headers = []
+    seen: Dict[str, int] = {}
+    for index, value in enumerate(values):
+        header = value or f"Unnamed: {index}"
+        if header in seen:
+            seen[header] += 1
+            header = f"{header}.{seen[header]}"
+        else:
+            seen[header] = 0
+        headers.append(header)
+    return headers
+
+
+class SpreadsheetReader:
+    """
+    Lazily read an uploaded .xlsx/.xls/.csv file.
+
+    XLSX is streamed with openpyxl read_only mode. The header row is the first
+    row, as pandas reads it; the equipment bulk upload passes header_scan=10
+    to take the first non-empty row within the first 10 instead. The sheet is
+    `sheet` when given, otherwise the first sheet holding required_headers,
+    otherwise the first sheet. Trailing empty rows are ignored. CSV is read
+    with pandas in chunks; legacy .xls has no streaming reader and is loaded
+    whole, then chunked.
+
+    Chunks are DataFrames indexed by data row offset (0 is the first row
+    after the header), so the callers' `index + 2` row numbering matches the
+    spreadsheet; XLSX chunks hold the raw cell values (object dtype, None for
+    blanks). source must be seekable (uploaded or stored files are).
+    """
+
+    def __init__(self, source, file_name: Optional[str] = None, chunk_size: int = 1000,
+                 sheet: Optional[str] = None, required_headers: Optional[Iterable[str]] = None,
+                 header_scan: int = 1, csv_options: Optional[Dict[str, Any]] = None):
+        self.source = source
+        self.file_name = file_name or getattr(source, 'name', '') or ''
+        self.chunk_size = chunk_size
+        self.sheet = sheet
+        self.required_headers = {h.lower() for h in (required_headers or [])}
+        self.header_scan = header_scan
+        self.csv_options = dict(csv_options or {})
+
+        extension = os.path.splitext(self.file_name)[1].lower()
+        if extension in ('.xlsx', '.xlsm'):
+            self.format = 'xlsx'
+        elif extension == '.xls':
+            self.format = 'xls'
+        else:
+            self.format = 'csv'
+
+        self._headers: Optional[List[str]] = None
+        self._header_row = 1
+        self.sheet_title: Optional[str] = None
+
+    @property
+    def is_excel(self) -> bool:
+        return self.format in ('xlsx', 'xls')
+
+    @property
+    def headers(self) -> List[str]:
+        """Column names (detected on first access)"""
+        if self._headers is None:
+            if self.format == 'xlsx':
+                workbook = self._open_workbook()
+                try:
+                    self._select_sheet(workbook)
+                finally:
+                    workbook.close()
+            else:
+                self._headers = [str(column) for column in self._read_pandas(nrows=0).columns]
+        return self._headers
+
+    # === Iteration ===
+
+    def iter_chunks(self, start_row: int = 0) -> Iterator[pd.DataFrame]:
+        """Yield DataFrames of up to chunk_size rows, skipping rows before start_row"""
+        if self.format == 'csv':
+            for chunk in self._read_pandas(chunksize=self.chunk_size):
+                if chunk.index[-1] < start_row:
+                    continue
+                yield chunk[chunk.index >= start_row]
+            return
+
+        if self.format == 'xls':
+            df = self._read_pandas()
+            for start in range(start_row, len(df), self.chunk_size):
+                yield df.iloc[start:start + self.chunk_size]
+            return
+
+        offsets: List[int] = []
+        rows: List[Tuple] = []
+        for offset, values in self._iter_excel_rows():
+            if offset < start_row:
+                continue
+            offsets.append(offset)
+            rows.append(values)
+            if len(rows) >= self.chunk_size:
+                yield self._excel_frame(rows, offsets)
+                offsets, rows = [], []
+        if rows:
+            yield self._excel_frame(rows, offsets)
+
+    def iter_rows(self, start_row: int = 0) -> Iterator[Dict[str, Any]]:
+        """Yield one {header: value} dict per row, with None for blank cells"""
+        for chunk in self.iter_chunks(start_row):
+            chunk = chunk.astype(object).where(chunk.notna(), None)
+            yield from chunk.to_dict('records')
+
+    def iterrows(self, start_row: int = 0) -> Iterator[Tuple[int, pd.Series]]:
+        """(offset, row) pairs like DataFrame.iterrows, one chunk in memory at a time"""
+        for chunk in self.iter_chunks(start_row):
+            yield from chunk.iterrows()
+
+    def read_frame(self) -> pd.DataFrame:
+        """The whole sheet as one DataFrame (for uploads known to be small)"""
+        chunks = list(self.iter_chunks())
+        if not chunks:
+            return pd.DataFrame(columns=self.headers)
+        return pd.concat(chunks)
+
+    def count_rows(self, exact: bool = False) -> int:
+        """
+        Number of data rows. For XLSX the sheet dimension recorded by the
+        writer is used when the file has one, unless exact is set (which
+        streams the sheet). That dimension counts trailing formatted blank
+        rows and can be wrong altogether, so the default is only an estimate
+        for progress reporting; pass exact=True when the count decides how
+        an upload is handled.
+        """
+        if self.format == 'xlsx':
+            if not exact:
+                workbook = self._open_workbook()
+                try:
+                    worksheet, _, header_row = self._select_sheet(workbook)
+                    if worksheet.max_row:
+                        return max(0, worksheet.max_row - header_row)
+                finally:
+                    workbook.close()
+            count = 0
+            for offset, _ in self._iter_excel_rows():
+                count = offset + 1
+            return count
+
+        if self.format == 'xls':
+            return len(self._read_pandas())
+
+        # Only the first column is materialised per chunk
+        return sum(len(chunk) for chunk in self._read_pandas(chunksize=self.chunk_size * 10, usecols=[0]))
+
+    # === XLSX ===
+
+    def _open_workbook(self):
+        import openpyxl
+
+        self._rewind()
+        return openpyxl.load_workbook(self.source, read_only=True, data_only=True)
+
+    def _detect_headers(self, worksheet) -> Tuple[List[str], int]:
+        for row_number, row in enumerate(worksheet.iter_rows(min_row=1, max_row=self.header_scan, values_only=True), start=1):
+            values = [str(v).strip() if v is not None else '' for v in row]
+            if any(values):
+                while values and not values[-1]:
+                    values.pop()
+                return values, row_number
+        return [], 1
+
+    def _select_sheet(self, workbook):
+        selected = None
+        if self.sheet and self.sheet in workbook.sheetnames:
+            worksheet = workbook[self.sheet]
+            selected = (worksheet, *self._detect_headers(worksheet))
+        elif self.required_headers:
+            for worksheet in workbook.worksheets:
+                headers, header_row = self._detect_headers(worksheet)
+                if self.required_headers.issubset({h.lower() for h in headers}):
+                    selected = (worksheet, headers, header_row)
+                    break
+        if selected is None:
+            worksheet = workbook.worksheets[0]
+            selected = (worksheet, *self._detect_headers(worksheet))
+
+        worksheet, headers, header_row = selected
+        self._headers = _unique_headers(headers)
+        self._header_row = header_row
+        self.sheet_title = worksheet.title
+        return selected
+
+    def _excel_frame(self, rows: List[Tuple], offsets: List[int]) -> pd.DataFrame:
+        # object dtype keeps cell values as openpyxl returns them (an id column with blanks stays int, not float)
+        return pd.DataFrame(rows, columns=self.headers, index=offsets, dtype=object)
+
+    def _iter_excel_rows(self) -> Iterator[Tuple[int, Tuple]]:
+        """(offset, values) for every data row up to the last non-empty one"""
+        workbook = self._open_workbook()
+        try:
+            worksheet, headers, header_row = self._select_sheet(workbook)
+            width = len(headers)
+            blank_row = (None,) * width
+            pending_blank = 0
+            offset = 0
+            for row in worksheet.iter_rows(min_row=header_row + 1, values_only=True):
+                values = tuple(row[:width])
+                if len(values) < width:
+                    values += (None,) * (width - len(values))
+                if _is_blank(values):
+                    # Emitted only if a non-empty row follows
+                    pending_blank += 1
+                else:
+                    for blank_offset in range(offset - pending_blank, offset):
+                        yield blank_offset, blank_row
+                    pending_blank = 0
+                    yield offset, values
+                offset += 1
+        finally:
+            workbook.close()
+
+    # === CSV / XLS ===
+
+    def _rewind(self):
+        if hasattr(self.source, 'seek'):
+            self.source.seek(0)
+
+    def _read_pandas(self, **kwargs):
+        self._rewind()
+        if self.format == 'xls':
+            return pd.read_excel(self.source, sheet_name=self.sheet or 0, **kwargs)
+
+        options = {**self.csv_options, **kwargs}
+        if 'encoding' not in options:
+            options['encoding'] = self._detect_encoding()
+            self.csv_options['encoding'] = options['encoding']
+            self._rewind()
+        return pd.read_csv(self.source, **options)
+
+    def _detect_encoding(self) -> str:
+        sample = self.source.read(ENCODING_SAMPLE_SIZE)
+        if isinstance(sample, str):
+            return 'utf-8'
+        if sample.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        try:
+            # Incremental decode tolerates a multi-byte character cut at the sample boundary
+            codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            return 'latin-1'
@@ -0,0 +1,73 @@
+import datetime
+
+from django.contrib.sessions.models import Session
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.pagination import StandardResultsSetPagination, decode_cursor, encode_cursor, paginate_keyset
+
+# Session gives a datetime + unique key pair without tenant fixtures
+ORDERING = ('-expire_date', '-session_key')
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        start = timezone.now().replace(microsecond=0)
+        # 37µs apart, as bulk imports produce: ~27 rows share each millisecond
+        Session.objects.bulk_create([
+            Session(
+                session_key=f'k{i:05d}',
+                session_data='',
+                expire_date=start + datetime.timedelta(microseconds=37 * i),
+            )
+            for i in range(1000)
+        ])
+        self.expected = list(
+            Session.objects.order_by(*ORDERING).values_list('session_key', flat=True)
+        )
+
+    def test_cursor_keeps_microseconds(self):
+        moment = timezone.now().replace(microsecond=123456)
+        position, backwards = decode_cursor(encode_cursor([moment, 'k1']), Session, ORDERING)
+        self.assertEqual(position, [moment, 'k1'])
+        self.assertFalse(backwards)
+
+    def test_forward_walk_with_sub_millisecond_timestamps(self):
+        seen, cursor = [], None
+        while True:
+            page = paginate_keyset(Session.objects.all(), 37, cursor, ORDERING)
+            seen.extend(row.session_key for row in page.rows)
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(seen, self.expected)
+
+    def test_backward_walk_with_sub_millisecond_timestamps(self):
+        page = paginate_keyset(Session.objects.all(), 37, None, ORDERING)
+        while page.has_next:
+            page = paginate_keyset(Session.objects.all(), 37, page.next_cursor, ORDERING)
+
+        seen = [row.session_key for row in page.rows]
+        while page.has_previous:
+            page = paginate_keyset(Session.objects.all(), 37, page.previous_cursor, ORDERING)
+            seen = [row.session_key for row in page.rows] + seen
+        self.assertEqual(seen, self.expected)
+
+
+class KeysetOptInTests(TestCase):
+    def _paginate(self, view):
+        paginator = StandardResultsSetPagination()
+        request = Request(APIRequestFactory().get('/items/', {'pagination': 'cursor'}))
+        paginator.paginate_queryset(Session.objects.order_by('session_key'), request, view)
+        return paginator
+
+    def test_cursor_mode_ignored_without_keyset_ordering(self):
+        paginator = self._paginate(object())
+        self.assertIsNone(paginator.keyset_page)
+
+    def test_cursor_mode_on_views_with_keyset_ordering(self):
+        view = type('View', (), {'keyset_ordering': ORDERING})()
+        paginator = self._paginate(view)
+        self.assertIsNotNone(paginator.keyset_page)